@@ -0,0 +1,76 @@
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+
+# modules only some runs need, which importing the CLI must not pull in
+LAZY_MODULES = ('pulp', 'requests', 'bs4', 'tools.scrape_538', 'nfl_survivor.lp_picker')
+
+# command line entry points and the modules they import at startup
+ENTRY_MODULES = ('nfl_survivor.make_picks',)
+
+
+def _import_seconds(module_name):
+    """ Wall clock time of starting a fresh interpreter that imports module
+
+    Parameters
+    ----------
+    module_name : str
+
+    Returns
+    -------
+    float
+
+    """
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', f'import {module_name}'], check=True)
+    return time.perf_counter() - start
+
+
+def eagerly_imported(module_name):
+    """ Modules of `LAZY_MODULES` loaded by importing module in a fresh interpreter
+
+    Parameters
+    ----------
+    module_name : str
+
+    Returns
+    -------
+    list(str)
+
+    """
+    code = (f'import sys, {module_name}; '
+            f'print(" ".join(name for name in {LAZY_MODULES!r} if name in sys.modules))')
+    return subprocess.run([sys.executable, '-c', code], check=True, capture_output=True,
+                          text=True).stdout.split()
+
+
+@click.command()
+@click.option('-r', '--repeat', 'repeat', type=int, default=10,
+              help='Number of fresh interpreters per measurement')
+@click.option('-b', '--budget', 'budget', type=float, default=None,
+              help='Seconds above which the median import time of an entry module fails the benchmark')
+def benchmark(repeat, budget):
+    """Time importing command line entry points in fresh interpreters"""
+    baseline = statistics.median(_import_seconds('sys') for _ in range(repeat))
+    print(f'{"module":<32}{"median":>12}{"over bare":>12}  eagerly imported')
+    print(f'{"(bare interpreter)":<32}{baseline * 1e3:>10.1f}ms')
+
+    over_budget = []
+    for module_name in ENTRY_MODULES:
+        median = statistics.median(_import_seconds(module_name) for _ in range(repeat))
+        eager = eagerly_imported(module_name)
+        print(f'{module_name:<32}{median * 1e3:>10.1f}ms{(median - baseline) * 1e3:>10.1f}ms  '
+              f'{", ".join(eager) or "-"}')
+
+        if budget is not None and median > budget:
+            over_budget.append(module_name)
+
+    if over_budget:
+        raise click.ClickException(f'Over startup budget of {budget}s: {", ".join(over_budget)}')
+
+
+if __name__ == '__main__':
+    benchmark()
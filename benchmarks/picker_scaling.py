@@ -0,0 +1,77 @@
+import logging
+import os
+import statistics
+import sys
+import time
+
+import click
+
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.greedy_picker import GreedyPicker
+from nfl_survivor.lp_picker import LpPicker
+from nfl_survivor.synthetic import DISTRIBUTIONS, synthetic_season
+
+# pickers whose cost grows polynomially with season size
+SCALING_PICKERS = (GreedyPicker, AssignmentPicker, LpPicker)
+
+
+def _median_seconds(func, repeat):
+    """ Median wall clock time of calling function
+
+    Parameters
+    ----------
+    func : callable
+    repeat : int
+
+    Returns
+    -------
+    float
+
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def _quiet_picks(picker):
+    # CBC writes its log straight to the stdout file descriptor
+    sys.stdout.flush()
+    stdout_fd = os.dup(1)
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            return picker.picks()
+        finally:
+            os.dup2(stdout_fd, 1)
+            os.close(stdout_fd)
+
+
+@click.command()
+@click.option('-r', '--repeat', 'repeat', type=int, default=3,
+              help='Number of runs per measurement')
+@click.option('-d', '--distribution', 'distribution', type=click.Choice(sorted(DISTRIBUTIONS)), default='elo',
+              help='Distribution win probabilities are drawn from')
+@click.option('-b', '--bye_rate', 'bye_rate', type=float, default=0.0,
+              help='Probability of a team not playing in a week')
+@click.argument('sizes', nargs=-1)
+def benchmark(sizes, repeat, distribution, bye_rate):
+    """Time pickers on synthetic seasons of growing size given as TEAMSxWEEKS"""
+    logging.disable(logging.INFO)
+
+    sizes = [tuple(int(part) for part in size.split('x')) for size in sizes] or \
+        [(32, 17), (64, 34), (128, 68), (256, 136)]
+
+    print(f'{"size":<12}' + ''.join(f'{picker_class.__name__:>20}' for picker_class in SCALING_PICKERS))
+    for n_teams, n_weeks in sizes:
+        season = synthetic_season(n_teams, n_weeks, bye_rate, distribution, seed=0)
+        seconds = [_median_seconds(lambda: _quiet_picks(picker_class(season)), repeat)
+                   for picker_class in SCALING_PICKERS]
+        print(f'{f"{n_teams}x{n_weeks}":<12}' + ''.join(f'{second * 1e3:>18.1f}ms' for second in seconds))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,54 @@
+import logging
+import statistics
+import time
+
+import click
+
+from tools.scrape_538 import Scraper
+
+
+def _median_seconds(func, repeat):
+    """ Median wall clock time of calling function
+
+    Parameters
+    ----------
+    func : callable
+    repeat : int
+
+    Returns
+    -------
+    float
+
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+@click.command()
+@click.option('-r', '--repeat', 'repeat', type=int, default=5,
+              help='Number of parses per measurement')
+@click.argument('html_path', default='tests/test_data/test_538_season.html')
+def benchmark(html_path, repeat):
+    """Compare full and fast parsing of a saved 538 predictions page"""
+    logging.disable(logging.INFO)
+
+    with open(html_path, 'r') as html_file:
+        html = html_file.read()
+
+    if Scraper.parse_season_html(html, fast_parse=True) != Scraper.parse_season_html(html, fast_parse=False):
+        raise click.ClickException('Full and fast parsing disagree')
+
+    full = _median_seconds(lambda: Scraper.parse_season_html(html, fast_parse=False), repeat)
+    fast = _median_seconds(lambda: Scraper.parse_season_html(html, fast_parse=True), repeat)
+
+    print(f'{"full":<12}{full * 1e3:>10.1f}ms')
+    print(f'{"fast":<12}{fast * 1e3:>10.1f}ms{full / fast:>8.1f}x')
+
+
+if __name__ == '__main__':
+    benchmark()
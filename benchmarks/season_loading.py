@@ -0,0 +1,63 @@
+import glob
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+import click
+import yaml
+
+from nfl_survivor.season import Season
+from nfl_survivor.season_cache import CACHE_DIR_VARIABLE
+
+def _median_seconds(func, repeat):
+    """ Median wall clock time of calling function
+
+    Parameters
+    ----------
+    func : callable
+    repeat : int
+
+    Returns
+    -------
+    float
+
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def _pure_python_load(season_path):
+    with open(season_path, 'r') as yaml_file:
+        return Season.from_dict(yaml.load(yaml_file, Loader=yaml.Loader))
+
+
+@click.command()
+@click.option('-r', '--repeat', 'repeat', type=int, default=5,
+              help='Number of loads per measurement')
+@click.argument('season_paths', nargs=-1)
+def benchmark(season_paths, repeat):
+    """Compare cold and warm season loads"""
+    logging.disable(logging.INFO)
+
+    print(f'{"season":<40}{"pure python":>14}{"C loader":>14}{"warm cache":>14}')
+    for season_path in season_paths or sorted(glob.glob('seasons/*.yaml')):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            os.environ[CACHE_DIR_VARIABLE] = cache_dir
+            Season.from_yaml(season_path)
+            warm = _median_seconds(lambda: Season.from_yaml(season_path), repeat)
+
+        pure_python = _median_seconds(lambda: _pure_python_load(season_path), repeat)
+        c_loader = _median_seconds(lambda: Season.from_yaml(season_path, cache=False), repeat)
+
+        print(f'{season_path:<40}{pure_python * 1e3:>12.1f}ms{c_loader * 1e3:>12.1f}ms{warm * 1e3:>12.1f}ms')
+
+
+if __name__ == '__main__':
+    benchmark()
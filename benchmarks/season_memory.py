@@ -0,0 +1,59 @@
+import gc
+import logging
+import tracemalloc
+
+import click
+import yaml
+
+from nfl_survivor.season import Season
+from nfl_survivor.utils import YAML_LOADER
+
+
+def _bytes_per_season(season_dict, n_seasons, matrix):
+    """ Average traced memory held by each of many seasons built from the same dictionary
+
+    Parameters
+    ----------
+    season_dict : list(dict)
+    n_seasons : int
+    matrix : bool
+        Whether to also build each season's probability matrix
+
+    Returns
+    -------
+    float
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+
+    seasons = [Season.from_dict(season_dict) for _ in range(n_seasons)]
+    if matrix:
+        for season in seasons:
+            season.probability_matrix
+
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (end - start) / len(seasons)
+
+
+@click.command()
+@click.option('-n', '--n_seasons', 'n_seasons', type=int, default=500,
+              help='Number of seasons to hold in memory')
+@click.argument('season_path', default='seasons/2019_season.yaml')
+def benchmark(season_path, n_seasons):
+    """Measure memory held per season"""
+    logging.disable(logging.INFO)
+
+    with open(season_path, 'r') as yaml_file:
+        season_dict = yaml.load(yaml_file, Loader=YAML_LOADER)
+
+    print(f'objects only: {_bytes_per_season(season_dict, n_seasons, False) / 1024:.1f} KiB per season')
+    print(f'with probability matrix: {_bytes_per_season(season_dict, n_seasons, True) / 1024:.1f} KiB per season')
+
+
+if __name__ == '__main__':
+    benchmark()
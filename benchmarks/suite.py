@@ -0,0 +1,203 @@
+import contextlib
+import glob
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+import numpy as np
+
+from nfl_survivor.greedy_picker import GreedyPicker
+from nfl_survivor.lp_picker import LpPicker
+from nfl_survivor.season import Season
+from nfl_survivor.season_cache import CACHE_DIR_VARIABLE
+from nfl_survivor.synthetic import synthetic_weeks, write_weeks_yaml
+
+# (teams, weeks) of synthetic seasons larger than a real one
+SYNTHETIC_SIZES = ((32, 17), (64, 34), (128, 68))
+
+
+def _summary(seconds):
+    """ Median and 95th percentile of measured times
+
+    Parameters
+    ----------
+    seconds : list(float)
+
+    Returns
+    -------
+    dict(str->float)
+
+    """
+    return {'median': float(np.median(seconds)), 'p95': float(np.percentile(seconds, 95)), 'n': len(seconds)}
+
+
+def _measure(func, repeat, setup=None):
+    """ Wall clock times of calling function on result of setup, setup is not timed
+
+    Parameters
+    ----------
+    func : callable
+    repeat : int
+    setup : callable, optional
+
+    Returns
+    -------
+    list(float)
+
+    """
+    seconds = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(argument) if setup is not None else func()
+        seconds.append(time.perf_counter() - start)
+
+    return seconds
+
+
+@contextlib.contextmanager
+def _quiet_stdout():
+    """ Silence output written straight to the stdout file descriptor, such as the CBC solver log """
+    sys.stdout.flush()
+    stdout_fd = os.dup(1)
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            yield
+        finally:
+            os.dup2(stdout_fd, 1)
+            os.close(stdout_fd)
+
+
+def _case_results(season_path, repeat):
+    """ Timings of all operations for one season file
+
+    Parameters
+    ----------
+    season_path : str
+    repeat : int
+
+    Returns
+    -------
+    dict(str->dict)
+        Operation name to summary of its timings
+
+    """
+    season = Season.from_yaml(season_path, cache=False)
+    season_dict = season.to_dict()
+    team = sorted(season.teams)[0]
+    picks = GreedyPicker(season).picks()
+
+    lp_timings = {'build': [], 'solve': []}
+
+    def lp_picks():
+        picker = LpPicker(season)
+        with _quiet_stdout():
+            picker.picks()
+        for phase, phase_seconds in picker.timings.items():
+            lp_timings[phase].append(phase_seconds)
+
+    # write cache entry so cached loads are all warm
+    Season.from_yaml(season_path)
+
+    results = {'from_yaml': _measure(lambda: Season.from_yaml(season_path, cache=False), repeat),
+               'from_yaml_cached': _measure(lambda: Season.from_yaml(season_path), repeat),
+               'teams': _measure(lambda fresh: fresh.teams, repeat, lambda: Season.from_dict(season_dict)),
+               'team_weeks': _measure(lambda fresh: fresh.team_weeks(team), repeat,
+                                      lambda: Season.from_dict(season_dict)),
+               'greedy_picks': _measure(lambda: GreedyPicker(season).picks(), repeat),
+               'lp_picks': _measure(lp_picks, repeat),
+               'picks_win_probability': _measure(lambda: season.picks_win_probability(picks), repeat),
+               'picks_expected_survival': _measure(lambda: season.picks_expected_survival(picks), repeat)}
+    results['lp_build'], results['lp_solve'] = lp_timings['build'], lp_timings['solve']
+
+    return {operation: _summary(seconds) for operation, seconds in results.items()}
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@click.group()
+def suite():
+    """Benchmark loading, picking and scoring seasons"""
+    logging.disable(logging.INFO)
+
+
+@suite.command()
+@click.option('-r', '--repeat', 'repeat', type=int, default=20,
+              help='Number of measurements per operation')
+@click.option('-o', '--output', 'output', type=str, default=None,
+              help='JSON file path to write results to')
+@click.option('--synthetic/--no-synthetic', 'synthetic', default=True,
+              help='Whether to include synthetic seasons larger than a real one')
+@click.argument('season_paths', nargs=-1)
+def run(season_paths, repeat, output, synthetic):
+    """Time operations on seasons and report median and p95"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # keep cached loads from touching the real cache
+        os.environ[CACHE_DIR_VARIABLE] = os.path.join(temp_dir, 'cache')
+
+        cases = {os.path.basename(season_path): season_path
+                 for season_path in season_paths or sorted(glob.glob('seasons/*.yaml'))}
+        if synthetic:
+            for n_teams, n_weeks in SYNTHETIC_SIZES:
+                season_path = os.path.join(temp_dir, f'synthetic_{n_teams}x{n_weeks}.yaml')
+                write_weeks_yaml(synthetic_weeks(n_teams, n_weeks, seed=0), season_path)
+                cases[os.path.basename(season_path)] = season_path
+
+        results = {}
+        for case, season_path in cases.items():
+            results[case] = _case_results(season_path, repeat)
+            _print_case(case, results[case])
+
+    if output is not None:
+        with open(output, 'w') as output_file:
+            json.dump({'commit': _commit(), 'python': platform.python_version(), 'repeat': repeat,
+                       'results': results}, output_file, indent=2)
+
+
+def _print_case(case, case_results):
+    print(case)
+    for operation, summary in case_results.items():
+        print(f'  {operation:<28}{summary["median"] * 1e3:>12.3f}ms{summary["p95"] * 1e3:>12.3f}ms')
+
+
+@suite.command()
+@click.option('-t', '--threshold', 'threshold', type=float, default=1.1,
+              help='Ratio of medians above which an operation is flagged as slower')
+@click.argument('baseline', type=str)
+@click.argument('candidate', type=str)
+def compare(baseline, candidate, threshold):
+    """Compare median timings of two result files"""
+    with open(baseline, 'r') as baseline_file, open(candidate, 'r') as candidate_file:
+        baseline_results, candidate_results = json.load(baseline_file), json.load(candidate_file)
+
+    print(f'{baseline_results["commit"]} -> {candidate_results["commit"]}')
+    for case, case_results in candidate_results['results'].items():
+        if case not in baseline_results['results']:
+            continue
+
+        print(case)
+        for operation, summary in case_results.items():
+            if operation not in baseline_results['results'][case]:
+                continue
+
+            before, after = baseline_results['results'][case][operation]['median'], summary['median']
+            ratio = after / before if before else float('inf')
+            flag = ' slower' if ratio > threshold else ' faster' if ratio < 1 / threshold else ''
+            print(f'  {operation:<28}{before * 1e3:>12.3f}ms{after * 1e3:>12.3f}ms{ratio:>8.2f}x{flag}')
+
+
+if __name__ == '__main__':
+    suite()
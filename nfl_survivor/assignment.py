@@ -0,0 +1,320 @@
+import heapq
+import itertools
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def min_cost_assignment(cost, potentials=False):
+    """ Solve rectangular minimum cost assignment problem
+
+    Assigns every row to a distinct column so that the sum of the chosen
+    costs is minimal, using the shortest augmenting path (Hungarian)
+    algorithm with dual potentials. Infinite costs mark forbidden
+    row/column pairs
+
+    Parameters
+    ----------
+    cost : numpy.ndarray
+        Array of shape (rows, columns) with rows <= columns
+    potentials : bool, optional
+        Whether to also return the optimal dual potentials
+
+    Returns
+    -------
+    numpy.ndarray
+        Column assigned to each row
+    numpy.ndarray
+        Only if `potentials`, potential of each row
+    numpy.ndarray
+        Only if `potentials`, potential of each column. Reduced costs
+        `cost - row_potential[:, None] - column_potential` are nonnegative
+        and zero on the assignment
+
+    """
+    cost = np.asarray(cost, dtype=float)
+    n_rows, n_columns = cost.shape
+
+    if n_rows > n_columns:
+        exception_msg = f'Cannot assign {n_rows} rows to only {n_columns} columns'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    solution = _min_cost_assignment(cost, potentials)
+
+    if (solution[0] if potentials else solution) is None:
+        exception_msg = 'No feasible assignment exists'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    return solution
+
+
+def _min_cost_assignment(cost, potentials=False):
+    """ Solve assignment problem without validation or logging
+
+    Parameters
+    ----------
+    cost : numpy.ndarray
+        Float array of shape (rows, columns) with rows <= columns
+    potentials : bool, optional
+        Whether to also return the optimal dual potentials
+
+    Returns
+    -------
+    numpy.ndarray or None
+        Column assigned to each row, None if no feasible assignment exists
+    numpy.ndarray
+        Only if `potentials`, potential of each row
+    numpy.ndarray
+        Only if `potentials`, potential of each column. Reduced costs
+        `cost - row_potential[:, None] - column_potential` are nonnegative,
+        zero on the assignment, and column potentials are nonpositive and
+        zero on unassigned columns
+
+    """
+    n_rows, n_columns = cost.shape
+
+    # index 0 is a sentinel column used as the root of every augmenting path
+    row_potential = np.zeros(n_rows + 1)
+    column_potential = np.zeros(n_columns + 1)
+    column_to_row = np.zeros(n_columns + 1, dtype=int)
+    previous_column = np.zeros(n_columns + 1, dtype=int)
+
+    for row in range(1, n_rows + 1):
+        column_to_row[0] = row
+        column = 0
+        min_reduced_cost = np.full(n_columns + 1, np.inf)
+        used = np.zeros(n_columns + 1, dtype=bool)
+
+        while column_to_row[column] != 0:
+            used[column] = True
+            current_row = column_to_row[column]
+
+            reduced_cost = (cost[current_row - 1] - row_potential[current_row] -
+                            column_potential[1:])
+            improved = ~used[1:] & (reduced_cost < min_reduced_cost[1:])
+            min_reduced_cost[1:][improved] = reduced_cost[improved]
+            previous_column[1:][improved] = column
+
+            candidates = np.where(used[1:], np.inf, min_reduced_cost[1:])
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            if not np.isfinite(delta):
+                return (None, None, None) if potentials else None
+
+            row_potential[column_to_row[used]] += delta
+            column_potential[used] -= delta
+            min_reduced_cost[~used] -= delta
+            column = next_column
+
+        # flip the augmenting path back to the root
+        while column != 0:
+            parent = previous_column[column]
+            column_to_row[column] = column_to_row[parent]
+            column = parent
+
+    assignment = np.empty(n_rows, dtype=int)
+    assigned_columns = np.flatnonzero(column_to_row[1:])
+    assignment[column_to_row[1:][assigned_columns] - 1] = assigned_columns
+
+    if potentials:
+        return assignment, row_potential[1:], column_potential[1:]
+
+    return assignment
+
+
+def batch_min_cost_assignment(costs):
+    """ Solve many assignment problems of the same shape at once
+
+    Runs the algorithm of `min_cost_assignment` on every problem in
+    lockstep, each step an array operation over all problems still
+    searching for an augmenting path, so thousands of small problems cost
+    about as many Python level steps as one
+
+    Parameters
+    ----------
+    costs : numpy.ndarray
+        Array of shape (problems, rows, columns) with rows <= columns.
+        Infinite costs mark forbidden row/column pairs
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array of shape (problems, rows) with the column assigned to
+        each row, -1 in every row of infeasible problems
+
+    """
+    costs = np.asarray(costs, dtype=float)
+    n_problems, n_rows, n_columns = costs.shape
+
+    if n_rows > n_columns:
+        exception_msg = f'Cannot assign {n_rows} rows to only {n_columns} columns'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    # same layout as `_min_cost_assignment` with a leading problem axis
+    row_potential = np.zeros((n_problems, n_rows + 1))
+    column_potential = np.zeros((n_problems, n_columns + 1))
+    column_to_row = np.zeros((n_problems, n_columns + 1), dtype=int)
+    previous_column = np.zeros((n_problems, n_columns + 1), dtype=int)
+    feasible = np.ones(n_problems, dtype=bool)
+
+    for row in range(1, n_rows + 1):
+        column_to_row[:, 0] = row
+        column = np.zeros(n_problems, dtype=int)
+        min_reduced_cost = np.full((n_problems, n_columns + 1), np.inf)
+        used = np.zeros((n_problems, n_columns + 1), dtype=bool)
+        searching = np.flatnonzero(feasible)
+
+        while len(searching):
+            searching_column = column[searching]
+            used[searching, searching_column] = True
+            current_row = column_to_row[searching, searching_column]
+
+            reduced_cost = (costs[searching, current_row - 1] - row_potential[searching, current_row][:, None] -
+                            column_potential[searching, 1:])
+            searching_used = used[searching]
+            searching_min = min_reduced_cost[searching]
+            improved = ~searching_used[:, 1:] & (reduced_cost < searching_min[:, 1:])
+            searching_min[:, 1:][improved] = reduced_cost[improved]
+            previous_column[searching, 1:] = np.where(improved, searching_column[:, None],
+                                                      previous_column[searching, 1:])
+
+            candidates = np.where(searching_used[:, 1:], np.inf, searching_min[:, 1:])
+            next_column = np.argmin(candidates, axis=1) + 1
+            delta = candidates[np.arange(len(searching)), next_column - 1]
+
+            stuck = ~np.isfinite(delta)
+            feasible[searching[stuck]] = False
+            delta = np.where(stuck, 0.0, delta)
+
+            # rows of used columns are distinct apart from the unused sentinel row 0
+            used_delta = np.where(searching_used, delta[:, None], 0.0)
+            row_potential[searching[:, None], column_to_row[searching]] += used_delta
+            column_potential[searching] -= used_delta
+            min_reduced_cost[searching] = np.where(searching_used, searching_min, searching_min - delta[:, None])
+            column[searching] = next_column
+
+            searching = searching[~stuck & (column_to_row[searching, next_column] != 0)]
+
+        # flip the augmenting paths back to the root
+        flipping = np.flatnonzero(feasible & (column != 0))
+        while len(flipping):
+            parent = previous_column[flipping, column[flipping]]
+            column_to_row[flipping, column[flipping]] = column_to_row[flipping, parent]
+            column[flipping] = parent
+            flipping = flipping[parent != 0]
+
+    assignments = np.full((n_problems, n_rows), -1, dtype=int)
+    problems, columns = np.nonzero(column_to_row[:, 1:])
+    assignments[problems, column_to_row[problems, columns + 1] - 1] = columns
+    assignments[~feasible] = -1
+
+    return assignments
+
+
+def _constrained_assignment(cost, forced, forbidden):
+    """ Minimum cost assignment with some row/column pairs forced and others forbidden
+
+    Forced rows and columns are removed before solving so subproblems deeper
+    in the partition get smaller
+
+    Parameters
+    ----------
+    cost : numpy.ndarray
+    forced : tuple(tuple(int, int))
+        (row, column) pairs every solution must contain
+    forbidden : frozenset(tuple(int, int))
+        (row, column) pairs no solution may contain
+
+    Returns
+    -------
+    numpy.ndarray or None
+        Column assigned to each row, None if no feasible assignment exists
+
+    """
+    n_rows, n_columns = cost.shape
+    forced_rows = {row for row, _ in forced}
+    forced_columns = {column for _, column in forced}
+    free_rows = np.array([row for row in range(n_rows) if row not in forced_rows], dtype=int)
+    free_columns = np.array([column for column in range(n_columns) if column not in forced_columns], dtype=int)
+
+    sub_cost = cost[np.ix_(free_rows, free_columns)]
+    if forbidden:
+        row_position = {row: position for position, row in enumerate(free_rows)}
+        column_position = {column: position for position, column in enumerate(free_columns)}
+        for row, column in forbidden:
+            if row in row_position and column in column_position:
+                sub_cost[row_position[row], column_position[column]] = np.inf
+
+    sub_assignment = _min_cost_assignment(sub_cost) if len(free_rows) else np.empty(0, dtype=int)
+    if sub_assignment is None:
+        return None
+
+    assignment = np.empty(n_rows, dtype=int)
+    for row, column in forced:
+        assignment[row] = column
+    assignment[free_rows] = free_columns[sub_assignment]
+
+    return assignment
+
+
+def k_best_assignments(cost):
+    """ Lazily generate assignments in order of increasing total cost
+
+    Uses Murty's partitioning: after an assignment is generated the
+    remaining solution space of its subproblem is split into disjoint
+    subproblems, the i-th forcing the assignment's first i - 1 free rows and
+    forbidding its i-th pair. Subproblems are queued with their parent's cost
+    as a lower bound and only solved once they reach the front of the queue,
+    so asking for the next assignment only does the work it needs
+
+    Parameters
+    ----------
+    cost : numpy.ndarray
+        Array of shape (rows, columns) with rows <= columns. Infinite costs
+        mark forbidden row/column pairs
+
+    Yields
+    ------
+    float
+        Total cost of assignment
+    numpy.ndarray
+        Column assigned to each row
+
+    """
+    cost = np.asarray(cost, dtype=float)
+    n_rows, n_columns = cost.shape
+
+    if n_rows > n_columns:
+        exception_msg = f'Cannot assign {n_rows} rows to only {n_columns} columns'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    # entries are (cost or lower bound, tie breaker, assignment or None if unsolved, forced, forbidden)
+    counter = itertools.count()
+    queue = [(0.0, next(counter), None, (), frozenset())]
+
+    while queue:
+        bound, _, assignment, forced, forbidden = heapq.heappop(queue)
+
+        if assignment is None:
+            assignment = _constrained_assignment(cost, forced, forbidden)
+            if assignment is not None:
+                heapq.heappush(queue, (float(cost[np.arange(n_rows), assignment].sum()), next(counter),
+                                       assignment, forced, forbidden))
+            continue
+
+        yield bound, assignment
+
+        forced_rows = {row for row, _ in forced}
+        for row in range(n_rows):
+            if row in forced_rows:
+                continue
+
+            heapq.heappush(queue, (bound, next(counter), None, forced, forbidden | {(row, int(assignment[row]))}))
+            forced = forced + ((row, int(assignment[row])),)
@@ -0,0 +1,118 @@
+import itertools
+import logging
+
+import numpy as np
+
+from nfl_survivor.assignment import k_best_assignments, min_cost_assignment
+from nfl_survivor.picker import Picker
+from nfl_survivor.picks import Picks
+
+logger = logging.getLogger(__name__)
+
+
+class AssignmentPicker(Picker):
+
+    def cost_matrix(self):
+        """ Assignment costs for weeks and teams not fixed by previous picks
+
+        The cost of picking a team is its negative log win probability, so the
+        minimum cost assignment maximizes the probability of winning every
+        week. Byes get infinite cost and zero probabilities are clipped to the
+        smallest positive float so they are allowed but never preferred
+
+        Returns
+        -------
+        numpy.ndarray
+            Cost matrix of shape (open weeks, open teams)
+        tuple(int)
+            Week numbers of rows
+        tuple(str)
+            Team names of columns
+
+        """
+        season = self.season
+
+        for week_number, team in self.previous_picks.items():
+            # validates that previous pick is a game being played
+            season.win_probability(week_number, team)
+
+        week_numbers = tuple(week_number for week_number in season.week_numbers
+                             if week_number not in self.previous_picks)
+        picked = set(self.previous_picks.values())
+        teams = tuple(team for team in season.team_names if team not in picked)
+
+        probabilities = season.probability_matrix[np.ix_([season.week_index[w] for w in week_numbers],
+                                                         [season.team_index[t] for t in teams])]
+
+        with np.errstate(invalid='ignore'):
+            cost = -np.log(np.clip(probabilities, np.finfo(float).tiny, None))
+        cost[np.isnan(cost)] = np.inf
+
+        return cost, week_numbers, teams
+
+    def picks(self):
+        """ Make picks for a particular season by solving assignment problem
+
+        Returns
+        -------
+        dict(int->str)
+            Week number to team name
+
+        """
+        logger.info('Forming assignment problem')
+        cost, week_numbers, teams = self.cost_matrix()
+
+        logger.info('Solving assignment problem for %d weeks and %d teams', *cost.shape)
+        try:
+            columns = min_cost_assignment(cost)
+        except ValueError:
+            exception_msg = 'Cannot solve for picks since there is no way to pick a distinct team every week'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        picks = Picks(self.previous_picks)
+        picks.update((week_number, teams[column])
+                     for week_number, column in zip(week_numbers, columns))
+
+        return picks
+
+    def ranked_picks(self):
+        """ Lazily generate distinct picks in order of decreasing win probability
+
+        Picks are enumerated with `assignment.k_best_assignments`, so getting
+        the next picks only solves the assignment subproblems it needs
+
+        Yields
+        ------
+        picks.Picks
+            Next best picks, including previous picks
+        float
+            Win probability of picks
+
+        """
+        cost, week_numbers, teams = self.cost_matrix()
+        previous_probability = self.season.picks_win_probability(self.previous_picks) if self.previous_picks else 1.0
+
+        logger.info('Ranking assignments for %d weeks and %d teams', *cost.shape)
+        for total_cost, columns in k_best_assignments(cost):
+            picks = Picks(self.previous_picks)
+            picks.update((week_number, teams[column])
+                         for week_number, column in zip(week_numbers, columns))
+
+            yield picks, previous_probability * float(np.exp(-total_cost))
+
+    def top_picks(self, k):
+        """ K best distinct picks by win probability
+
+        Parameters
+        ----------
+        k : int
+
+        Returns
+        -------
+        list(tuple(picks.Picks, float))
+            Picks and their win probability, best first. Shorter than k if
+            there are fewer distinct ways to pick
+
+        """
+        return list(itertools.islice(self.ranked_picks(), k))
@@ -0,0 +1,247 @@
+import collections
+import concurrent.futures
+import glob
+import itertools
+import json
+import logging
+import os
+import time
+
+import click
+import numpy as np
+
+from nfl_survivor.dp_picker import DpPicker
+from nfl_survivor.greedy_picker import GreedyPicker
+from nfl_survivor.picker_registry import make_picker, picker_names as registered_picker_names
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+from nfl_survivor.utils import initialize_logging
+
+logger = logging.getLogger(__name__)
+
+Scenario = collections.namedtuple('Scenario', ('locked_weeks', 'noise', 'variant'))
+
+# seasons loaded by this worker process, keyed by path and perturbation
+_WORKER_SEASONS = {}
+
+
+def perturbed_season(season, noise, seed):
+    """ Season with every game's win probabilities shifted by noise on the log odds scale
+
+    Parameters
+    ----------
+    season : season.Season
+    noise : float
+        Standard deviation of normal noise added to the log odds of each game
+    seed : int
+
+    Returns
+    -------
+    season.Season
+
+    """
+    if not noise:
+        return season
+
+    columns = season.to_columns()
+    # rows of a game are next to each other, perturb the first and complement the second
+    first = columns['probability'][0::2]
+    clipped = np.clip(first, 1e-9, 1 - 1e-9)
+    log_odds = np.log(clipped / (1 - clipped)) + np.random.default_rng(seed).normal(0.0, noise, len(first))
+
+    probability = np.empty_like(columns['probability'])
+    probability[0::2] = 1 / (1 + np.exp(-log_odds))
+    probability[1::2] = 1 - probability[0::2]
+    columns['probability'] = probability
+
+    return Season.from_columns(**columns)
+
+
+def _worker_season(season_path, noise=0.0, variant=0):
+    """ Season loaded once per worker process
+
+    Parameters
+    ----------
+    season_path : str
+    noise : float, optional
+    variant : int, optional
+        Seed of perturbation
+
+    Returns
+    -------
+    season.Season
+
+    """
+    key = (season_path, noise, variant if noise else 0)
+    if key not in _WORKER_SEASONS:
+        _WORKER_SEASONS[key] = (perturbed_season(_worker_season(season_path), noise, variant) if noise else
+                                Season.from_yaml(season_path))
+
+    return _WORKER_SEASONS[key]
+
+
+def _initialize_worker():
+    # solver logs and info logging from thousands of solves would drown the summary
+    logging.getLogger().setLevel(logging.WARNING)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+
+def run_task(season_path, picker_name, scenario):
+    """ Make picks for one cell of backtest grid and score them
+
+    The picker sees the season perturbed by the scenario's noise and its
+    picks are scored against the unperturbed season. Weeks before
+    `locked_weeks` are locked to the greedy picks of the unperturbed season
+
+    Parameters
+    ----------
+    season_path : str
+    picker_name : str
+    scenario : backtest.Scenario
+
+    Returns
+    -------
+    dict
+        Task description with `status` and, if picks were made, their win
+        probability, expected survival and the seconds taken to make them
+
+    """
+    result = {'season': os.path.basename(season_path), 'picker': picker_name, **scenario._asdict()}
+
+    season = _worker_season(season_path)
+    locked = Picks((week_number, team) for week_number, team in GreedyPicker(season).picks().items()
+                   if week_number in season.week_numbers[:scenario.locked_weeks])
+    visible_season = _worker_season(season_path, scenario.noise, scenario.variant)
+
+    try:
+        picker = make_picker(picker_name, visible_season, locked)
+        if isinstance(picker, DpPicker) and picker.horizon > DpPicker.MAX_HORIZON:
+            return {**result, 'status': 'skipped'}
+
+        start = time.perf_counter()
+        picks = picker.picks()
+        seconds = time.perf_counter() - start
+    except ValueError as exception:
+        return {**result, 'status': 'error', 'error': str(exception)}
+
+    if picks is None:
+        return {**result, 'status': 'error', 'error': 'No feasible picks'}
+
+    return {**result, 'status': 'ok', 'seconds': seconds,
+            'win_probability': season.picks_win_probability(picks),
+            'expected_survival': season.picks_expected_survival(picks)}
+
+
+def run_backtest(season_paths, picker_names, scenarios, output_file=None, max_workers=None):
+    """ Run every (season, picker, scenario) cell of backtest grid over a process pool
+
+    Parameters
+    ----------
+    season_paths : list(str)
+    picker_names : list(str)
+    scenarios : list(backtest.Scenario)
+    output_file : file, optional
+        Text file every result is written to as a JSON line as soon as it finishes
+    max_workers : int, optional
+        Number of worker processes, None to use all cores
+
+    Returns
+    -------
+    list(dict)
+        Results of `run_task` in order of completion
+
+    """
+    tasks = list(itertools.product(season_paths, picker_names, scenarios))
+    logger.info('Backtesting %d seasons, %d pickers and %d scenarios in %d tasks', len(season_paths),
+                len(picker_names), len(scenarios), len(tasks))
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker) as executor:
+        # tasks of the same season are submitted together so workers tend to reuse loaded seasons
+        futures = [executor.submit(run_task, *task) for task in tasks]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if output_file is not None:
+                output_file.write(json.dumps(result) + '\n')
+                output_file.flush()
+
+    return results
+
+
+def summary_table(results):
+    """ Mean win probability, mean expected survival and runtime per picker
+
+    Means and times are over the tasks a picker solved, so pickers skipping
+    tasks are compared on fewer seasons
+
+    Parameters
+    ----------
+    results : list(dict)
+
+    Returns
+    -------
+    str
+
+    """
+    picker_results = collections.defaultdict(list)
+    for result in results:
+        picker_results[result['picker']].append(result)
+
+    lines = [f'{"picker":<12}{"tasks":>8}{"skipped":>9}{"failed":>8}{"win probability":>18}'
+             f'{"expected survival":>20}{"median time":>14}{"p95 time":>12}']
+    for picker_name, picker_result in sorted(picker_results.items()):
+        statuses = collections.Counter(result['status'] for result in picker_result)
+        line = f'{picker_name:<12}{len(picker_result):>8}{statuses["skipped"]:>9}{statuses["error"]:>8}'
+
+        solved = [result for result in picker_result if result['status'] == 'ok']
+        if solved:
+            seconds = [result['seconds'] for result in solved]
+            line += (f'{np.mean([result["win_probability"] for result in solved]):>18.5f}'
+                     f'{np.mean([result["expected_survival"] for result in solved]):>20.3f}'
+                     f'{np.median(seconds) * 1e3:>12.1f}ms{np.percentile(seconds, 95) * 1e3:>10.1f}ms')
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+@click.command()
+@click.option('-o', '--output', 'output', type=str, default=None,
+              help='JSON Lines file path to stream results to')
+@click.option('-s', '--summary', 'summary', type=str, default=None,
+              help='File path to write summary table to, in addition to standard out')
+@click.option('-p', '--picker', 'picker_names', type=str, multiple=True,
+              help='Name of picker to backtest, can be given several times. Defaults to every picker')
+@click.option('-l', '--locked_weeks', 'locked_weeks', type=int, multiple=True,
+              help='Number of weeks locked to greedy picks at the start, can be given several times')
+@click.option('-n', '--noise', 'noises', type=float, multiple=True,
+              help='Standard deviation of log odds noise in probabilities seen by pickers, can be given '
+                   'several times')
+@click.option('-v', '--variants', 'n_variants', type=int, default=1,
+              help='Number of perturbed variants per noise level')
+@click.option('-w', '--workers', 'max_workers', type=int, default=None,
+              help='Number of worker processes, defaults to all cores')
+@click.argument('season_paths', nargs=-1)
+@initialize_logging()
+def backtest(season_paths, output, summary, picker_names, locked_weeks, noises, n_variants, max_workers):
+    """Backtest pickers across seasons, locked picks and perturbed probabilities"""
+    season_paths = season_paths or sorted(glob.glob('seasons/*.yaml'))
+    picker_names = picker_names or registered_picker_names()
+    scenarios = [Scenario(locked, noise, variant)
+                 for locked in locked_weeks or (0,)
+                 for noise in noises or (0.0,)
+                 for variant in range(n_variants if noise else 1)]
+
+    if output is not None:
+        with open(output, 'w') as output_file:
+            results = run_backtest(season_paths, picker_names, scenarios, output_file, max_workers)
+    else:
+        results = run_backtest(season_paths, picker_names, scenarios, max_workers=max_workers)
+
+    table = summary_table(results)
+    click.echo(table)
+    if summary is not None:
+        with open(summary, 'w') as summary_file:
+            summary_file.write(table + '\n')
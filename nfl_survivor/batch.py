@@ -0,0 +1,162 @@
+import concurrent.futures
+import glob
+import logging
+import os
+
+import yaml
+
+from nfl_survivor.picker_registry import make_picker, picker_class
+from nfl_survivor.picks import Picks
+from nfl_survivor.utils import YAML_LOADER
+
+logger = logging.getLogger(__name__)
+
+# picker of the worker process, set by `_initialize_worker`
+_worker = None
+
+
+def batch_entries(batch_path):
+    """ Previous picks file of every entry in a batch
+
+    Parameters
+    ----------
+    batch_path : str
+        Directory whose YAML files each hold the previous picks of one entry
+        named after the file, or YAML manifest that is either a list of
+        previous picks files or a mapping of entry names to them. Relative
+        paths in a manifest are relative to the manifest
+
+    Returns
+    -------
+    dict(str->str)
+        Entry name to path of its previous picks file, in entry order
+
+    """
+    if os.path.isdir(batch_path):
+        return {os.path.splitext(os.path.basename(picks_path))[0]: picks_path
+                for picks_path in sorted(glob.glob(os.path.join(batch_path, '*.yaml')))}
+
+    with open(batch_path, 'r') as manifest_file:
+        manifest = yaml.load(manifest_file, Loader=YAML_LOADER)
+
+    if isinstance(manifest, list):
+        manifest = {os.path.splitext(os.path.basename(picks_path))[0]: picks_path for picks_path in manifest}
+    if not isinstance(manifest, dict):
+        exception_msg = f'Batch manifest {batch_path} must be a list of previous picks files or map entries to them'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    manifest_dir = os.path.dirname(batch_path)
+    return {str(entry): os.path.join(manifest_dir, picks_path) for entry, picks_path in manifest.items()}
+
+
+class _BatchWorker:
+
+    def __init__(self, season, picker_name):
+        """ Picker for the entries handled by one process
+
+        Cached season lookups are computed up front and entries solved by LP
+        share one persistent linear program that only has its previous pick
+        bounds changed between entries
+
+        Parameters
+        ----------
+        season : season.Season
+        picker_name : str
+
+        """
+        self._season = season
+        self._picker_name = picker_name
+        self._lp_picker = None
+
+        # shared by every entry so compute once rather than on the first entry
+        for cached in ('probability_matrix', 'week_index', 'team_index', '_team_to_weeks'):
+            getattr(season, cached)
+
+    def _lp_picks(self, previous_picks):
+        try:
+            if self._lp_picker is None:
+                self._lp_picker = picker_class('lp')(self._season, previous_picks, persistent=True)
+            else:
+                self._lp_picker.update(previous_picks=previous_picks)
+
+            return self._lp_picker.picks()
+        except ValueError:
+            # a failed update can leave the linear program half changed, so start over next time
+            self._lp_picker = None
+            raise
+
+    def entry_result(self, entry, picks_path):
+        """ Picks of one entry with their scores, or the error making them
+
+        Parameters
+        ----------
+        entry : str
+        picks_path : str
+
+        Returns
+        -------
+        dict
+
+        """
+        try:
+            previous_picks = Picks.from_yaml(picks_path)
+            picker = make_picker(self._picker_name, self._season, previous_picks)
+            picks = self._lp_picks(previous_picks) if type(picker) is picker_class('lp') else picker.picks()
+        except (OSError, ValueError, KeyError, TypeError) as exception:
+            logger.warning('Could not make picks for entry %s: %s', entry, exception)
+            return {'entry': entry, 'previous_picks': picks_path, 'error': str(exception)}
+
+        if picks is None:
+            return {'entry': entry, 'previous_picks': picks_path, 'error': 'No feasible picks'}
+
+        return {'entry': entry,
+                'previous_picks': picks_path,
+                'picker': type(picker).__name__,
+                'win_probability': self._season.picks_win_probability(picks),
+                'expected_survival': self._season.picks_expected_survival(picks),
+                'picks': picks.yaml_dict()}
+
+
+def _initialize_worker(season, picker_name):
+    global _worker
+    _worker = _BatchWorker(season, picker_name)
+
+
+def _worker_entry_result(entry, picks_path):
+    return _worker.entry_result(entry, picks_path)
+
+
+def batch_picks(season, entries, picker_name='auto', max_workers=None):
+    """ Make picks for many entries of the same season
+
+    The season is sent once to each worker process, which then solves its
+    share of the entries
+
+    Parameters
+    ----------
+    season : season.Season
+    entries : dict(str->str)
+        Entry name to path of its previous picks file, as given by `batch_entries`
+    picker_name : str, optional
+    max_workers : int, optional
+        Number of worker processes, None to use all cores and 1 to solve in
+        this process
+
+    Returns
+    -------
+    list(dict)
+        Result of every entry in entry order, each with the entry name and
+        either its picks, win probability and expected survival or an error
+
+    """
+    logger.info('Making picks for %d entries', len(entries))
+
+    if max_workers == 1:
+        worker = _BatchWorker(season, picker_name)
+        return [worker.entry_result(entry, picks_path) for entry, picks_path in entries.items()]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker,
+                                                initargs=(season, picker_name)) as executor:
+        return list(executor.map(_worker_entry_result, entries.keys(), entries.values(),
+                                 chunksize=max(1, len(entries) // (4 * (max_workers or os.cpu_count() or 1)))))
@@ -0,0 +1,171 @@
+import logging
+
+import numpy as np
+
+from nfl_survivor.picker import Picker
+from nfl_survivor.picks import Picks
+
+logger = logging.getLogger(__name__)
+
+# objectives decomposing by week as (value after last week, combine(week win probability, value of rest))
+OBJECTIVES = {'probability': (1.0, lambda probability, rest: probability * rest),
+              'survival': (0.0, lambda probability, rest: probability * (1 + rest))}
+
+
+class DpPicker(Picker):
+
+    # largest number of weeks without a previous pick that is faster to solve with DP than LP
+    MAX_HORIZON = 6
+
+    def __init__(self, season, previous_picks=None, objective='probability'):
+        """ Pick maker for a season using dynamic programming over used teams
+
+        The best continuation is memoized per (week, bitmask of used teams).
+        The number of states grows exponentially with the number of weeks
+        left to pick, so this is intended for late season horizons
+
+        Parameters
+        ----------
+        season : season.Season
+            Season to make picks for
+        previous_picks : picks.Picks, optional
+            Predetermined picks
+        objective : str, optional
+            Name of objective in `OBJECTIVES` to maximize
+
+        """
+        super().__init__(season, previous_picks)
+
+        try:
+            self._terminal_value, self._combine = OBJECTIVES[objective]
+        except KeyError:
+            exception_msg = f'No objective matching {objective}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        self._objective = objective
+
+    @property
+    def objective(self):
+        """ Name of objective being maximized
+
+        Returns
+        -------
+        str
+
+        """
+        return self._objective
+
+    @property
+    def horizon(self):
+        """ Number of weeks without a previous pick
+
+        Returns
+        -------
+        int
+
+        """
+        return sum(week_number not in self.previous_picks for week_number in self.season.week_numbers)
+
+    def _week_candidates(self):
+        """ Candidate picks per week that can matter to an optimal solution
+
+        With k weeks left to pick at most k - 1 teams are taken by other
+        weeks, so one of the k best available teams of a week is always free.
+        Since both objectives increase with every week's win probability,
+        swapping in that team never hurts and all other teams can be pruned.
+        Remaining teams are renumbered to bits of a compact mask
+
+        Returns
+        -------
+        list(list(tuple(float, int, str)))
+            Win probability, team bit and team name of candidates for each week
+
+        """
+        season = self.season
+        horizon = self.horizon
+        picked = set(self.previous_picks.values())
+
+        week_columns = []
+        for week_number, probabilities in zip(season.week_numbers, season.probability_matrix):
+            if week_number in self.previous_picks:
+                week_columns.append(None)
+                continue
+
+            columns = [int(column) for column in np.argsort(-probabilities, kind='stable')
+                       if not np.isnan(probabilities[column]) and
+                       season.team_names[column] not in picked]
+            week_columns.append(columns[:horizon])
+
+        column_to_bit = {column: 1 << bit
+                         for bit, column in enumerate(sorted({column
+                                                              for columns in week_columns if columns is not None
+                                                              for column in columns}))}
+
+        week_candidates = []
+        for week_number, columns in zip(season.week_numbers, week_columns):
+            if columns is None:
+                team = self.previous_picks[week_number]
+                week_candidates.append([(season.win_probability(week_number, team), 0, team)])
+            else:
+                row = season.week_index[week_number]
+                week_candidates.append([(float(season.probability_matrix[row, column]), column_to_bit[column],
+                                         season.team_names[column])
+                                        for column in columns])
+
+        return week_candidates
+
+    def picks(self):
+        """ Make picks for a particular season using dynamic programming
+
+        Returns
+        -------
+        dict(int->str)
+            Week number to team name
+
+        """
+        week_candidates = self._week_candidates()
+        n_weeks = len(week_candidates)
+        memo = {}
+
+        def best_continuation(week, used):
+            if week == n_weeks:
+                return self._terminal_value, None
+
+            key = (week, used)
+            if key not in memo:
+                best, best_candidate = None, None
+                for candidate in week_candidates[week]:
+                    probability, bit, _ = candidate
+                    if used & bit:
+                        continue
+
+                    rest, _ = best_continuation(week + 1, used | bit)
+                    if rest is None:
+                        continue
+
+                    value = self._combine(probability, rest)
+                    if best is None or value > best:
+                        best, best_candidate = value, candidate
+
+                memo[key] = (best, best_candidate)
+
+            return memo[key]
+
+        logger.info('Solving for picks maximizing %s over a horizon of %d weeks', self.objective, self.horizon)
+        value, _ = best_continuation(0, 0)
+
+        if value is None:
+            exception_msg = 'Cannot solve for picks since there is no way to pick a distinct team every week'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        logger.info('Found %s of %f after exploring %d states', self.objective, value, len(memo))
+
+        picks, used = Picks(), 0
+        for week, week_number in enumerate(self.season.week_numbers):
+            _, (_, bit, team) = memo[week, used]
+            picks[week_number] = team
+            used |= bit
+
+        return picks
@@ -1,13 +1,19 @@
 import logging
 
+from nfl_survivor.team_registry import TEAMS
+
 logger = logging.getLogger(__name__)
 
 
 class Game:
 
+    __slots__ = ('_team_ids', '_probabilities')
+
     def __init__(self, team_prob_one, team_prob_two):
         """ One game between two teams and their respective win probabilities
 
+        Team names are stored as ids from the shared `team_registry.TEAMS`
+
         Parameters
         ----------
         team_prob_one : str, float
@@ -16,20 +22,65 @@ class Game:
             Name of team two and probability of team winning game
 
         """
-        self._team_to_probability = dict((team_prob_one, team_prob_two))
+        (team_one, probability_one), (team_two, probability_two) = team_prob_one, team_prob_two
+
+        self._team_ids = (TEAMS.team_id(team_one), TEAMS.team_id(team_two))
+        self._probabilities = (probability_one, probability_two)
+
+    @classmethod
+    def _from_ids(cls, team_ids, probabilities):
+        """ Form game from registered team ids without looking up names
+
+        Parameters
+        ----------
+        team_ids : tuple(int, int)
+        probabilities : tuple(float, float)
+
+        Returns
+        -------
+        game.Game
+
+        """
+        game = cls.__new__(cls)
+        game._team_ids, game._probabilities = team_ids, probabilities
+        return game
+
+    def __reduce__(self):
+        # ids are local to the process so pickle team names instead
+        return type(self), tuple(self._team_to_probability.items())
+
+    def __eq__(self, other):
+        if not isinstance(other, Game):
+            return NotImplemented
+
+        return self._team_ids == other._team_ids and self._probabilities == other._probabilities
+
+    def __hash__(self):
+        return hash((self._team_ids, self._probabilities))
+
+    @property
+    def _team_to_probability(self):
+        """ Map of team name to win probability
+
+        Returns
+        -------
+        dict(str->float)
+
+        """
+        return {TEAMS.team_name(team_id): probability
+                for team_id, probability in zip(self._team_ids, self._probabilities)}
 
     def __iter__(self):
         """ Iterate through team names
 
-        `yield from` produces regular generator instead of `dict_keys`
-
         Yields
         ------
         str
             Next team name
 
         """
-        yield from self._team_to_probability.keys()
+        for team_id in self._team_ids:
+            yield TEAMS.team_name(team_id)
 
     def __repr__(self):
         """ Readable representation of game
@@ -55,7 +106,7 @@ class Game:
             True if team is playing in game otherwise False
 
         """
-        return team in self._team_to_probability
+        return TEAMS.get(team) in self._team_ids
 
     @property
     def teams(self):
@@ -84,8 +135,8 @@ class Game:
 
         """
         try:
-            return self._team_to_probability[team]
-        except KeyError:
+            return self._probabilities[self._team_ids.index(TEAMS.get(team))]
+        except ValueError:
             exception_msg = f'Team {team} is not playing in game {self}'
             logger.exception(exception_msg)
             raise ValueError(exception_msg)
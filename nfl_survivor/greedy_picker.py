@@ -1,13 +1,119 @@
 import logging
 
+import numpy as np
+
 from nfl_survivor.picker import Picker
 from nfl_survivor.picks import Picks
 
 logger = logging.getLogger(__name__)
 
 
+class _RankedCandidates:
+
+    def __init__(self, probability_matrix, available):
+        """ Teams playing each week presorted by win probability
+
+        Every week keeps a cursor into its sorted teams that only moves
+        forward past teams picked for good, since picked teams never become
+        available again, so finding a week's best available team is
+        amortized constant time
+
+        Parameters
+        ----------
+        probability_matrix : numpy.ndarray
+            Season probability matrix, NaN for byes
+        available : numpy.ndarray
+            Boolean mask of teams that can still be picked, updated in place
+            by `take`
+
+        """
+        # NaN sorts last so the teams playing each week come first
+        self._order = np.argsort(-probability_matrix, axis=1, kind='stable')
+        self._n_playing = (~np.isnan(probability_matrix)).sum(axis=1)
+        self._cursors = np.zeros(len(probability_matrix), dtype=int)
+        self._available = available
+
+    def take(self, column):
+        """ Pick team for good
+
+        Parameters
+        ----------
+        column : int
+
+        """
+        self._available[column] = False
+
+    def best(self, row, n=1, excluded=0):
+        """ Best available teams of week
+
+        Parameters
+        ----------
+        row : int
+            Week row of probability matrix
+        n : int, optional
+            Number of teams
+        excluded : int, optional
+            Bit mask of columns to also skip without taking them
+
+        Returns
+        -------
+        list(int)
+            Columns of up to `n` best available teams, best first
+
+        """
+        order, n_playing, available = self._order[row], self._n_playing[row], self._available
+
+        cursor = self._cursors[row]
+        while cursor < n_playing and not available[order[cursor]]:
+            cursor += 1
+        self._cursors[row] = cursor
+
+        columns = []
+        while cursor < n_playing and len(columns) < n:
+            column = int(order[cursor])
+            if available[column] and not excluded >> column & 1:
+                columns.append(column)
+            cursor += 1
+
+        return columns
+
+
 class GreedyPicker(Picker):
 
+    def _ranked_candidates(self):
+        """ Presorted candidates with teams of previous picks already taken
+
+        Returns
+        -------
+        _RankedCandidates
+
+        """
+        season = self.season
+        candidates = _RankedCandidates(season.probability_matrix, np.ones(len(season.team_names), dtype=bool))
+
+        for team in self.previous_picks.values():
+            if team in season.team_index:
+                candidates.take(season.team_index[team])
+
+        return candidates
+
+    def _pick_column(self, candidates, row):
+        """ Column to pick in week row given the teams still available
+
+        Parameters
+        ----------
+        candidates : _RankedCandidates
+        row : int
+
+        Returns
+        -------
+        int or None
+            None if no available team plays this week
+
+        """
+        columns = candidates.best(row)
+        return columns[0] if columns else None
+
     def picks(self):
         """ Make picks for a particular season using greedy algorithm
 
@@ -21,24 +127,133 @@ class GreedyPicker(Picker):
         dict(int->str)
             Week number to team team
         """
-        picks, already_picked = Picks(), set(self.previous_picks.values())
+        season = self.season
+        picks, candidates = Picks(), self._ranked_candidates()
+
+        for row, week_number in enumerate(season.week_numbers):
+            logger.info('Determing pick for week %d', week_number)
 
-        for week in sorted(self.season.weeks, key=lambda w: w.week_number):
-            logger.info('Determing pick for week %d', week.week_number)
+            if week_number in self.previous_picks:
+                pick = self.previous_picks[week_number]
+            else:
+                column = self._pick_column(candidates, row)
 
-            pick = (max((team for team in week.teams if team not in already_picked),
-                        key=week.team_win_probability, default=None) if week.week_number not in self.previous_picks
-                    else self.previous_picks[week.week_number])
+                if column is None:
+                    exception_msg = (f'Cannot solve for week {week_number} since all teams '
+                                     'playing this week have been picked already.')
+                    logger.exception(exception_msg)
+                    raise ValueError(exception_msg)
 
-            if pick is None:
-                exception_msg = (f'Cannot solve for week {week.week_number} since all teams '
-                                 'playing this week have been picked already.')
-                logger.exception(exception_msg)
-                raise ValueError(exception_msg)
+                pick = season.team_names[column]
+                candidates.take(column)
 
-            logger.info('Picked %s for week %d', pick, week.week_number)
+            logger.info('Picked %s for week %d', pick, week_number)
 
-            picks[week.week_number] = pick
-            already_picked.add(pick)
+            picks[week_number] = pick
 
         return picks
+
+
+class LookaheadGreedyPicker(GreedyPicker):
+
+    def __init__(self, season, previous_picks=None, horizon=3, estimate_rest=True):
+        """ Greedy pick maker that looks a few weeks ahead
+
+        Each week's pick is the first pick of the most probable picks for it
+        and the next `horizon - 1` weeks without a previous pick. Only each
+        window week's `horizon` best available teams need to be searched:
+        the other window weeks use at most `horizon - 1` teams, so a worse
+        pick could always be swapped for one of them. The search memoizes
+        the best remainder of the window on the week and the teams picked
+        so far in the window, so it explores at most a few dozen states for
+        the default horizon.
+
+        A window alone still happily uses up teams the rest of the season
+        needs, so by default every way of filling the window is also scored
+        by the rest of the season with each later week getting its best team
+        not picked in the window, allowing teams to repeat across later weeks.
+        The search then still only tries each window week's `horizon` best
+        available teams, trying more barely changes the picks made
+
+        Parameters
+        ----------
+        season : season.Season
+            Season to make picks for
+        previous_picks : picks.Picks, optional
+            Predetermined picks
+        horizon : int, optional
+            Number of weeks optimized together, 1 is the plain greedy picker
+        estimate_rest : bool, optional
+            Whether to score windows by the estimated rest of the season too
+
+        """
+        super().__init__(season, previous_picks)
+
+        if horizon < 1:
+            exception_msg = f'Horizon must be at least one week, got {horizon}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        self._horizon = horizon
+        self._estimate_rest = estimate_rest
+
+        with np.errstate(divide='ignore'):
+            self._log_matrix = np.log(np.nan_to_num(season.probability_matrix, nan=0.0))
+
+    @property
+    def horizon(self):
+        return self._horizon
+
+    def _pick_column(self, candidates, row):
+        """ First pick of the most probable picks for the window starting at week row
+
+        Parameters
+        ----------
+        candidates : _RankedCandidates
+        row : int
+
+        Returns
+        -------
+        int or None
+            None if no available team plays this week. If the whole window
+            cannot be filled with distinct available teams the plain greedy
+            pick is made, leaving the error to the week that cannot be filled
+
+        """
+        season, log_matrix = self.season, self._log_matrix
+        open_rows = [later_row for later_row in range(row + 1, len(season.week_numbers))
+                     if season.week_numbers[later_row] not in self.previous_picks]
+        window = [row] + open_rows[:self.horizon - 1]
+
+        # a later week's best team outside the window is among its best len(window) + 1 available teams
+        rest = [(later_row, candidates.best(later_row, len(window) + 1))
+                for later_row in open_rows[self.horizon - 1:]] if self._estimate_rest else []
+        memo = {}
+
+        def best_remainder(depth, picked):
+            """ Log probability and first column of best picks for window from depth on """
+            key = (depth, picked)
+            if key in memo:
+                return memo[key]
+
+            if depth == len(window):
+                best = (0.0, -1)
+                for later_row, columns in rest:
+                    column = next((column for column in columns if not picked >> column & 1), None)
+                    if column is None:
+                        best = (-np.inf, -1)
+                        break
+                    best = (best[0] + log_matrix[later_row, column], -1)
+            else:
+                best = (-np.inf, None)
+                for column in candidates.best(window[depth], len(window), picked):
+                    remainder, next_column = best_remainder(depth + 1, picked | 1 << column)
+                    value = log_matrix[window[depth], column] + remainder
+                    if next_column is not None and (best[1] is None or value > best[0]):
+                        best = (value, column)
+
+            memo[key] = best
+            return best
+
+        _, column = best_remainder(0, 0)
+        return column if column is not None else super()._pick_column(candidates, row)
@@ -1,8 +1,10 @@
 import logging
+import time
 
 import numpy as np
 import pulp
 
+from nfl_survivor import profiling
 from nfl_survivor.utils import cached_property
 from nfl_survivor.picker import Picker
 from nfl_survivor.picks import Picks
@@ -12,21 +14,61 @@ logger = logging.getLogger(__name__)
 
 class LpPicker(Picker):
 
-    def __init__(self, season, previous_picks=None):
+    def __init__(self, season, previous_picks=None, persistent=False):
         """ Pick maker for a season using linear programming
 
+        A persistent picker builds its linear program once and keeps it
+        between calls to `picks`. Previous picks are then enforced through
+        variable bounds instead of constraints so that `update` only has to
+        change bounds and objective coefficients, and every solve is warm
+        started from the previous solution
+
         Parameters
         ----------
         season : season.Season
             Season to make picks for
+        previous_picks : picks.Picks, optional
+            Predetermined picks
+        persistent : bool, optional
+            Whether to keep the linear program alive between solves
 
         """
         super().__init__(season, previous_picks)
 
+        self._persistent = persistent
+        self._persistent_lp = None
+        self._timings = {'build': 0.0, 'solve': 0.0}
+        self._pending_build_time = 0.0
+
         # constraints to be implemented
-        self._constraint_handlers = (self._week_constraints,
-                                     self._team_constraints,
-                                     self._previous_pick_constraints)
+        self._constraint_handlers = ((self._week_constraints,
+                                      self._team_constraints) +
+                                     (() if persistent else (self._previous_pick_constraints,)))
+
+    @property
+    def persistent(self):
+        """ Whether linear program is kept alive between solves
+
+        Returns
+        -------
+        bool
+
+        """
+        return self._persistent
+
+    @property
+    def timings(self):
+        """ Seconds spent building and solving the linear program in the last call to `picks`
+
+        For a persistent picker building includes updates made since the
+        previous solve
+
+        Returns
+        -------
+        dict(str->float)
+
+        """
+        return dict(self._timings)
 
     @cached_property
     def _week_team_to_lp_variable(self):
@@ -92,7 +134,7 @@ class LpPicker(Picker):
         logger.info('Adding do not pick same team twice constraints')
         wt_to_lp_var = self._week_team_to_lp_variable
 
-        for team in self.season.teams:
+        for team in self.season.team_names:
             logger.info('Adding constraint to pick team %s at most once', team)
             yield pulp.LpConstraint(e=((wt_to_lp_var[week.week_number, team], 1)
                                        for week in self.season.team_weeks(team)),
@@ -119,6 +161,26 @@ class LpPicker(Picker):
                                     sense=pulp.LpConstraintEQ,
                                     name=f'previous_pick_{week_number}_{team}')
 
+    @staticmethod
+    def _log_probabilities(season):
+        """ Log win probabilities of season with zero probabilities clipped to the smallest positive float
+
+        A zero probability would put an infinite coefficient in the objective
+        that the solver cannot handle, as an override of one team to a sure
+        win does for its opponent
+
+        Parameters
+        ----------
+        season : season.Season
+
+        Returns
+        -------
+        numpy.ndarray
+            Array indexed like `season.probability_matrix`, NaN for byes
+
+        """
+        return np.log(np.clip(season.probability_matrix, np.finfo(float).tiny, None))
+
     def _max_probability_objective(self):
         """ LP objective for maximizing probability of winning all weeks in season
 
@@ -128,23 +190,31 @@ class LpPicker(Picker):
 
         """
         logger.info('Adding objective to maximize win probability')
-        wt_to_lp_var = self._week_team_to_lp_variable
+        season = self.season
+        log_probabilities = self._log_probabilities(season)
 
-        return pulp.LpAffineExpression(e=((wt_to_lp_var[week.week_number, team],
-                                           np.log(game.win_probability(team)))
-                                          for week in self.season
-                                          for game in week
-                                          for team in game))
+        return pulp.LpAffineExpression(e=((var, log_probabilities[season.week_index[week_number],
+                                                                  season.team_index[team]])
+                                          for (week_number, team), var
+                                          in self._week_team_to_lp_variable.items()))
 
     def _add_objective(self, lp):
         """ Add objective of maximizing win probability
 
+        Persistent linear programs minimize the negated objective instead
+        since CBC flips the sign of warm start solutions of maximization
+        problems and then cuts off the true optimum
+
         Returns
         -------
         None
             Modifies the linear program in place
         """
-        lp.objective = self._max_probability_objective()
+        if self.persistent:
+            lp.sense = pulp.LpMinimize
+            lp.objective = -self._max_probability_objective()
+        else:
+            lp.objective = self._max_probability_objective()
 
     def _linear_program(self):
         """ Linear program given by season
@@ -160,8 +230,137 @@ class LpPicker(Picker):
 
         self._add_objective(lp)
 
+        profiling.count('lp_variables', lp.numVariables())
+        profiling.count('lp_constraints', lp.numConstraints())
+
         return lp
 
+    def _set_previous_pick_bounds(self, old_previous_picks, new_previous_picks):
+        """ Move previous picks between fixed and free variable bounds
+
+        Only variables whose pick changed are touched
+
+        Parameters
+        ----------
+        old_previous_picks : picks.Picks
+            Previous picks currently fixed in linear program
+        new_previous_picks : picks.Picks
+            Previous picks to fix instead
+
+        """
+        wt_to_lp_var = self._week_team_to_lp_variable
+        old_items, new_items = set(old_previous_picks.items()), set(new_previous_picks.items())
+
+        for week_number, team in old_items - new_items:
+            logger.info('Freeing previous pick for week %d, team %s', week_number, team)
+            wt_to_lp_var[week_number, team].lowBound = 0
+
+        for week_number, team in new_items - old_items:
+            logger.info('Fixing previous pick for week %d, team %s', week_number, team)
+            try:
+                wt_to_lp_var[week_number, team].lowBound = 1
+            except KeyError:
+                exception_msg = f'Team {team} is not playing in week {week_number}'
+                logger.exception(exception_msg)
+                raise ValueError(exception_msg)
+
+    def _update_objective(self, season):
+        """ Change objective coefficients whose win probability differs in new season
+
+        Parameters
+        ----------
+        season : season.Season
+            Season with the same weeks, teams and byes as the current one
+
+        """
+        old_log_probabilities = self._log_probabilities(self.season)
+        new_log_probabilities = self._log_probabilities(season)
+        changed = np.argwhere(~np.isnan(old_log_probabilities) &
+                              (old_log_probabilities != new_log_probabilities))
+
+        logger.info('Updating %d objective coefficients', len(changed))
+        wt_to_lp_var = self._week_team_to_lp_variable
+        for row, column in changed:
+            var = wt_to_lp_var[season.week_numbers[row], season.team_names[column]]
+            self._persistent_lp.objective[var] = -new_log_probabilities[row, column]
+
+    def update(self, season=None, previous_picks=None):
+        """ Update probabilities or previous picks of a persistent picker in place
+
+        Parameters
+        ----------
+        season : season.Season, optional
+            Season with new win probabilities. Its weeks, teams and byes must
+            match the current season
+        previous_picks : picks.Picks, optional
+            New predetermined picks
+
+        """
+        if not self.persistent:
+            exception_msg = 'Only persistent LP pickers can be updated in place'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        start = time.perf_counter()
+
+        if season is not None:
+            same_structure = (season.week_numbers == self.season.week_numbers and
+                              season.team_names == self.season.team_names and
+                              np.array_equal(np.isnan(season.probability_matrix),
+                                             np.isnan(self.season.probability_matrix)))
+            if not same_structure:
+                exception_msg = 'Cannot update picker with season that has different weeks, teams or byes'
+                logger.exception(exception_msg)
+                raise ValueError(exception_msg)
+
+            if self._persistent_lp is not None:
+                self._update_objective(season)
+            self._season = season
+
+        if previous_picks is not None:
+            if self._persistent_lp is not None:
+                self._set_previous_pick_bounds(self.previous_picks, previous_picks)
+            self._previous_picks = previous_picks
+
+        self._pending_build_time += time.perf_counter() - start
+
+    def _solved_linear_program(self):
+        """ Build (or reuse) and solve linear program, recording timings
+
+        Returns
+        -------
+        pulp.LpProblem
+        int
+            Solve status
+
+        """
+        start = time.perf_counter()
+
+        with profiling.phase('lp_build'):
+            if not self.persistent:
+                logger.info('Creating linear program to determine picks')
+                linear_program, solver = self._linear_program(), None
+            else:
+                if self._persistent_lp is None:
+                    logger.info('Creating persistent linear program to determine picks')
+                    self._persistent_lp = self._linear_program()
+                    self._set_previous_pick_bounds({}, self.previous_picks)
+                linear_program, solver = self._persistent_lp, pulp.PULP_CBC_CMD(warmStart=True)
+
+        build_time = time.perf_counter() - start + self._pending_build_time
+        self._pending_build_time = 0.0
+
+        logger.info('Solving linear program')
+        start = time.perf_counter()
+        with profiling.phase('lp_solve'):
+            status = linear_program.solve() if solver is None else linear_program.solve(solver)
+        self._timings = {'build': build_time, 'solve': time.perf_counter() - start}
+
+        logger.info('Built linear program in %.4fs and solved in %.4fs',
+                    self._timings['build'], self._timings['solve'])
+
+        return linear_program, status
+
     def picks(self):
         """ Make picks for a particular season using LP
 
@@ -176,15 +375,12 @@ class LpPicker(Picker):
             Week number to team name. None if LP solve was unsuccessful
 
         """
-        logger.info('Creating linear program to determine picks')
-        linear_program = self._linear_program()
-
-        logger.info('Solving linear program')
-        status = linear_program.solve()
+        _, status = self._solved_linear_program()
 
         logger.info('Linear program status %s', pulp.LpStatus[status])
 
         logger.info('Forming picks')
-        return (Picks(week_team
-                      for week_team, var in self._week_team_to_lp_variable.items()
-                      if var.varValue == 1) if status == pulp.LpStatusOptimal else None)
+        with profiling.phase('lp_extract'):
+            return (Picks(week_team
+                          for week_team, var in self._week_team_to_lp_variable.items()
+                          if var.varValue == 1) if status == pulp.LpStatusOptimal else None)
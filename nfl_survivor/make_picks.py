@@ -1,56 +1,183 @@
+import json
 import logging
 import pprint
 
 import click
 
-from nfl_survivor.greedy_picker import GreedyPicker
-from nfl_survivor.lp_picker import LpPicker
+from nfl_survivor import profiling
+from nfl_survivor.picker_registry import make_picker, picker_class
 from nfl_survivor.picks import Picks
 from nfl_survivor.season import Season
-from nfl_survivor.utils import initialize_logging
-from tools.scrape_538 import Scraper
+from nfl_survivor.utils import initialize_logging, write_yaml
 
 logger = logging.getLogger(__name__)
 
-PICKERS = (GreedyPicker, LpPicker)
+# pickers, the scraper and their dependencies such as pulp, requests and bs4 are
+# imported when first used so that startup only pays for what a run needs
 
 
 def _parsed_season(season_path, year):
     if season_path is not None:
-        return Season.from_yaml(season_path)
+        with profiling.phase('load_season'):
+            season = Season.from_yaml(season_path)
     elif year is not None:
-        return Scraper.season_from_year(year)
+        from tools.scrape_538 import Scraper
+
+        with profiling.phase('scrape'):
+            season = Scraper.season_from_year(year)
     else:
         raise ValueError('Must specify either season path or year')
 
+    if profiling.enabled():
+        profiling.count('games_loaded', sum(len(week.games) for week in season))
+
+    return season
+
+
+def _ranked_picks_dict(top_picks):
+    """ YAML style dictionary of ranked picks
+
+    Parameters
+    ----------
+    top_picks : list(tuple(picks.Picks, float))
+        Picks and their win probability, best first
+
+    Returns
+    -------
+    list(dict)
+
+    """
+    return [{'rank': rank, 'win_probability': win_probability, 'picks': picks.yaml_dict()}
+            for rank, (picks, win_probability) in enumerate(top_picks, 1)]
+
+
+def _portfolio_dict(portfolio_picker, portfolio):
+    """ YAML style dictionary of portfolio and its scores
+
+    Parameters
+    ----------
+    portfolio_picker : portfolio_picker.PortfolioPicker
+    portfolio : list(picks.Picks)
+
+    Returns
+    -------
+    dict
+
+    """
+    scores = portfolio_picker.scores(portfolio)
+    return {'joint_survival': scores.joint_survival,
+            'expected_survivors': scores.expected_survivors,
+            'entries': [{'entry': entry,
+                         'win_probability': portfolio_picker.season.picks_win_probability(picks),
+                         'picks': picks.yaml_dict()}
+                        for entry, picks in enumerate(portfolio, 1)]}
+
 
 @click.command()
 @click.option('-pp', '--previous_picks', 'previous_picks', type=str, default=None,
               help='File path to YAML file with previous picks')
-@click.option('-p', '--picker', 'picker_name', type=str, default='lp',
-              help='Name of picker to use when making picks (lp | greedy)')
+@click.option('-p', '--picker', 'picker_name', type=str, default='auto',
+              help='Name of picker to use when making picks (auto | lp | greedy | lookahead | assignment | survival | '
+                   'dp | robust | any picker registered under the nfl_survivor.pickers entry point group)')
 @click.option('-o', '--output', 'output', type=str, default=None,
               help='YAML file path to write picks to')
 @click.option('-y', '--year', 'year', type=int, default=None,
               help='Year to scrape season for')
 @click.option('-s', '--season', 'season_path', type=str, default=None,
               help='File path to season YAML. Takes precedence over year')
+@click.option('-k', '--top-k', 'top_k', type=int, default=None,
+              help='Write the K best distinct picks by win probability instead of a single set of picks')
+@click.option('-n', '--entries', 'n_entries', type=int, default=None,
+              help='Pick for this many entries jointly, maximizing the probability at least one survives')
+@click.option('-b', '--batch', 'batch_path', type=str, default=None,
+              help='Directory of previous picks YAML files, one per entry, or YAML manifest listing them. '
+                   'Makes picks for every entry and writes them together')
+@click.option('-w', '--workers', 'max_workers', type=int, default=None,
+              help='Number of processes making picks for entries of a batch, defaults to all cores')
+@click.option('--profile', 'profile', is_flag=True, default=False,
+              help='Write JSON report of phase timings, peak memory and counters to standard error')
+@click.option('--profile_output', 'profile_output', type=str, default=None,
+              help='JSON file path to write profile report to instead of standard error. Implies --profile')
 @initialize_logging()
-def make_picks(season_path, year, output, picker_name, previous_picks):
+def make_picks(season_path, year, output, picker_name, previous_picks, top_k, n_entries, batch_path, max_workers,
+               profile, profile_output):
     """Make picks for a given season and set of previous picks"""
+    arguments = (season_path, year, output, picker_name, previous_picks, top_k, n_entries, batch_path, max_workers)
+    if not (profile or profile_output):
+        _make_picks(*arguments)
+        return
+
+    with profiling.profile() as run_profile:
+        _make_picks(*arguments)
+
+    if profile_output is not None:
+        logger.info('Writing profile report to file %s', profile_output)
+        run_profile.to_json(profile_output)
+    else:
+        click.echo(json.dumps(run_profile.report(), indent=2), err=True)
+
+
+def _make_picks(season_path, year, output, picker_name, previous_picks, top_k, n_entries, batch_path, max_workers):
+    if batch_path is not None and (previous_picks or top_k is not None or n_entries is not None):
+        exception_msg = 'Batch mode reads previous picks from the batch and cannot rank picks or pick portfolios'
+        logger.exception(exception_msg)
+        raise click.UsageError(exception_msg)
+
+    if top_k is not None and n_entries is not None:
+        exception_msg = 'Cannot both rank picks and pick portfolios'
+        logger.exception(exception_msg)
+        raise click.UsageError(exception_msg)
+
+    if picker_name.lower() != 'auto' and (top_k is not None or n_entries is not None):
+        exception_msg = (f'Cannot use picker {picker_name} to rank picks or pick portfolios, they are made by '
+                         'the assignment and portfolio pickers')
+        logger.exception(exception_msg)
+        raise click.UsageError(exception_msg)
+
     season = _parsed_season(season_path, year)
+
+    if batch_path is not None:
+        from nfl_survivor.batch import batch_entries, batch_picks
+
+        with profiling.phase('pick'):
+            results = batch_picks(season, batch_entries(batch_path), picker_name, max_workers)
+        if output is not None:
+            logger.info('Writing picks of %d entries to file %s', len(results), output)
+            write_yaml(results, output)
+        else:
+            pprint.pprint(results)
+        return
+
     previous_picks = Picks.from_yaml(previous_picks) if previous_picks else None
-    try:
-        picker = {picker.__name__.lower(): picker
-                  for picker in PICKERS}[picker_name.lower() + 'picker']
-    except KeyError:
-        exception_msg = f'No picker matching {picker_name}'
-        logger.exception(exception_msg)
-        raise ValueError(exception_msg)
 
-    picks = picker(season, previous_picks).picks()
+    if n_entries is not None:
+        from nfl_survivor.portfolio_picker import PortfolioPicker
 
-    if output is not None:
-        picks.to_yaml(output)
-    else:
-        pprint.pprint(picks.yaml_dict())
+        portfolio_picker = PortfolioPicker(season, n_entries, previous_picks)
+        with profiling.phase('pick'):
+            portfolio = _portfolio_dict(portfolio_picker, portfolio_picker.picks())
+        if output is not None:
+            logger.info('Writing picks of %d entries to file %s', n_entries, output)
+            write_yaml(portfolio, output)
+        else:
+            pprint.pprint(portfolio)
+        return
+
+    if top_k is not None:
+        with profiling.phase('pick'):
+            ranked = _ranked_picks_dict(picker_class('assignment')(season, previous_picks).top_picks(top_k))
+        if output is not None:
+            logger.info('Writing %d ranked picks to file %s', len(ranked), output)
+            write_yaml(ranked, output)
+        else:
+            pprint.pprint(ranked)
+        return
+
+    with profiling.phase('pick'):
+        picks = make_picker(picker_name, season, previous_picks).picks()
+
+    with profiling.phase('write'):
+        if output is not None:
+            picks.to_yaml(output)
+        else:
+            pprint.pprint(picks.yaml_dict())
@@ -0,0 +1,487 @@
+import asyncio
+import collections
+import concurrent.futures
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+import click
+import numpy as np
+
+from nfl_survivor.picker_registry import make_picker, picker_class
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+from nfl_survivor.utils import initialize_logging
+
+logger = logging.getLogger(__name__)
+
+# number of most recent latencies per route kept for percentiles
+LATENCY_WINDOW = 1000
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            500: 'Internal Server Error'}
+
+# seasons of the worker process by path, loaded on first use
+_WORKER_SEASONS = {}
+
+
+def overridden_season(season, overrides):
+    """ Season with win probabilities of some teams replaced
+
+    Parameters
+    ----------
+    season : season.Season
+    overrides : list(dict)
+        Each with `week`, `team` and its new win `probability`. The opponent
+        gets the complement
+
+    Returns
+    -------
+    season.Season
+
+    """
+    if not overrides:
+        return season
+
+    columns = season.to_columns()
+    team_ids = {team: team_id for team_id, team in enumerate(columns['teams'])}
+    probability = columns['probability'].copy()
+
+    for override in overrides:
+        week_number, team = override['week'], override['team']
+        rows = np.flatnonzero((columns['week'] == week_number) & (columns['team'] == team_ids.get(team, -1)))
+        if not len(rows) or not 0 <= override['probability'] <= 1:
+            exception_msg = f'Cannot override probability of team {team} in week {week_number}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        # rows of a game are next to each other, so the opponent is the other row of the pair
+        row = rows[0]
+        probability[row] = override['probability']
+        probability[row ^ 1] = 1 - override['probability']
+
+    columns['probability'] = probability
+    return Season.from_columns(**columns)
+
+
+def _request_picks(request):
+    """ Previous picks of request
+
+    Parameters
+    ----------
+    request : dict
+
+    Returns
+    -------
+    picks.Picks
+
+    """
+    return Picks((int(week_number), team) for week_number, team in request.get('previous_picks', {}).items())
+
+
+def _response(picker, picks, season):
+    """ JSON response with picks and their scores under season of request
+
+    Parameters
+    ----------
+    picker : picker.Picker
+    picks : picks.Picks or None
+    season : season.Season
+
+    Returns
+    -------
+    dict
+
+    """
+    if picks is None:
+        exception_msg = 'Could not find picks for request'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    return {'picker': type(picker).__name__,
+            'picks': {str(week_number): team for week_number, team in sorted(picks.items())},
+            'win_probability': season.picks_win_probability(picks),
+            'expected_survival': season.picks_expected_survival(picks)}
+
+
+def _initialize_worker():
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _worker_solve(season_path, request):
+    """ Solve request with a picker other than LP in a worker process
+
+    Parameters
+    ----------
+    season_path : str
+    request : dict
+
+    Returns
+    -------
+    dict
+
+    """
+    if season_path not in _WORKER_SEASONS:
+        _WORKER_SEASONS[season_path] = Season.from_yaml(season_path)
+
+    season = overridden_season(_WORKER_SEASONS[season_path], request.get('overrides'))
+    picker = make_picker(request.get('picker', 'auto'), season, _request_picks(request))
+    return _response(picker, picker.picks(), season)
+
+
+class LatencyMetrics:
+
+    def __init__(self, window=LATENCY_WINDOW):
+        """ Request counts and latencies per route
+
+        Parameters
+        ----------
+        window : int, optional
+            Number of most recent latencies per route used for percentiles
+
+        """
+        self._window = window
+        self._counts = collections.Counter()
+        self._errors = collections.Counter()
+        self._latencies = collections.defaultdict(lambda: collections.deque(maxlen=self._window))
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, error=False):
+        """ Record latency of one request
+
+        Parameters
+        ----------
+        route : str
+        seconds : float
+        error : bool, optional
+
+        """
+        with self._lock:
+            self._counts[route] += 1
+            self._errors[route] += error
+            self._latencies[route].append(seconds)
+
+    def summary(self):
+        """ Requests, errors and latency percentiles in milliseconds per route
+
+        Returns
+        -------
+        dict(str->dict)
+
+        """
+        with self._lock:
+            latencies = {route: np.array(route_latencies) * 1e3 for route, route_latencies in self._latencies.items()}
+            counts, errors = dict(self._counts), dict(self._errors)
+
+        return {route: {'requests': counts[route], 'errors': errors[route],
+                        'mean_ms': float(latencies[route].mean()),
+                        **{f'p{percentile}_ms': float(np.percentile(latencies[route], percentile))
+                           for percentile in (50, 95, 99)},
+                        'max_ms': float(latencies[route].max())}
+                for route in sorted(counts)}
+
+
+class PickServer:
+
+    def __init__(self, season_paths, max_workers=None, max_processes=None):
+        """ Pick maker serving JSON requests while keeping seasons and solvers warm
+
+        Seasons are parsed on first request and kept. LP requests reuse one
+        persistent `LpPicker` per season, updated in place with each request's
+        previous picks and overrides so later solves are warm started. They
+        are solved on a thread pool, since the LP solver runs in its own
+        process. Other pickers search in Python while holding the GIL, so
+        their requests are sent on to a process pool whose workers each keep
+        the seasons they have loaded
+
+        Parameters
+        ----------
+        season_paths : dict(str->str)
+            Season id to path of season YAML
+        max_workers : int, optional
+            Number of threads solving requests, None for the executor default
+        max_processes : int, optional
+            Number of processes solving requests with pickers other than LP,
+            None for all cores and 0 to solve them on the threads instead
+
+        """
+        self._season_paths = season_paths
+        self._seasons = {}
+        self._lp_pickers = {}
+        # one lock per season guards loading it and its persistent LP picker
+        self._season_locks = collections.defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix='pick_server')
+        self._process_executor = None
+        if max_processes != 0:
+            # forking from a process with running threads can copy locks they hold, so start workers afresh
+            self._process_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_processes, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_initialize_worker)
+        self._metrics = LatencyMetrics()
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def _season_lock(self, season_id):
+        with self._lock:
+            return self._season_locks[season_id]
+
+    def season(self, season_id):
+        """ Season with id, parsed on first use
+
+        Parameters
+        ----------
+        season_id : str
+
+        Returns
+        -------
+        season.Season
+
+        """
+        if season_id not in self._season_paths:
+            exception_msg = f'No season matching {season_id}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        if season_id not in self._seasons:
+            with self._season_lock(season_id):
+                if season_id not in self._seasons:
+                    self._seasons[season_id] = Season.from_yaml(self._season_paths[season_id])
+
+        return self._seasons[season_id]
+
+    def _lp_picks(self, season_id, season, previous_picks):
+        """ Picks from persistent LP picker of season, updated to this request
+
+        Parameters
+        ----------
+        season_id : str
+        season : season.Season
+            Season of request including overrides
+        previous_picks : picks.Picks
+
+        Returns
+        -------
+        picks.Picks
+
+        """
+        with self._season_lock(season_id):
+            lp_picker = self._lp_pickers.get(season_id)
+            try:
+                if lp_picker is None:
+                    lp_picker = self._lp_pickers[season_id] = picker_class('lp')(season, previous_picks,
+                                                                                 persistent=True)
+                else:
+                    lp_picker.update(season, previous_picks)
+
+                return lp_picker.picks()
+            except ValueError:
+                # a failed update can leave the linear program half changed, so start over next time
+                self._lp_pickers.pop(season_id, None)
+                raise
+
+    def solve(self, request):
+        """ Make picks for JSON request
+
+        Parameters
+        ----------
+        request : dict
+            With `season` id and optional `picker` name (defaults to `auto`),
+            `previous_picks` mapping week numbers to teams and `overrides`
+            as taken by `overridden_season`
+
+        Returns
+        -------
+        dict
+            Picks by week number with their win probability and expected
+            survival under the request's probabilities
+
+        """
+        if 'season' not in request:
+            exception_msg = 'Request must name a season'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        season_id, picker_name = request['season'], request.get('picker', 'auto')
+        season = overridden_season(self.season(season_id), request.get('overrides'))
+        previous_picks = _request_picks(request)
+
+        picker = make_picker(picker_name, season, previous_picks)
+        if picker.__class__ is picker_class('lp'):
+            picks = self._lp_picks(season_id, season, previous_picks)
+        elif self._process_executor is not None:
+            return self._process_executor.submit(_worker_solve, self._season_paths[season_id], request).result()
+        else:
+            picks = picker.picks()
+
+        return _response(picker, picks, season)
+
+    async def _route(self, method, path, body):
+        """ Status and JSON response for request
+
+        Parameters
+        ----------
+        method : str
+        path : str
+        body : bytes
+
+        Returns
+        -------
+        int
+        dict
+
+        """
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, {'seasons_loaded': sorted(self._seasons), 'routes': self.metrics.summary()}
+        if path == '/seasons':
+            return 200, {'seasons': sorted(self._season_paths)}
+        if path != '/picks':
+            return 404, {'error': f'No route matching {path}'}
+        if method != 'POST':
+            return 405, {'error': 'Picks must be requested with POST'}
+
+        try:
+            request = json.loads(body or b'{}')
+            response = await asyncio.get_running_loop().run_in_executor(self._executor, self.solve, request)
+        except (ValueError, KeyError, TypeError, AttributeError) as exception:
+            return 400, {'error': str(exception)}
+
+        return 200, response
+
+    async def handle_connection(self, reader, writer):
+        """ Serve HTTP/1.1 requests on connection until client closes it
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+        writer : asyncio.StreamWriter
+
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                start = time.perf_counter()
+                try:
+                    status, response = await self._route(method, path, body)
+                except Exception:
+                    logger.exception('Failed to serve %s %s', method, path)
+                    status, response = 500, {'error': 'Internal server error'}
+                self.metrics.record(f'{method} {path}', time.perf_counter() - start, status >= 400)
+
+                content = json.dumps(response).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(f'HTTP/1.1 {status} {_REASONS[status]}\r\n'
+                             f'Content-Type: application/json\r\n'
+                             f'Content-Length: {len(content)}\r\n'
+                             f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode() + content)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            logger.info('Dropped malformed or interrupted connection')
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8080, unix_socket=None):
+        """ Start listening on TCP port or Unix socket
+
+        Parameters
+        ----------
+        host : str, optional
+        port : int, optional
+            0 picks a free port
+        unix_socket : str, optional
+            Path of Unix socket to listen on instead of TCP
+
+        Returns
+        -------
+        asyncio.Server
+
+        """
+        if unix_socket is not None:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_socket)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+
+        logger.info('Serving picks for %d seasons on %s', len(self._season_paths),
+                    ', '.join(str(sock.getsockname()) for sock in server.sockets))
+        return server
+
+    def close(self):
+        """ Stop worker threads and processes once running solves finish """
+        self._executor.shutdown(wait=True)
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=True)
+
+
+def season_paths_from_dir(season_dir):
+    """ Season ids, the file names without extension, of season YAML files in directory
+
+    Parameters
+    ----------
+    season_dir : str
+
+    Returns
+    -------
+    dict(str->str)
+
+    """
+    return {os.path.splitext(os.path.basename(season_path))[0]: season_path
+            for season_path in sorted(glob.glob(os.path.join(season_dir, '*.yaml')))}
+
+
+async def _serve(pick_server, host, port, unix_socket):
+    server = await pick_server.start(host, port, unix_socket)
+    async with server:
+        await server.serve_forever()
+
+
+@click.command()
+@click.option('-d', '--season_dir', 'season_dir', type=str, default='seasons',
+              help='Directory of season YAML files served by file name without extension')
+@click.option('-H', '--host', 'host', type=str, default='127.0.0.1',
+              help='Host to listen on')
+@click.option('-p', '--port', 'port', type=int, default=8080,
+              help='Port to listen on')
+@click.option('-u', '--unix_socket', 'unix_socket', type=str, default=None,
+              help='Path of Unix socket to listen on instead of host and port')
+@click.option('-w', '--workers', 'max_workers', type=int, default=None,
+              help='Number of threads solving requests')
+@click.option('-P', '--processes', 'max_processes', type=int, default=None,
+              help='Number of processes solving requests with pickers other than LP, 0 to use the threads')
+@click.option('--preload/--no-preload', 'preload', default=False,
+              help='Whether to parse every season before serving')
+@initialize_logging()
+def pick_server(season_dir, host, port, unix_socket, max_workers, max_processes, preload):
+    """Serve picks for JSON requests, keeping seasons and solvers in memory"""
+    server = PickServer(season_paths_from_dir(season_dir), max_workers, max_processes)
+    if preload:
+        for season_id in season_paths_from_dir(season_dir):
+            server.season(season_id)
+
+    try:
+        asyncio.run(_serve(server, host, port, unix_socket))
+    except KeyboardInterrupt:
+        logger.info('Shutting down')
+    finally:
+        server.close()
@@ -0,0 +1,104 @@
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# entry point group other packages register pickers under
+ENTRY_POINT_GROUP = 'nfl_survivor.pickers'
+
+# pickers shipped with the package, as `module:class` so they are only imported once chosen
+BUILTIN_PICKERS = {'assignment': 'nfl_survivor.assignment_picker:AssignmentPicker',
+                   'dp': 'nfl_survivor.dp_picker:DpPicker',
+                   'greedy': 'nfl_survivor.greedy_picker:GreedyPicker',
+                   'lookahead': 'nfl_survivor.greedy_picker:LookaheadGreedyPicker',
+                   'lp': 'nfl_survivor.lp_picker:LpPicker',
+                   'robust': 'nfl_survivor.robust_picker:RobustPicker',
+                   'survival': 'nfl_survivor.survival_picker:SurvivalPicker'}
+
+
+def _entry_points():
+    """ Pickers registered by installed packages under `ENTRY_POINT_GROUP`
+
+    Returns
+    -------
+    dict(str->importlib.metadata.EntryPoint)
+
+    """
+    # importing metadata machinery is itself noticeable at startup so only do it when needed
+    from importlib.metadata import entry_points
+
+    return {entry_point.name.lower(): entry_point for entry_point in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def picker_names():
+    """ Names of all pickers, built in and registered through entry points
+
+    Returns
+    -------
+    list(str)
+
+    """
+    return sorted(BUILTIN_PICKERS.keys() | _entry_points().keys())
+
+
+def picker_class(picker_name):
+    """ Class of picker with given name, importing its module on first use
+
+    Built in pickers take precedence over entry points of the same name
+
+    Parameters
+    ----------
+    picker_name : str
+        Case insensitive picker name
+
+    Returns
+    -------
+    type
+
+    """
+    picker_name = picker_name.lower()
+
+    if picker_name in BUILTIN_PICKERS:
+        module_name, class_name = BUILTIN_PICKERS[picker_name].split(':')
+        return getattr(importlib.import_module(module_name), class_name)
+
+    entry_point = _entry_points().get(picker_name)
+    if entry_point is None:
+        exception_msg = f'No picker matching {picker_name}'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    logger.info('Loading picker %s from %s', picker_name, entry_point.value)
+    return entry_point.load()
+
+
+def make_picker(picker_name, season, previous_picks=None):
+    """ Picker with given name for season
+
+    The name `auto` uses `DpPicker` when few enough weeks are left to pick
+    for it to beat the LP and `LpPicker` otherwise. Other names are resolved
+    by `picker_class`
+
+    Parameters
+    ----------
+    picker_name : str
+        Case insensitive picker name or `auto`
+    season : season.Season
+    previous_picks : picks.Picks, optional
+
+    Returns
+    -------
+    picker.Picker
+
+    """
+    if picker_name.lower() == 'auto':
+        dp_picker_class = picker_class('dp')
+        dp_picker = dp_picker_class(season, previous_picks)
+        if dp_picker.horizon <= dp_picker_class.MAX_HORIZON:
+            logger.info('Using DP picker for horizon of %d weeks', dp_picker.horizon)
+            return dp_picker
+
+        logger.info('Using LP picker for horizon of %d weeks', dp_picker.horizon)
+        return picker_class('lp')(season, previous_picks)
+
+    return picker_class(picker_name)(season, previous_picks)
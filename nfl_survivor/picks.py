@@ -2,7 +2,7 @@ import logging
 
 import yaml
 
-from nfl_survivor.utils import write_yaml
+from nfl_survivor.utils import YAML_LOADER, write_yaml
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +51,7 @@ class Picks(dict):
         """
         logger.info('Loading picks from %s', yaml_file_path)
         with open(yaml_file_path, 'r') as yaml_file:
-            picks = cls.from_list(yaml.load(yaml_file, Loader=yaml.Loader))
+            picks = cls.from_list(yaml.load(yaml_file, Loader=YAML_LOADER))
 
         if not len(set(picks.values())) == len(picks):
             exception_msg = f'Invalid picks, there are teams appearing more than once in {yaml_file_path}'
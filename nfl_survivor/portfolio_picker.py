@@ -0,0 +1,272 @@
+import collections
+import itertools
+import logging
+
+import numpy as np
+
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.picks import Picks
+from nfl_survivor.simulation import opponent_columns, sample_wins
+
+logger = logging.getLogger(__name__)
+
+PortfolioScores = collections.namedtuple('PortfolioScores', ('joint_survival', 'expected_survivors'))
+
+
+class PortfolioPicker:
+
+    # largest number of entries searched exhaustively over the candidate pool
+    EXACT_MAX_ENTRIES = 3
+    # largest number of entries whose joint survival is evaluated exactly
+    EXACT_EVALUATION_MAX_ENTRIES = 10
+
+    def __init__(self, season, n_entries, previous_picks=None, pool_size=None, n_samples=20000, seed=None):
+        """ Pick maker for several entries in the same pool
+
+        Entries are chosen jointly to maximize the probability that at least
+        one of them survives the season. Entries picking the same team lose
+        together and entries picking opposite sides of a game cannot both
+        lose, so this differs from giving every entry its own best picks.
+        Entries are drawn from a pool of the best candidate picks by win
+        probability. Up to `EXACT_MAX_ENTRIES` entries every combination in
+        the pool is evaluated exactly, larger portfolios are found by
+        coordinate ascent over sampled game outcomes
+
+        Parameters
+        ----------
+        season : season.Season
+            Season to make picks for
+        n_entries : int
+            Number of entries in portfolio
+        previous_picks : picks.Picks, optional
+            Predetermined picks shared by all entries
+        pool_size : int, optional
+            Number of candidate picks, defaults to 24 for exhaustive search and
+            200 for coordinate ascent
+        n_samples : int, optional
+            Number of sampled seasons of game outcomes used by coordinate ascent
+        seed : int, optional
+            Seed of sampled game outcomes
+
+        """
+        if n_entries < 1:
+            exception_msg = f'Cannot make portfolio of {n_entries} entries'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        self._season = season
+        self._n_entries = n_entries
+        self._previous_picks = previous_picks if previous_picks is not None else Picks()
+        self._pool_size = pool_size if pool_size is not None else 24 if self.exact else 200
+        self._n_samples = n_samples
+        self._seed = seed
+
+    @property
+    def season(self):
+        return self._season
+
+    @property
+    def n_entries(self):
+        return self._n_entries
+
+    @property
+    def previous_picks(self):
+        return self._previous_picks
+
+    @property
+    def exact(self):
+        """ Whether portfolio is found by exhaustive search over the candidate pool
+
+        Returns
+        -------
+        bool
+
+        """
+        return self.n_entries <= self.EXACT_MAX_ENTRIES
+
+    def _candidates(self):
+        """ Best candidate picks by win probability
+
+        Returns
+        -------
+        list(picks.Picks)
+        numpy.ndarray
+            Team ids of candidates as rows of shape (candidates, weeks)
+
+        """
+        candidates = [picks for picks, _ in
+                      AssignmentPicker(self.season, self.previous_picks).top_picks(self._pool_size)]
+
+        if not candidates:
+            exception_msg = 'Cannot solve for picks since there is no way to pick a distinct team every week'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        return candidates, np.array([self.season.picks_team_ids(picks) for picks in candidates])
+
+    def _week_outcomes(self, entry_team_ids, opponents):
+        """ Distribution of surviving entries in each week
+
+        Parameters
+        ----------
+        entry_team_ids : numpy.ndarray
+            Team ids of entries as rows of shape (entries, weeks)
+        opponents : numpy.ndarray
+            Opponent columns given by `simulation.opponent_columns`
+
+        Returns
+        -------
+        list(list(tuple(float, int)))
+            For each week the probability and bitmask of entries winning for
+            every combination of outcomes of the games picked
+
+        """
+        matrix = self.season.probability_matrix
+        week_outcomes = []
+
+        for week, team_ids in enumerate(entry_team_ids.T):
+            # every picked game is identified by its lower team id
+            games = sorted({min(team_id, opponents[week, team_id]) for team_id in team_ids
+                            if team_id >= 0 and opponents[week, team_id] >= 0})
+
+            outcomes = []
+            for leads_win in itertools.product((True, False), repeat=len(games)):
+                probability, winners = 1.0, set()
+                for game, lead_wins in zip(games, leads_win):
+                    lead_probability = matrix[week, game]
+                    probability *= lead_probability if lead_wins else 1 - lead_probability
+                    winners.add(game if lead_wins else opponents[week, game])
+
+                mask = sum(1 << entry for entry, team_id in enumerate(team_ids) if team_id in winners)
+                outcomes.append((probability, mask))
+
+            week_outcomes.append(outcomes)
+
+        return week_outcomes
+
+    def _exact_joint_survival(self, entry_team_ids, opponents):
+        """ Probability at least one entry survives, by DP over the set of entries alive
+
+        Parameters
+        ----------
+        entry_team_ids : numpy.ndarray
+        opponents : numpy.ndarray
+
+        Returns
+        -------
+        float
+
+        """
+        alive = {(1 << len(entry_team_ids)) - 1: 1.0}
+
+        for outcomes in self._week_outcomes(entry_team_ids, opponents):
+            next_alive = collections.defaultdict(float)
+            for alive_mask, alive_probability in alive.items():
+                for probability, winners in outcomes:
+                    if alive_mask & winners:
+                        next_alive[alive_mask & winners] += alive_probability * probability
+            alive = next_alive
+
+        return float(sum(alive.values()))
+
+    def _coordinate_ascent(self, team_ids, opponents):
+        """ Choose entries by greedy construction then coordinate ascent on sampled survival
+
+        Parameters
+        ----------
+        team_ids : numpy.ndarray
+            Team ids of candidates
+        opponents : numpy.ndarray
+
+        Returns
+        -------
+        list(int)
+            Candidate chosen for each entry
+
+        """
+        wins = sample_wins(self.season, self._n_samples, np.random.default_rng(self._seed), opponents)
+        n_weeks = team_ids.shape[1]
+
+        # survival of each candidate in each sampled season
+        survives = np.ones((len(team_ids), self._n_samples), dtype=bool)
+        for week in range(n_weeks):
+            survives &= wins[:, week, np.maximum(team_ids[:, week], 0)].T & (team_ids[:, [week]] >= 0)
+
+        def best_response(others):
+            others_alive = survives[others].any(axis=0) if others else np.zeros(self._n_samples, dtype=bool)
+            return int(np.argmax((survives & ~others_alive).sum(axis=1)))
+
+        chosen = []
+        for _ in range(self.n_entries):
+            chosen.append(best_response(chosen))
+
+        for sweep in range(self.n_entries * 10):
+            improved = False
+            for entry in range(self.n_entries):
+                others = chosen[:entry] + chosen[entry + 1:]
+                candidate = best_response(others)
+                gain = (survives[others + [candidate]].any(axis=0).sum() -
+                        survives[others + [chosen[entry]]].any(axis=0).sum())
+                if gain > 0:
+                    chosen[entry], improved = candidate, True
+
+            if not improved:
+                logger.info('Coordinate ascent converged after %d sweeps', sweep + 1)
+                break
+
+        return chosen
+
+    def scores(self, portfolio):
+        """ Joint survival and expected survivors of portfolio
+
+        Joint survival is exact for up to `EXACT_EVALUATION_MAX_ENTRIES`
+        entries and estimated from sampled game outcomes otherwise. An entry
+        without a pick in some week counts as losing that week
+
+        Parameters
+        ----------
+        portfolio : list(picks.Picks)
+
+        Returns
+        -------
+        PortfolioScores
+
+        """
+        entry_team_ids = np.array([self.season.picks_team_ids(picks) for picks in portfolio])
+        opponents = opponent_columns(self.season)
+
+        if len(portfolio) <= self.EXACT_EVALUATION_MAX_ENTRIES:
+            joint_survival = self._exact_joint_survival(entry_team_ids, opponents)
+        else:
+            wins = sample_wins(self.season, self._n_samples, np.random.default_rng(self._seed), opponents)
+            survives = np.ones((len(portfolio), self._n_samples), dtype=bool)
+            for week in range(entry_team_ids.shape[1]):
+                survives &= wins[:, week, np.maximum(entry_team_ids[:, week], 0)].T & (entry_team_ids[:, [week]] >= 0)
+            joint_survival = float(survives.any(axis=0).mean())
+
+        expected_survivors = sum(self.season.picks_win_probability(picks) for picks in portfolio)
+
+        return PortfolioScores(joint_survival, float(expected_survivors))
+
+    def picks(self):
+        """ Make picks for every entry of portfolio
+
+        Returns
+        -------
+        list(picks.Picks)
+            Picks of each entry, including previous picks
+
+        """
+        candidates, team_ids = self._candidates()
+        opponents = opponent_columns(self.season)
+
+        if self.exact:
+            logger.info('Searching %d candidates exhaustively for %d entries', len(candidates), self.n_entries)
+            best = max(itertools.combinations_with_replacement(range(len(candidates)), self.n_entries),
+                       key=lambda chosen: self._exact_joint_survival(team_ids[list(chosen)], opponents))
+        else:
+            logger.info('Searching %d candidates by coordinate ascent for %d entries', len(candidates),
+                        self.n_entries)
+            best = self._coordinate_ascent(team_ids, opponents)
+
+        return [Picks(candidates[candidate]) for candidate in best]
@@ -0,0 +1,189 @@
+import collections
+import contextlib
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# profile recording phases and counters, None when profiling is off
+_active_profile = None
+
+# returned by `phase` when profiling is off so entering it costs next to nothing
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class Profile:
+
+    def __init__(self, trace_memory=True):
+        """ Record of phase timings, counters and peak memory of a run
+
+        Phases nest, so a phase entered inside another is recorded under the
+        name of the outer phase followed by `/` and its own name. Entering the
+        same phase several times adds up its time and calls
+
+        Parameters
+        ----------
+        trace_memory : bool, optional
+            Whether to trace Python allocations for peak memory, which slows
+            down allocation heavy code
+
+        """
+        self._trace_memory = trace_memory
+        self._phases = collections.defaultdict(lambda: {'seconds': 0.0, 'calls': 0})
+        self._counters = collections.Counter()
+        self._phase_stack = []
+        self._start = None
+        self._seconds = None
+        self._peak_traced_bytes = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """ Time the code run inside context as a phase
+
+        Parameters
+        ----------
+        name : str
+
+        """
+        self._phase_stack.append(name)
+        # phases are reported in the order they are first entered
+        record = self._phases['/'.join(self._phase_stack)]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['seconds'] += time.perf_counter() - start
+            record['calls'] += 1
+            self._phase_stack.pop()
+
+    def count(self, name, n=1):
+        """ Add to counter
+
+        Parameters
+        ----------
+        name : str
+        n : int, optional
+
+        """
+        self._counters[name] += n
+
+    def _begin(self):
+        if self._trace_memory:
+            tracemalloc.start()
+        self._start = time.perf_counter()
+
+    def _end(self):
+        self._seconds = time.perf_counter() - self._start
+        if self._trace_memory:
+            self._peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def report(self):
+        """ Structured report of profile
+
+        Returns
+        -------
+        dict
+            Total seconds, peak traced and resident memory in bytes, phases
+            with their seconds and calls in the order they were first
+            entered, and counters sorted by name. Peak resident memory is
+            None on platforms without the `resource` module such as Windows
+
+        """
+        try:
+            import resource
+        except ImportError:
+            max_rss = None
+        else:
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+        return {'seconds': self._seconds,
+                'peak_traced_bytes': self._peak_traced_bytes,
+                'max_rss_bytes': max_rss,
+                'phases': {path: dict(phase) for path, phase in self._phases.items()},
+                'counters': dict(sorted(self._counters.items()))}
+
+    def to_json(self, file_path):
+        """ Write report to file as JSON
+
+        Parameters
+        ----------
+        file_path : str
+
+        """
+        with open(file_path, 'w') as json_file:
+            json.dump(self.report(), json_file, indent=2)
+
+
+@contextlib.contextmanager
+def profile(trace_memory=True):
+    """ Profile code run inside context
+
+    Parameters
+    ----------
+    trace_memory : bool, optional
+        Whether to trace Python allocations for peak memory
+
+    Yields
+    ------
+    profiling.Profile
+        Profile whose report is complete once context exits
+
+    """
+    global _active_profile
+
+    if _active_profile is not None:
+        exception_msg = 'Cannot profile while another profile is active'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    _active_profile = Profile(trace_memory)
+    _active_profile._begin()
+    try:
+        yield _active_profile
+    finally:
+        _active_profile._end()
+        _active_profile = None
+
+
+def enabled():
+    """ Whether a profile is active, for guarding counts that are costly to compute
+
+    Returns
+    -------
+    bool
+
+    """
+    return _active_profile is not None
+
+
+def phase(name):
+    """ Time code run inside context as a phase of the active profile, if any
+
+    Parameters
+    ----------
+    name : str
+
+    Returns
+    -------
+    contextlib.AbstractContextManager
+
+    """
+    return _NULL_PHASE if _active_profile is None else _active_profile.phase(name)
+
+
+def count(name, n=1):
+    """ Add to counter of the active profile, if any
+
+    Parameters
+    ----------
+    name : str
+    n : int, optional
+
+    """
+    if _active_profile is not None:
+        _active_profile.count(name, n)
@@ -0,0 +1,306 @@
+import collections
+import logging
+
+import numpy as np
+
+from nfl_survivor.assignment import batch_min_cost_assignment
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.picker import Picker
+from nfl_survivor.picks import Picks
+from nfl_survivor.simulation import opponent_columns
+
+logger = logging.getLogger(__name__)
+
+RobustScores = collections.namedtuple('RobustScores', ('worst_case', 'cvar', 'mean'))
+
+OBJECTIVES = ('worst_case', 'cvar')
+
+
+def beta_scenarios(season, n_scenarios, concentration=50.0, rng=None):
+    """ Probability scenarios drawn from beta distributions around a season's probabilities
+
+    Each game's probability is drawn for its team with the lower column from
+    a beta distribution with mean the season's probability and the given
+    concentration, and its opponent gets the complement
+
+    Parameters
+    ----------
+    season : season.Season
+    n_scenarios : int
+    concentration : float, optional
+        Sum of the beta parameters, higher values stay closer to the season
+    rng : numpy.random.Generator, optional
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (scenarios, weeks, teams) indexed like
+        `season.probability_matrix`, NaN for byes
+
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    matrix = season.probability_matrix
+    opponents = opponent_columns(season)
+    n_weeks, n_teams = matrix.shape
+
+    teams = np.arange(n_teams)
+    playing = opponents >= 0
+    leads = np.where(playing, np.minimum(teams, np.where(playing, opponents, 0)), teams)
+    mean = np.clip(np.nan_to_num(matrix, nan=0.5), 1e-6, 1 - 1e-6)
+
+    draws = rng.beta(concentration * mean, concentration * (1 - mean), (n_scenarios, n_weeks, n_teams))
+    lead_draws = np.take_along_axis(draws, np.broadcast_to(leads, draws.shape), axis=2)
+
+    return np.where(playing, np.where(leads == teams, lead_draws, 1 - lead_draws), np.nan)
+
+
+class RobustPicker(Picker):
+
+    def __init__(self, season, previous_picks=None, scenarios=None, n_scenarios=200, concentration=50.0,
+                 objective='cvar', alpha=0.1, n_candidates=100, seed=None):
+        """ Pick maker for a season maximizing survival in the worst probability scenarios
+
+        Picks are scored by their probability of winning every week in each
+        of many probability scenarios at once, as sums of log probabilities
+        gathered from the stacked scenario array. The objective is either
+        the worst case over scenarios or the conditional value at risk, the
+        mean of the worst `alpha` fraction of scenarios. Candidates are the
+        most probable picks under the season's probabilities and the optimal
+        picks of every scenario, all scenario optima solved together. The
+        best candidate is then improved by local search over changing one
+        week's pick or swapping the picks of two weeks
+
+        Parameters
+        ----------
+        season : season.Season
+            Season to make picks for
+        previous_picks : picks.Picks, optional
+            Predetermined picks
+        scenarios : numpy.ndarray, optional
+            Probability scenarios of shape (scenarios, weeks, teams) indexed
+            like `season.probability_matrix`. Defaults to `beta_scenarios`
+        n_scenarios : int, optional
+            Number of beta scenarios if `scenarios` is not given
+        concentration : float, optional
+            Concentration of beta scenarios
+        objective : str, optional
+            One of `OBJECTIVES`
+        alpha : float, optional
+            Fraction of worst scenarios averaged by CVaR
+        n_candidates : int, optional
+            Number of most probable picks under the season's probabilities
+            used as candidates
+        seed : int, optional
+            Seed of beta scenarios
+
+        """
+        super().__init__(season, previous_picks)
+
+        if objective not in OBJECTIVES:
+            exception_msg = f'No objective matching {objective}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        if scenarios is None:
+            scenarios = beta_scenarios(season, n_scenarios, concentration, np.random.default_rng(seed))
+        elif scenarios.shape[1:] != season.probability_matrix.shape:
+            exception_msg = (f'Scenarios of shape {scenarios.shape} do not match season of shape '
+                             f'{season.probability_matrix.shape}')
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        self._scenarios = scenarios
+        self._objective = objective
+        self._alpha = alpha
+        self._n_candidates = n_candidates
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self._log_scenarios = np.where(np.isnan(scenarios), -np.inf,
+                                           np.log(np.clip(scenarios, np.finfo(float).tiny, None)))
+
+    @property
+    def scenarios(self):
+        return self._scenarios
+
+    def _objective_values(self, log_survival):
+        """ Objective of picks from their log win probability in every scenario
+
+        Parameters
+        ----------
+        log_survival : numpy.ndarray
+            Array with scenarios on the last axis
+
+        Returns
+        -------
+        numpy.ndarray
+            Objective of each set of picks, shape of input without last axis
+
+        """
+        if self._objective == 'worst_case':
+            return np.exp(log_survival.min(axis=-1))
+
+        n_worst = max(1, int(np.ceil(self._alpha * log_survival.shape[-1])))
+        worst = np.partition(log_survival, n_worst - 1, axis=-1)[..., :n_worst]
+        return np.exp(worst).mean(axis=-1)
+
+    def _log_survival(self, columns):
+        """ Log win probability of picks in every scenario
+
+        Parameters
+        ----------
+        columns : numpy.ndarray
+            Team column picked in every week row, shape (..., weeks)
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (..., scenarios)
+
+        """
+        rows = np.arange(columns.shape[-1])
+        return np.moveaxis(self._log_scenarios[:, rows, columns].sum(axis=-1), 0, -1)
+
+    def scores(self, picks):
+        """ Worst case, CVaR and mean win probability of picks over scenarios
+
+        Parameters
+        ----------
+        picks : picks.Picks
+            Picks for every week
+
+        Returns
+        -------
+        RobustScores
+
+        """
+        season = self.season
+        columns = np.array([season.team_index[picks[week_number]] for week_number in season.week_numbers])
+        log_survival = self._log_survival(columns)
+
+        n_worst = max(1, int(np.ceil(self._alpha * len(log_survival))))
+        survival = np.sort(np.exp(log_survival))
+        return RobustScores(float(survival[0]), float(survival[:n_worst].mean()), float(survival.mean()))
+
+    def _candidates(self, open_rows, open_columns, fixed_columns):
+        """ Most probable picks and optimal picks of every scenario
+
+        Parameters
+        ----------
+        open_rows : numpy.ndarray
+            Week rows without a previous pick
+        open_columns : numpy.ndarray
+            Team columns not used by previous picks
+        fixed_columns : numpy.ndarray
+            Team column of every week row, set for previous picks
+
+        Returns
+        -------
+        numpy.ndarray
+            Distinct candidates as team columns of every week row, shape
+            (candidates, weeks)
+
+        """
+        season = self.season
+        candidates = []
+
+        for picks, _ in AssignmentPicker(season, self.previous_picks).top_picks(self._n_candidates):
+            candidates.append([season.team_index[picks[week_number]] for week_number in season.week_numbers])
+
+        costs = -self._log_scenarios[:, open_rows][:, :, open_columns]
+        assignments = batch_min_cost_assignment(costs)
+        assignments = assignments[(assignments >= 0).all(axis=1)]
+
+        scenario_candidates = np.broadcast_to(fixed_columns, (len(assignments), len(fixed_columns))).copy()
+        scenario_candidates[:, open_rows] = open_columns[assignments]
+
+        return np.unique(np.concatenate([np.array(candidates, dtype=int).reshape(-1, len(fixed_columns)),
+                                         scenario_candidates]), axis=0)
+
+    def _local_search(self, columns, open_rows):
+        """ Improve picks by changing one week's pick or swapping two weeks' picks while it helps
+
+        Parameters
+        ----------
+        columns : numpy.ndarray
+            Team column of every week row
+        open_rows : numpy.ndarray
+
+        Returns
+        -------
+        numpy.ndarray
+        float
+            Objective of improved picks
+
+        """
+        log_scenarios = self._log_scenarios
+        n_teams = log_scenarios.shape[2]
+        log_survival = self._log_survival(columns)
+        value = self._objective_values(log_survival)
+
+        while True:
+            used = np.zeros(n_teams, dtype=bool)
+            used[columns] = True
+            current = log_scenarios[:, open_rows, columns[open_rows]]
+
+            # change the pick of one week to an unused team: (rows, teams, scenarios)
+            changes = np.moveaxis(log_scenarios[:, open_rows] - current[:, :, None], 0, -1)
+            change_values = np.where(used[None, :], -np.inf,
+                                     self._objective_values(log_survival + changes))
+
+            # swap the picks of two weeks: (rows, rows, scenarios)
+            swapped = log_scenarios[:, open_rows[:, None], columns[open_rows][None, :]]
+            swaps = np.moveaxis(swapped + swapped.transpose(0, 2, 1) - current[:, :, None] - current[:, None, :], 0, -1)
+            swap_values = self._objective_values(log_survival + swaps)
+
+            best_change, best_swap = np.nanmax(change_values, initial=-np.inf), np.nanmax(swap_values, initial=-np.inf)
+            if max(best_change, best_swap) <= value * (1 + 1e-12):
+                return columns, value
+
+            columns = columns.copy()
+            if best_change >= best_swap:
+                row, column = np.unravel_index(np.nanargmax(change_values), change_values.shape)
+                columns[open_rows[row]] = column
+            else:
+                first, second = np.unravel_index(np.nanargmax(swap_values), swap_values.shape)
+                columns[[open_rows[first], open_rows[second]]] = columns[[open_rows[second], open_rows[first]]]
+
+            log_survival = self._log_survival(columns)
+            value = self._objective_values(log_survival)
+
+    def picks(self):
+        """ Make picks for a particular season maximizing the robust objective
+
+        Returns
+        -------
+        picks.Picks
+            Week number to team name
+
+        """
+        season = self.season
+
+        fixed_columns = np.zeros(len(season.week_numbers), dtype=int)
+        for week_number, team in self.previous_picks.items():
+            # validates that previous pick is a game being played
+            season.win_probability(week_number, team)
+            fixed_columns[season.week_index[week_number]] = season.team_index[team]
+
+        open_rows = np.array([row for row, week_number in enumerate(season.week_numbers)
+                              if week_number not in self.previous_picks], dtype=int)
+        picked = {season.team_index[team] for team in self.previous_picks.values()}
+        open_columns = np.array([column for column in range(len(season.team_names)) if column not in picked],
+                                dtype=int)
+
+        candidates = self._candidates(open_rows, open_columns, fixed_columns)
+        if not len(candidates):
+            exception_msg = 'Cannot solve for picks since there is no way to pick a distinct team every week'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        values = self._objective_values(self._log_survival(candidates))
+        logger.info('Scored %d candidates over %d scenarios', len(candidates), len(self.scenarios))
+
+        columns, value = self._local_search(candidates[np.argmax(values)], open_rows)
+        logger.info('Local search improved %s from %.4g to %.4g', self._objective, values.max(), value)
+
+        return Picks((week_number, season.team_names[column])
+                     for week_number, column in zip(season.week_numbers, columns))
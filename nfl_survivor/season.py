@@ -1,18 +1,28 @@
+import array
 import collections
-import functools
 import logging
-import operator
 
+import numpy as np
 import yaml
 
-from nfl_survivor.utils import cached_property
+from nfl_survivor import profiling
+from nfl_survivor.season_cache import SeasonCache
+from nfl_survivor.team_registry import TEAMS
+from nfl_survivor.utils import YAML_LOADER, cached_property
 from nfl_survivor.week import Week
 
 logger = logging.getLogger(__name__)
 
+PicksScores = collections.namedtuple('PicksScores', ('win_probability', 'expected_survival', 'survival'))
+
 
 class Season:
 
+    # cached properties are stored under `cached_` prefixed slots, guarded by the lock in the last slot
+    __slots__ = ('_week_number_to_week', 'cached_teams', 'cached_week_numbers', 'cached_team_names',
+                 'cached_week_index', 'cached_team_index', 'cached_probability_matrix', 'cached__team_to_weeks',
+                 '_cached_property_lock')
+
     def __init__(self, weeks):
         """ Weeks spanning a season
 
@@ -26,6 +36,9 @@ class Season:
                                      for week in weeks}
         logger.info('Loaded season')
 
+    def __reduce__(self):
+        return type(self), (tuple(self),)
+
     def __iter__(self):
         """ Iterate through weeks
 
@@ -51,16 +64,100 @@ class Season:
         """
         yield from self
 
-    @property
+    @cached_property
     def teams(self):
         """ All teams playing in season
 
         Returns
         -------
-        set(str)
+        frozenset(str)
+
+        """
+        return frozenset(TEAMS.team_name(team_id)
+                         for team_id in set().union(*(week.team_ids for week in self)))
+
+    @cached_property
+    def week_numbers(self):
+        """ Week numbers in ascending order, giving the row order of `probability_matrix`
+
+        Returns
+        -------
+        tuple(int)
+
+        """
+        return tuple(sorted(self._week_number_to_week))
+
+    @cached_property
+    def team_names(self):
+        """ Team names in sorted order, giving the column order of `probability_matrix`
+
+        Returns
+        -------
+        tuple(str)
+
+        """
+        return tuple(sorted(self.teams))
+
+    @cached_property
+    def week_index(self):
+        """ Map from week number to row of `probability_matrix`
+
+        Returns
+        -------
+        dict(int->int)
+
+        """
+        return {week_number: row for row, week_number in enumerate(self.week_numbers)}
+
+    @cached_property
+    def team_index(self):
+        """ Map from team name to column of `probability_matrix`
+
+        Returns
+        -------
+        dict(str->int)
 
         """
-        return set.union(*(set(week.teams) for week in self))
+        return {team: column for column, team in enumerate(self.team_names)}
+
+    @cached_property
+    def probability_matrix(self):
+        """ Win probabilities of every team in every week
+
+        Rows follow `week_numbers` and columns follow `team_names`. Entries
+        for teams that are not playing in a week (byes) are NaN. The array is
+        read only since it is shared by everything reading from the season
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (number of weeks, number of teams)
+
+        """
+        registry_id_to_column = self._registry_id_to_column()
+        matrix = np.full((len(self.week_numbers), len(self.team_names)), np.nan)
+
+        for row, week_number in enumerate(self.week_numbers):
+            week = self._week_number_to_week[week_number]
+            matrix[row, registry_id_to_column[np.frombuffer(week.team_ids, dtype=np.intc)]] = week.probabilities
+
+        matrix.flags.writeable = False
+        return matrix
+
+    def _registry_id_to_column(self):
+        """ Array mapping registered team ids to columns of `probability_matrix`
+
+        Returns
+        -------
+        numpy.ndarray
+            Column of each registered team id, -1 for teams not in season
+
+        """
+        registry_id_to_column = np.full(len(TEAMS), -1, dtype=np.intp)
+        for team, column in self.team_index.items():
+            registry_id_to_column[TEAMS.get(team)] = column
+
+        return registry_id_to_column
 
     def nth_week(self, week_number):
         """ Get nth week of season
@@ -116,6 +213,62 @@ class Season:
         """
         return self._team_to_weeks[team]
 
+    def win_probability(self, week_number, team):
+        """ Probability that team wins in a given week
+
+        Parameters
+        ----------
+        week_number : int
+            Week number
+        team : str
+            Team to find win probability for
+
+        Returns
+        -------
+        float
+            Win probability
+
+        """
+        return float(self._picks_probabilities({week_number: team})[0])
+
+    def _picks_probabilities(self, picks):
+        """ Win probabilities of picks ordered by week number
+
+        Parameters
+        ----------
+        picks : picks.Picks
+            Picks to find probabilities for
+
+        Returns
+        -------
+        numpy.ndarray
+
+        """
+        try:
+            week_numbers = sorted(picks)
+            rows = [self.week_index[week_number] for week_number in week_numbers]
+        except KeyError as error:
+            exception_msg = f'Week {error.args[0]} is not included in season {self}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        try:
+            columns = [self.team_index[picks[week_number]] for week_number in week_numbers]
+        except KeyError as error:
+            exception_msg = f'Team {error.args[0]} is not playing in season {self}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        probabilities = self.probability_matrix[rows, columns]
+
+        if np.isnan(probabilities).any():
+            week_number = week_numbers[int(np.flatnonzero(np.isnan(probabilities))[0])]
+            exception_msg = f'Team {picks[week_number]} is not playing in week {week_number}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        return probabilities
+
     def picks_win_probability(self, picks):
         """ Compute probability of making it until the end of the season
 
@@ -128,9 +281,7 @@ class Season:
         -------
         float
         """
-        return functools.reduce(operator.mul,
-                                (self.nth_week(week_number).team_win_probability(team)
-                                 for week_number, team in picks.items()))
+        return float(np.prod(self._picks_probabilities(picks)))
 
     def picks_expected_survival(self, picks):
         """ Compute expected survival length of pick selection for season
@@ -154,13 +305,168 @@ class Season:
         -------
         float
         """
-        cumulative_product, expected_survival = 1, 0
-        for week_number, team in sorted(picks.items(), key=lambda wt: wt[0]):
-            cumulative_product *= self.nth_week(week_number).team_win_probability(team)
+        return float(np.cumprod(self._picks_probabilities(picks)).sum())
+
+    def picks_team_ids(self, picks):
+        """ Encode picks as a row of team ids for `batch_picks_scores`
+
+        Parameters
+        ----------
+        picks : picks.Picks
+            Picks to encode
+
+        Returns
+        -------
+        numpy.ndarray
+            Column of `probability_matrix` picked in each week, -1 for weeks without a pick
+
+        """
+        team_ids = np.full(len(self.week_numbers), -1, dtype=np.intp)
+        for week_number, team in picks.items():
+            try:
+                team_ids[self.week_index[week_number]] = self.team_index[team]
+            except KeyError:
+                exception_msg = f'Pick of {team} in week {week_number} is not included in season {self}'
+                logger.exception(exception_msg)
+                raise ValueError(exception_msg)
+
+        return team_ids
+
+    def batch_picks_scores(self, team_ids, chunk_size=2 ** 16, survival=False):
+        """ Score many candidate picks at once
+
+        Candidates are rows of team ids (columns of `probability_matrix`)
+        with one entry per week in `week_numbers` order. Picking a team
+        during its bye or an id of -1 counts as a loss that week. Candidates
+        are processed `chunk_size` rows at a time so intermediate arrays stay
+        bounded no matter how many candidates are scored
+
+        Parameters
+        ----------
+        team_ids : numpy.ndarray
+            Integer array of shape (candidates, weeks) with a column for
+            every week of the season
+        chunk_size : int, optional
+            Number of candidates to score per vectorized pass
+        survival : bool, optional
+            Whether to also return the per week survival curve, which takes
+            memory for every candidate and week
+
+        Returns
+        -------
+        PicksScores
+            Win probability and expected survival of each candidate and, if
+            requested, the probability of surviving through each week
+
+        """
+        team_ids = np.asarray(team_ids)
+        n_candidates, n_weeks = team_ids.shape
+
+        valid_ids = (np.issubdtype(team_ids.dtype, np.integer) and
+                     ((-1 <= team_ids) & (team_ids < len(self.team_names))).all())
+
+        if n_weeks != len(self.week_numbers) or not valid_ids:
+            exception_msg = f'Team ids of shape {team_ids.shape} do not match season {self}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
 
-            expected_survival += cumulative_product
+        # trailing column of zeros is picked out by team id -1
+        probabilities = np.zeros((n_weeks, len(self.team_names) + 1))
+        probabilities[:, :-1] = np.nan_to_num(self.probability_matrix, nan=0.0)
+        rows = np.arange(n_weeks)
 
-        return expected_survival
+        win_probability = np.empty(n_candidates)
+        expected_survival = np.empty(n_candidates)
+        survival_curve = np.empty((n_candidates, n_weeks)) if survival else None
+
+        for start in range(0, n_candidates, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            cumulative = np.cumprod(probabilities[rows, team_ids[chunk]], axis=1)
+
+            win_probability[chunk] = cumulative[:, -1] if n_weeks else 1.0
+            expected_survival[chunk] = cumulative.sum(axis=1)
+            if survival:
+                survival_curve[chunk] = cumulative
+
+        return PicksScores(win_probability, expected_survival, survival_curve)
+
+    def to_columns(self):
+        """ Columnar representation of season
+
+        There is one row per team per game with the two rows of a game next
+        to each other. Teams are ids into `team_names`. Weeks without games
+        have no rows, so they are dropped by the round trip through
+        `from_columns` used by the season cache and archives
+
+        Returns
+        -------
+        dict(str->numpy.ndarray)
+            Arrays `teams`, `week`, `team`, `opponent` and `probability`
+
+        """
+        registry_id_to_column = self._registry_id_to_column()
+        weeks = tuple(self)
+
+        team_ids = [np.frombuffer(week.team_ids, dtype=np.intc) for week in weeks]
+        team = registry_id_to_column[np.concatenate(team_ids)] if weeks else np.empty(0, dtype=np.intp)
+        # swapping neighbouring rows pairs every team with its opponent
+        opponent = team.reshape(-1, 2)[:, ::-1].ravel()
+
+        return {'teams': np.array(self.team_names, dtype=str),
+                'week': np.repeat([week.week_number for week in weeks],
+                                  [len(ids) for ids in team_ids]).astype(np.int32),
+                'team': team.astype(np.int32),
+                'opponent': opponent.astype(np.int32),
+                'probability': (np.concatenate([np.frombuffer(week.probabilities) for week in weeks])
+                                if weeks else np.empty(0))}
+
+    @classmethod
+    def from_columns(cls, teams, week, team, opponent, probability):
+        """ Form season from columnar representation given by `to_columns`
+
+        Rows of a week must be contiguous as they are in `to_columns`. Only
+        weeks with at least one game are formed
+
+        Parameters
+        ----------
+        teams : numpy.ndarray
+            Team names indexed by team ids
+        week : numpy.ndarray
+            Week number of each row
+        team : numpy.ndarray
+            Team id of each row
+        opponent : numpy.ndarray
+            Opponent team id of each row
+        probability : numpy.ndarray
+            Win probability of team in each row
+
+        Returns
+        -------
+        season.Season
+
+        """
+        week, team, opponent = np.asarray(week), np.asarray(team), np.asarray(opponent)
+        probability = np.asarray(probability, dtype=float)
+
+        if len(team) % 2 or not (np.array_equal(team[::2], opponent[1::2]) and
+                                 np.array_equal(week[::2], week[1::2])):
+            exception_msg = 'Cannot form season from columns that do not pair up into games'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        used_ids = np.unique(team)
+        id_to_registry_id = np.zeros(used_ids[-1] + 1 if len(used_ids) else 0, dtype=np.intc)
+        id_to_registry_id[used_ids] = [TEAMS.team_id(str(teams[team_id])) for team_id in used_ids]
+        registry_ids = id_to_registry_id[team] if len(team) else np.empty(0, dtype=np.intc)
+
+        # rows of a week are contiguous, find where each week's rows start and end
+        boundaries = np.flatnonzero(np.diff(week)) + 1
+        starts, stops = np.r_[0, boundaries], np.r_[boundaries, len(week)]
+
+        return cls(Week._from_arrays(int(week[start]),
+                                     array.array('i', registry_ids[start:stop].tobytes()),
+                                     array.array('d', probability[start:stop].tobytes()))
+                   for start, stop in zip(starts, stops) if stop > start)
 
     @classmethod
     def from_dict(cls, season_dict):
@@ -177,14 +483,30 @@ class Season:
         """
         return cls(Week.from_dict(week_dict['week']) for week_dict in season_dict)
 
+    def to_dict(self):
+        """ Dictionary representation of season, the inverse of `from_dict`
+
+        Returns
+        -------
+        list(dict)
+
+        """
+        return [{'week': week.to_dict()} for week in self]
+
     @classmethod
-    def from_yaml(cls, yaml_file_path):
+    def from_yaml(cls, yaml_file_path, cache=True):
         """ Form season from representation in YAML file
 
+        Parsed seasons are cached on disk in the directory given by
+        `season_cache.default_cache_dir` so loading an unchanged file again
+        skips YAML parsing and building the season from nested dictionaries
+
         Parameters
         ----------
         yaml_file_path : str
             Path to YAML file of season representation
+        cache : bool, optional
+            Whether to read from and write to the season cache
 
         Returns
         -------
@@ -192,5 +514,25 @@ class Season:
 
         """
         logger.info('Loading season from %s', yaml_file_path)
-        with open(yaml_file_path, 'r') as yaml_file:
-            return cls.from_dict(yaml.load(yaml_file, Loader=yaml.Loader))
+        season_cache = SeasonCache.default() if cache else None
+
+        if season_cache is None:
+            with open(yaml_file_path, 'r') as yaml_file, profiling.phase('parse_yaml'):
+                season_dict = yaml.load(yaml_file, Loader=YAML_LOADER)
+            with profiling.phase('build_season'):
+                return cls.from_dict(season_dict)
+
+        with profiling.phase('season_cache_read'):
+            columns, content, key = season_cache.get(yaml_file_path)
+        if columns is not None:
+            with profiling.phase('build_season'):
+                return cls.from_columns(**columns)
+
+        with profiling.phase('parse_yaml'):
+            season_dict = yaml.load(content, Loader=YAML_LOADER)
+        with profiling.phase('build_season'):
+            season = cls.from_dict(season_dict)
+        with profiling.phase('season_cache_write'):
+            season_cache.put(yaml_file_path, key, season.to_columns())
+
+        return season
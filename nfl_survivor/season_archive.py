@@ -0,0 +1,226 @@
+import json
+import logging
+import struct
+
+import numpy as np
+
+from nfl_survivor.season import Season
+
+logger = logging.getLogger(__name__)
+
+
+class SeasonArchive:
+
+    _MAGIC = b'NFLSARC1'
+    _HEADER_LENGTH = struct.Struct('<Q')
+    _ALIGNMENT = 64
+    _COLUMN_DTYPES = {'week': np.dtype('<i4'),
+                      'team': np.dtype('<i4'),
+                      'opponent': np.dtype('<i4'),
+                      'probability': np.dtype('<f8')}
+
+    def __init__(self, archive_path):
+        """ Read only archive of many seasons stored column-wise in one file
+
+        The file starts with a JSON header holding the shared team name table,
+        the row range of every season and the byte offset of every column.
+        Columns are memory mapped, so opening a season only reads the rows
+        belonging to it
+
+        Parameters
+        ----------
+        archive_path : str
+            Path to archive written by `SeasonArchive.write`
+
+        """
+        self._archive_path = archive_path
+
+        with open(archive_path, 'rb') as archive_file:
+            if archive_file.read(len(self._MAGIC)) != self._MAGIC:
+                exception_msg = f'File {archive_path} is not a season archive'
+                logger.exception(exception_msg)
+                raise ValueError(exception_msg)
+
+            header_length, = self._HEADER_LENGTH.unpack(archive_file.read(self._HEADER_LENGTH.size))
+            header = json.loads(archive_file.read(header_length))
+
+        self._teams = np.array(header['teams'], dtype=str)
+        self._season_rows = {key: tuple(rows) for key, rows in header['seasons'].items()}
+        self._column_layout = header['columns']
+        self._columns = {}
+
+        logger.info('Opened archive %s with %d seasons', archive_path, len(self._season_rows))
+
+    @property
+    def archive_path(self):
+        """ Path of archive file
+
+        Returns
+        -------
+        str
+
+        """
+        return self._archive_path
+
+    @property
+    def teams(self):
+        """ Team names shared by all seasons indexed by team id
+
+        Returns
+        -------
+        numpy.ndarray
+
+        """
+        return self._teams
+
+    def __len__(self):
+        return len(self._season_rows)
+
+    def __iter__(self):
+        """ Iterate through season keys
+
+        Yields
+        ------
+        str
+            Next season key
+
+        """
+        yield from self._season_rows.keys()
+
+    def __contains__(self, key):
+        return key in self._season_rows
+
+    def keys(self):
+        """ Keys of seasons in archive
+
+        Returns
+        -------
+        tuple(str)
+
+        """
+        return tuple(self)
+
+    def column(self, name):
+        """ Memory mapped column of archive
+
+        Parameters
+        ----------
+        name : str
+            One of `week`, `team`, `opponent` or `probability`
+
+        Returns
+        -------
+        numpy.memmap
+
+        """
+        if name not in self._columns:
+            layout = self._column_layout[name]
+            self._columns[name] = (np.memmap(self.archive_path, dtype=self._COLUMN_DTYPES[name], mode='r',
+                                             offset=layout['offset'], shape=(layout['length'],))
+                                   if layout['length'] else np.empty(0, dtype=self._COLUMN_DTYPES[name]))
+
+        return self._columns[name]
+
+    def __getitem__(self, key):
+        """ Open season stored under key
+
+        Parameters
+        ----------
+        key : str
+
+        Returns
+        -------
+        season.Season
+
+        """
+        try:
+            start, stop = self._season_rows[key]
+        except KeyError:
+            exception_msg = f'Season {key} is not included in archive {self.archive_path}'
+            logger.exception(exception_msg)
+            raise KeyError(exception_msg)
+
+        logger.info('Loading season %s from archive rows %d to %d', key, start, stop)
+        return Season.from_columns(self.teams, **{name: self.column(name)[start:stop]
+                                                  for name in self._COLUMN_DTYPES})
+
+    @classmethod
+    def write(cls, archive_path, seasons):
+        """ Write seasons to new archive
+
+        Parameters
+        ----------
+        archive_path : str
+            Path to write archive to
+        seasons : iterable(tuple(str, season.Season))
+            Keys and seasons to store
+
+        Returns
+        -------
+        season_archive.SeasonArchive
+            Archive opened from written file
+
+        """
+        team_ids, season_rows = {}, {}
+        column_chunks = {name: [] for name in cls._COLUMN_DTYPES}
+        n_rows = 0
+
+        for key, season in seasons:
+            if key in season_rows:
+                exception_msg = f'Season {key} appears more than once'
+                logger.exception(exception_msg)
+                raise ValueError(exception_msg)
+
+            columns = season.to_columns()
+            # translate season's own team ids into archive wide ids
+            global_ids = np.array([team_ids.setdefault(str(team), len(team_ids)) for team in columns['teams']],
+                                  dtype=np.int64)
+            columns['team'], columns['opponent'] = global_ids[columns['team']], global_ids[columns['opponent']]
+
+            for name, chunks in column_chunks.items():
+                chunks.append(columns[name].astype(cls._COLUMN_DTYPES[name]))
+
+            season_rows[key] = (n_rows, n_rows + len(columns['week']))
+            n_rows += len(columns['week'])
+            logger.info('Added season %s to archive', key)
+
+        column_data = {name: np.concatenate(chunks) if chunks else np.empty(0, dtype=cls._COLUMN_DTYPES[name])
+                       for name, chunks in column_chunks.items()}
+
+        # offsets are part of the header so repeat layout until header length settles
+        header = {'teams': list(team_ids), 'seasons': season_rows,
+                  'columns': {name: {'offset': 0, 'length': len(data)} for name, data in column_data.items()}}
+        header_bytes = b''
+        while len(header_bytes) != len(json.dumps(header).encode()):
+            header_bytes = json.dumps(header).encode()
+            offset = cls._aligned(len(cls._MAGIC) + cls._HEADER_LENGTH.size + len(header_bytes))
+            for name, data in column_data.items():
+                header['columns'][name]['offset'] = offset
+                offset = cls._aligned(offset + data.nbytes)
+        header_bytes = json.dumps(header).encode()
+
+        with open(archive_path, 'wb') as archive_file:
+            archive_file.write(cls._MAGIC)
+            archive_file.write(cls._HEADER_LENGTH.pack(len(header_bytes)))
+            archive_file.write(header_bytes)
+            for name, data in column_data.items():
+                archive_file.write(b'\0' * (header['columns'][name]['offset'] - archive_file.tell()))
+                archive_file.write(data.tobytes())
+
+        logger.info('Wrote %d seasons with %d rows to %s', len(season_rows), n_rows, archive_path)
+        return cls(archive_path)
+
+    @classmethod
+    def _aligned(cls, offset):
+        """ Round byte offset up to column alignment
+
+        Parameters
+        ----------
+        offset : int
+
+        Returns
+        -------
+        int
+
+        """
+        return -(-offset // cls._ALIGNMENT) * cls._ALIGNMENT
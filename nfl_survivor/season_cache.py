@@ -0,0 +1,150 @@
+import collections
+import hashlib
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# environment variable overriding cache directory, set to an empty string to disable caching
+CACHE_DIR_VARIABLE = 'NFL_SURVIVOR_CACHE_DIR'
+
+CacheKey = collections.namedtuple('CacheKey', ('size', 'mtime_ns', 'content_hash'))
+
+
+def default_cache_dir():
+    """ Directory seasons are cached in unless overridden
+
+    Returns
+    -------
+    str or None
+        None if caching is disabled
+
+    """
+    cache_dir = os.environ.get(CACHE_DIR_VARIABLE,
+                               os.path.join(os.path.expanduser('~'), '.cache', 'nfl_survivor'))
+    return cache_dir or None
+
+
+class SeasonCache:
+
+    _COLUMNS = ('teams', 'week', 'team', 'opponent', 'probability')
+
+    def __init__(self, cache_dir):
+        """ On disk cache of parsed season YAML files
+
+        Entries are compressed NumPy archives of `Season.to_columns` stored
+        under a hash of the YAML file's absolute path. An entry is only used
+        if the size, modification time and content hash of the YAML file
+        all match the ones it was written for
+
+        Parameters
+        ----------
+        cache_dir : str
+            Directory to store cache entries in
+
+        """
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self):
+        """ Directory cache entries are stored in
+
+        Returns
+        -------
+        str
+
+        """
+        return self._cache_dir
+
+    @classmethod
+    def default(cls):
+        """ Cache in default directory
+
+        Returns
+        -------
+        season_cache.SeasonCache or None
+            None if caching is disabled
+
+        """
+        cache_dir = default_cache_dir()
+        return cls(cache_dir) if cache_dir is not None else None
+
+    def _entry_path(self, yaml_file_path):
+        """ Path of cache entry for YAML file
+
+        Parameters
+        ----------
+        yaml_file_path : str
+
+        Returns
+        -------
+        str
+
+        """
+        path_hash = hashlib.sha256(os.path.abspath(yaml_file_path).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f'{path_hash[:32]}.npz')
+
+    def get(self, yaml_file_path):
+        """ Look up cached columns for YAML file
+
+        Parameters
+        ----------
+        yaml_file_path : str
+
+        Returns
+        -------
+        dict(str->numpy.ndarray) or None
+            Cached columns, None on a cache miss
+        bytes
+            Content of YAML file
+        season_cache.CacheKey
+            Key of YAML file to `put` its columns under after a miss
+
+        """
+        stat = os.stat(yaml_file_path)
+        with open(yaml_file_path, 'rb') as yaml_file:
+            content = yaml_file.read()
+        key = CacheKey(stat.st_size, stat.st_mtime_ns, hashlib.sha256(content).hexdigest())
+
+        entry_path = self._entry_path(yaml_file_path)
+        try:
+            with np.load(entry_path, allow_pickle=False) as entry:
+                entry_key = CacheKey(int(entry['size']), int(entry['mtime_ns']), str(entry['content_hash']))
+                if entry_key == key:
+                    logger.info('Loaded cached season for %s from %s', yaml_file_path, entry_path)
+                    return {column: entry[column] for column in self._COLUMNS}, content, key
+        except FileNotFoundError:
+            pass
+        except (OSError, KeyError, ValueError):
+            logger.warning('Ignoring unreadable season cache entry %s', entry_path)
+
+        logger.info('No cached season for %s', yaml_file_path)
+        return None, content, key
+
+    def put(self, yaml_file_path, key, columns):
+        """ Store columns for YAML file
+
+        Failing to write the cache is logged and otherwise ignored
+
+        Parameters
+        ----------
+        yaml_file_path : str
+        key : season_cache.CacheKey
+            Key returned by `get` for the YAML file
+        columns : dict(str->numpy.ndarray)
+            Columns given by `Season.to_columns`
+
+        """
+        entry_path = self._entry_path(yaml_file_path)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to temporary file first so readers never see partial entries
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix='.npz', delete=False) as entry_file:
+                np.savez_compressed(entry_file, **columns, **key._asdict())
+            os.replace(entry_file.name, entry_path)
+            logger.info('Cached season for %s in %s', yaml_file_path, entry_path)
+        except OSError:
+            logger.warning('Could not write season cache entry %s', entry_path, exc_info=True)
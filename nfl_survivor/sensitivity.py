@@ -0,0 +1,301 @@
+import collections
+import logging
+
+import click
+import numpy as np
+
+from nfl_survivor.assignment import batch_min_cost_assignment, min_cost_assignment
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+from nfl_survivor.simulation import opponent_columns
+from nfl_survivor.utils import initialize_logging, write_yaml
+
+logger = logging.getLogger(__name__)
+
+SensitivityReport = collections.namedtuple('SensitivityReport', ('baseline_picks', 'pick_frequencies',
+                                                                 'baseline_frequency', 'skipped_fraction',
+                                                                 'n_samples'))
+
+
+def perturbed_matrices(matrix, opponents, n_samples, rng, noise=0.0, team_shift=0.0, shrinkage=0.0):
+    """ Many perturbed copies of a probability matrix at once
+
+    Perturbations act on log odds and keep the two teams of every game
+    complementary. `noise` adds independent normal noise to every game,
+    `team_shift` draws a normal strength shift per team that moves all its
+    games and `shrinkage` scales all log odds by a log normal factor per
+    sample, shrinking probabilities towards or stretching them away from
+    even odds as a model calibration error would
+
+    Parameters
+    ----------
+    matrix : numpy.ndarray
+        Probability matrix of shape (weeks, teams), NaN for byes
+    opponents : numpy.ndarray
+        Opponent columns given by `simulation.opponent_columns`
+    n_samples : int
+    rng : numpy.random.Generator
+    noise : float, optional
+        Standard deviation of log odds noise per game
+    team_shift : float, optional
+        Standard deviation of log odds shift per team
+    shrinkage : float, optional
+        Standard deviation of the log of the log odds scale factor
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (samples, weeks, teams)
+
+    """
+    n_weeks, n_teams = matrix.shape
+    clipped = np.clip(matrix, 1e-12, 1 - 1e-12)
+    log_odds = np.broadcast_to(np.log(clipped / (1 - clipped)), (n_samples, n_weeks, n_teams)).copy()
+    playing = opponents >= 0
+    safe_opponents = np.where(playing, opponents, 0)
+
+    if noise:
+        # noise is drawn for the team with the lower column of each game and mirrored for its opponent
+        teams = np.arange(n_teams)
+        leads = np.where(playing, np.minimum(teams, safe_opponents), teams)
+        game_noise = rng.normal(0.0, noise, (n_samples, n_weeks, n_teams))
+        log_odds += np.take_along_axis(game_noise, np.broadcast_to(leads, log_odds.shape), axis=2) * \
+            np.where(leads == teams, 1.0, -1.0)
+
+    if team_shift:
+        shifts = rng.normal(0.0, team_shift, (n_samples, 1, n_teams))
+        log_odds += np.where(playing, shifts - shifts[:, 0, safe_opponents], 0.0)
+
+    if shrinkage:
+        log_odds *= np.exp(rng.normal(0.0, shrinkage, (n_samples, 1, 1)))
+
+    return np.where(np.isnan(matrix), np.nan, 1 / (1 + np.exp(-log_odds)))
+
+
+def improvable(costs, assignment, tolerance=1e-9):
+    """ Whether an assignment stops being optimal under each of many cost matrices
+
+    An assignment is optimal exactly when no exchange lowers its cost. Every
+    exchange is a cycle of rows each taking the next row's column, or a
+    chain of them ending with a row taking a column no row had, which frees
+    the column of the first row. With a node per row and one for the
+    unassigned columns, an edge from row a to row b costing
+    `cost[a, assignment[b]] - cost[a, assignment[a]]`, from every row to the
+    unassigned node costing its cheapest move to an unassigned column and
+    free edges back, the assignment is optimal exactly when this graph has
+    no negative cycle. Cycles are found by Floyd-Warshall on all cost
+    matrices at once
+
+    Parameters
+    ----------
+    costs : numpy.ndarray
+        Array of shape (problems, rows, columns) with rows <= columns.
+        Infinite costs mark forbidden row/column pairs
+    assignment : numpy.ndarray
+        Column assigned to each row, with finite cost in every problem
+    tolerance : float, optional
+        Exchanges lowering the cost by less are ignored
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array of shape (problems,)
+
+    """
+    n_problems, n_rows, n_columns = costs.shape
+    rows = np.arange(n_rows)
+    assigned_costs = costs[:, rows, assignment][:, :, None]
+    unassigned = np.setdiff1d(np.arange(n_columns), assignment)
+
+    distances = np.zeros((n_problems, n_rows + 1, n_rows + 1))
+    with np.errstate(invalid='ignore'):
+        distances[:, :n_rows, :n_rows] = costs[:, :, assignment] - assigned_costs
+        distances[:, :n_rows, n_rows] = (costs[:, :, unassigned].min(axis=2, initial=np.inf) -
+                                         assigned_costs[:, :, 0])
+    distances[:, rows, rows] = 0.0
+
+    for node in range(n_rows + 1):
+        np.minimum(distances, distances[:, :, node, None] + distances[:, None, node, :], out=distances)
+
+    return (np.diagonal(distances, axis1=1, axis2=2) < -tolerance).any(axis=1)
+
+
+class SensitivityAnalysis:
+
+    def __init__(self, season, previous_picks=None):
+        """ Sensitivity of the most probable picks to perturbed win probabilities
+
+        Every perturbation is an assignment problem with the same weeks,
+        teams and byes as the season, only the costs change, and most do not
+        change the best picks. Before solving, `improvable` checks every
+        perturbation for an exchange of teams between weeks that would beat
+        the best picks of the unperturbed season. Perturbations without one
+        keep those picks without being solved, and the rest are solved
+        together by `assignment.batch_min_cost_assignment`
+
+        Parameters
+        ----------
+        season : season.Season
+        previous_picks : picks.Picks, optional
+            Predetermined picks kept in every perturbation
+
+        """
+        self._season = season
+        self._picker = AssignmentPicker(season, previous_picks)
+
+    @property
+    def season(self):
+        return self._season
+
+    def _baseline(self):
+        """ Best assignment of unperturbed season
+
+        Returns
+        -------
+        numpy.ndarray
+            Cost matrix of open weeks and teams
+        tuple(int)
+            Week numbers of rows
+        tuple(str)
+            Team names of columns
+        numpy.ndarray
+            Best columns
+
+        """
+        cost, week_numbers, teams = self._picker.cost_matrix()
+        try:
+            best = min_cost_assignment(cost)
+        except ValueError:
+            exception_msg = 'Cannot solve for picks since there is no way to pick a distinct team every week'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        return cost, week_numbers, teams, best
+
+    def run(self, n_samples=1000, noise=0.0, team_shift=0.0, shrinkage=0.0, seed=None, chunk_size=1024):
+        """ Solve many perturbations and count how often each pick is made
+
+        Parameters
+        ----------
+        n_samples : int, optional
+            Number of perturbations
+        noise : float, optional
+            See `perturbed_matrices`
+        team_shift : float, optional
+            See `perturbed_matrices`
+        shrinkage : float, optional
+            See `perturbed_matrices`
+        seed : int, optional
+        chunk_size : int, optional
+            Number of perturbations generated and checked at once
+
+        Returns
+        -------
+        SensitivityReport
+            Baseline picks, fraction of perturbations making each (week,
+            team) pick, fraction whose picks equal the baseline picks and
+            fraction of solves skipped
+
+        """
+        season = self.season
+        cost, week_numbers, teams, best = self._baseline()
+        rows = [season.week_index[week_number] for week_number in week_numbers]
+        columns = [season.team_index[team] for team in teams]
+        finite = np.isfinite(cost)
+        week_range = np.arange(len(week_numbers))
+
+        opponents = opponent_columns(season)
+        rng = np.random.default_rng(seed)
+        counts = np.zeros(cost.shape, dtype=np.int64)
+        n_baseline, n_skipped = 0, 0
+
+        for start in range(0, n_samples, chunk_size):
+            matrices = perturbed_matrices(season.probability_matrix, opponents, min(chunk_size, n_samples - start),
+                                          rng, noise, team_shift, shrinkage)[:, rows][:, :, columns]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                perturbed_costs = -np.log(np.clip(matrices, np.finfo(float).tiny, None))
+            perturbed_costs[:, ~finite] = np.inf
+
+            unchanged = ~improvable(perturbed_costs, best)
+
+            n_skipped += int(unchanged.sum())
+            n_baseline += int(unchanged.sum())
+            counts[week_range, best] += int(unchanged.sum())
+
+            assignments = batch_min_cost_assignment(perturbed_costs[~unchanged])
+            np.add.at(counts, (np.broadcast_to(week_range, assignments.shape), assignments), 1)
+            n_baseline += int((assignments == best).all(axis=1).sum())
+
+        logger.info('Skipped %d of %d solves', n_skipped, n_samples)
+
+        pick_frequencies = {(week_numbers[row], teams[column]): counts[row, column] / n_samples
+                            for row, column in zip(*np.nonzero(counts))}
+        baseline_picks = Picks(self._picker.previous_picks)
+        baseline_picks.update((week_number, teams[column]) for week_number, column in zip(week_numbers, best))
+
+        return SensitivityReport(baseline_picks, pick_frequencies, n_baseline / n_samples, n_skipped / n_samples,
+                                 n_samples)
+
+
+def report_dict(sensitivity_report):
+    """ YAML style dictionary of sensitivity report
+
+    Parameters
+    ----------
+    sensitivity_report : SensitivityReport
+
+    Returns
+    -------
+    dict
+
+    """
+    weeks = collections.defaultdict(list)
+    for (week_number, team), frequency in sensitivity_report.pick_frequencies.items():
+        weeks[week_number].append({'team': team, 'frequency': float(frequency)})
+
+    return {'samples': sensitivity_report.n_samples,
+            'baseline_frequency': float(sensitivity_report.baseline_frequency),
+            'skipped_fraction': float(sensitivity_report.skipped_fraction),
+            'weeks': [{'week': {'number': week_number,
+                                'baseline': sensitivity_report.baseline_picks[week_number],
+                                'picks': sorted(weeks[week_number], key=lambda pick: -pick['frequency'])}}
+                      for week_number in sorted(weeks)]}
+
+
+@click.command()
+@click.option('-s', '--season', 'season_path', type=str, required=True,
+              help='File path to season YAML')
+@click.option('-pp', '--previous_picks', 'previous_picks', type=str, default=None,
+              help='File path to YAML file with previous picks')
+@click.option('-n', '--samples', 'n_samples', type=int, default=1000,
+              help='Number of perturbations')
+@click.option('--noise', 'noise', type=float, default=0.0,
+              help='Standard deviation of log odds noise per game')
+@click.option('--team_shift', 'team_shift', type=float, default=0.0,
+              help='Standard deviation of log odds shift per team')
+@click.option('--shrinkage', 'shrinkage', type=float, default=0.0,
+              help='Standard deviation of the log of a log odds scale factor per perturbation')
+@click.option('--seed', 'seed', type=int, default=None,
+              help='Seed making perturbations reproducible')
+@click.option('-o', '--output', 'output', type=str, default=None,
+              help='YAML file path to write report to')
+@initialize_logging()
+def sensitivity(season_path, previous_picks, n_samples, noise, team_shift, shrinkage, seed, output):
+    """Report how often each pick is made when win probabilities are perturbed"""
+    season = Season.from_yaml(season_path)
+    previous_picks = Picks.from_yaml(previous_picks) if previous_picks else None
+
+    report = report_dict(SensitivityAnalysis(season, previous_picks).run(n_samples, noise, team_shift, shrinkage,
+                                                                         seed))
+
+    if output is not None:
+        logger.info('Writing sensitivity report to file %s', output)
+        write_yaml(report, output)
+    else:
+        click.echo(f'{report["baseline_frequency"]:.1%} of perturbations keep the baseline picks, '
+                   f'{report["skipped_fraction"]:.1%} needed no solve')
+        for week in report['weeks']:
+            week = week['week']
+            click.echo(f'week {week["number"]:>2}: ' +
+                       ', '.join(f'{pick["team"]} {pick["frequency"]:.1%}' for pick in week['picks'][:3]))
@@ -0,0 +1,330 @@
+import collections
+import concurrent.futures
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PoolEquity = collections.namedtuple('PoolEquity', ('expected_share', 'standard_error', 'win_probability'))
+
+STRATEGIES = ('greedy', 'popularity')
+
+# arguments shared by every chunk, sent once to each worker process
+_worker_arguments = None
+
+
+def opponent_columns(season):
+    """ Column of each team's opponent in each week
+
+    Parameters
+    ----------
+    season : season.Season
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array of shape (weeks, teams) indexed like
+        `season.probability_matrix`, -1 for byes
+
+    """
+    columns = season.to_columns()
+    opponents = np.full(season.probability_matrix.shape, -1, dtype=np.intp)
+
+    # team ids of columns index team_names, the same as matrix columns
+    rows = np.searchsorted(np.asarray(season.week_numbers), columns['week'])
+    opponents[rows, columns['team']] = columns['opponent']
+
+    return opponents
+
+
+def sample_wins(season, n_seasons, rng, opponents=None):
+    """ Sample outcomes of every game of a season many times at once
+
+    Each game is drawn once, for its team with the lower column, so exactly
+    one of its teams wins
+
+    Parameters
+    ----------
+    season : season.Season
+    n_seasons : int
+        Number of seasons to sample
+    rng : numpy.random.Generator
+    opponents : numpy.ndarray, optional
+        Opponent columns given by `opponent_columns`
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array of shape (seasons, weeks, teams) indicating wins, byes never win
+
+    """
+    matrix = season.probability_matrix
+    opponents = opponents if opponents is not None else opponent_columns(season)
+    n_weeks, n_teams = matrix.shape
+
+    teams = np.arange(n_teams)
+    leads = np.where(opponents >= 0, np.minimum(teams, opponents), teams)
+    lead_probabilities = np.nan_to_num(matrix[np.arange(n_weeks)[:, None], leads], nan=0.0)
+
+    lead_wins = rng.random((n_seasons, n_weeks, n_teams)) < lead_probabilities
+    lead_wins = np.take_along_axis(lead_wins, np.broadcast_to(leads, lead_wins.shape), axis=2)
+
+    return (lead_wins == (leads == teams)) & (opponents >= 0)
+
+
+def _popularity_picks(rng, weights, used, max_rounds=8):
+    """ Sample one team per opponent with probability proportional to weight among teams not used
+
+    Teams are drawn from the week's distribution over all teams and redrawn
+    when already used, which gives the distribution conditioned on the
+    teams available while only costing a binary search per draw. Rows still
+    rejected after `max_rounds` are sampled exactly from their available
+    teams
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+    weights : numpy.ndarray
+        Nonnegative weight of each team for the week
+    used : numpy.ndarray
+        Boolean array of shape (opponents, teams)
+    max_rounds : int, optional
+
+    Returns
+    -------
+    numpy.ndarray
+        Team picked by each opponent, -1 if no team with positive weight is available
+
+    """
+    cumulative = np.cumsum(weights)
+    picks = np.full(len(used), -1, dtype=np.intp)
+    pending = np.arange(len(used))
+
+    for _ in range(max_rounds):
+        if not len(pending) or cumulative[-1] <= 0:
+            break
+        draws = np.searchsorted(cumulative, rng.random(len(pending)) * cumulative[-1], side='right')
+        draws = np.minimum(draws, len(weights) - 1)
+        accepted = ~used[pending, draws]
+        picks[pending[accepted]] = draws[accepted]
+        pending = pending[~accepted]
+
+    if len(pending):
+        available = np.where(used[pending], 0.0, weights)
+        row_cumulative = np.cumsum(available, axis=1)
+        thresholds = rng.random(len(pending)) * row_cumulative[:, -1]
+        draws = np.minimum((row_cumulative <= thresholds[:, None]).sum(axis=1), len(weights) - 1)
+        picks[pending] = np.where(row_cumulative[:, -1] > 0, draws, -1)
+
+    return picks
+
+
+def _simulate_chunk(season, team_ids, n_seasons, n_opponents, strategy, temperature, seed_sequence):
+    """ Weeks survived and pot shares for one chunk of simulated seasons
+
+    Module level so it can run in worker processes
+
+    Parameters
+    ----------
+    season : season.Season
+    team_ids : numpy.ndarray
+        Team ids of our candidate picks as rows of shape (candidates, weeks)
+    n_seasons : int
+    n_opponents : int
+    strategy : str
+    temperature : float
+    seed_sequence : numpy.random.SeedSequence
+
+    Returns
+    -------
+    numpy.ndarray
+        Pot share of each candidate in each season, shape (seasons, candidates)
+    numpy.ndarray
+        Whether each candidate survived every week, shape (seasons, candidates)
+
+    """
+    rng = np.random.default_rng(seed_sequence)
+    matrix = season.probability_matrix
+    n_weeks, n_teams = matrix.shape
+    wins = sample_wins(season, n_seasons, rng)
+    seasons = np.arange(n_seasons)[:, None]
+
+    # opponents pick without knowing outcomes, so picks are drawn week by week alongside
+    # the outcomes for opponents still alive only, which quickly become few. Greedy
+    # opponents all pick alike so one stands in for all of them
+    weights = np.nan_to_num(matrix, nan=0.0) ** (1 / temperature)
+    multiplicity = n_opponents if strategy == 'greedy' else 1
+    alive_seasons = np.repeat(np.arange(n_seasons), n_opponents // multiplicity if n_opponents else 0)
+    used = np.zeros((len(alive_seasons), n_teams), dtype=bool)
+    # number of opponents in each season surviving exactly as many weeks as the column
+    opponent_counts = np.zeros((n_seasons, n_weeks + 1), dtype=np.int64)
+
+    ours_alive = np.ones((n_seasons, len(team_ids)), dtype=bool)
+    ours_survived = np.zeros((n_seasons, len(team_ids)), dtype=np.int64)
+
+    for week in range(n_weeks):
+        if strategy == 'greedy':
+            available = np.where(used, 0.0, weights[week])
+            picks = np.where(available.max(axis=1, initial=0.0) > 0, np.argmax(available, axis=1), -1)
+        else:
+            picks = _popularity_picks(rng, weights[week], used)
+        rows = np.arange(len(picks))
+
+        won = (picks >= 0) & wins[alive_seasons, week, np.maximum(picks, 0)]
+        opponent_counts[:, week] += multiplicity * np.bincount(alive_seasons[~won], minlength=n_seasons)
+        used[rows, picks] = True
+        alive_seasons, used = alive_seasons[won], used[won]
+
+        ours_alive &= wins[seasons, week, np.maximum(team_ids[:, week], 0)] & (team_ids[:, week] >= 0)
+        ours_survived += ours_alive
+
+    opponent_counts[:, n_weeks] += multiplicity * np.bincount(alive_seasons, minlength=n_seasons)
+
+    # the entries lasting longest split the pot
+    has_opponents = opponent_counts > 0
+    opponents_best = np.where(has_opponents.any(axis=1),
+                              n_weeks - np.argmax(has_opponents[:, ::-1], axis=1), 0)
+    best = np.maximum(opponents_best[:, None], ours_survived)
+    tied_opponents = opponent_counts[seasons, best]
+    shares = np.where(ours_survived == best, 1.0 / (1 + tied_opponents), 0.0)
+
+    return shares, ours_survived == n_weeks
+
+
+def _initialize_worker(season, team_ids, n_opponents, strategy, temperature):
+    global _worker_arguments
+    _worker_arguments = (season, team_ids, n_opponents, strategy, temperature)
+
+
+def _worker_simulate_chunk(n_seasons, seed_sequence):
+    season, team_ids, n_opponents, strategy, temperature = _worker_arguments
+    return _simulate_chunk(season, team_ids, n_seasons, n_opponents, strategy, temperature, seed_sequence)
+
+
+class PoolSimulation:
+
+    def __init__(self, season, n_opponents=1000, strategy='popularity', temperature=0.25, chunk_size=256,
+                 max_workers=None, seed=None):
+        """ Monte Carlo simulation of a survivor pool against modeled opponents
+
+        Every simulated season draws all game outcomes at once and lets each
+        opponent pick every week as an array operation. Opponents using the
+        `greedy` strategy pick the available team most likely to win, with
+        `popularity` they pick available teams at random with probability
+        proportional to win probability to the power of 1 / `temperature`.
+        The entries surviving the most weeks split the pot. Seasons are
+        simulated in chunks of bounded memory, each with its own seed
+        spawned from `seed`, so results only depend on `seed` and
+        `chunk_size`, not on the number of workers
+
+        Parameters
+        ----------
+        season : season.Season
+            Season to simulate
+        n_opponents : int, optional
+            Number of other entries in pool
+        strategy : str, optional
+            One of `STRATEGIES` used by all opponents
+        temperature : float, optional
+            Spread of popularity picks, lower values concentrate on favorites
+        chunk_size : int, optional
+            Number of seasons simulated per vectorized pass
+        max_workers : int, optional
+            Number of processes simulating chunks, None to use all cores and
+            1 to simulate in this process. The season and candidates are
+            sent once to each process
+        seed : int, optional
+            Seed making simulation reproducible
+
+        """
+        if strategy not in STRATEGIES:
+            exception_msg = f'No strategy matching {strategy}'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        self._season = season
+        self._n_opponents = n_opponents
+        self._strategy = strategy
+        self._temperature = temperature
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._seed = seed
+
+    @property
+    def season(self):
+        return self._season
+
+    def _chunk_arguments(self, n_seasons):
+        """ Number of seasons and seed of every chunk of seasons
+
+        Parameters
+        ----------
+        n_seasons : int
+
+        Returns
+        -------
+        list(tuple(int, numpy.random.SeedSequence))
+
+        """
+        chunk_sizes = [min(self._chunk_size, n_seasons - start) for start in range(0, n_seasons, self._chunk_size)]
+        seed_sequences = np.random.SeedSequence(self._seed).spawn(len(chunk_sizes))
+
+        return list(zip(chunk_sizes, seed_sequences))
+
+    def equities(self, picks_list, n_seasons=10000):
+        """ Expected share of the pot of each of our candidate picks
+
+        All candidates are scored on the same simulated seasons, each as our
+        only entry in the pool
+
+        Parameters
+        ----------
+        picks_list : list(picks.Picks)
+            Candidate picks, weeks without a pick count as a loss
+        n_seasons : int, optional
+            Number of seasons to simulate
+
+        Returns
+        -------
+        list(PoolEquity)
+            Expected share, its standard error and the probability of
+            surviving every week for each candidate
+
+        """
+        team_ids = np.array([self.season.picks_team_ids(picks) for picks in picks_list])
+        chunk_arguments = self._chunk_arguments(n_seasons)
+        shared_arguments = (self.season, team_ids, self._n_opponents, self._strategy, self._temperature)
+
+        logger.info('Simulating %d seasons of %d opponents picking by %s in %d chunks', n_seasons,
+                    self._n_opponents, self._strategy, len(chunk_arguments))
+        if self._max_workers == 1 or len(chunk_arguments) == 1:
+            season, team_ids, n_opponents, strategy, temperature = shared_arguments
+            results = [_simulate_chunk(season, team_ids, chunk_size, n_opponents, strategy, temperature, seed_sequence)
+                       for chunk_size, seed_sequence in chunk_arguments]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self._max_workers, initializer=_initialize_worker,
+                                                        initargs=shared_arguments) as executor:
+                results = list(executor.map(_worker_simulate_chunk, *zip(*chunk_arguments)))
+
+        shares = np.concatenate([chunk_shares for chunk_shares, _ in results])
+        survived = np.concatenate([chunk_survived for _, chunk_survived in results])
+
+        return [PoolEquity(float(candidate_shares.mean()), float(candidate_shares.std() / np.sqrt(n_seasons)),
+                           float(candidate_survived.mean()))
+                for candidate_shares, candidate_survived in zip(shares.T, survived.T)]
+
+    def equity(self, picks, n_seasons=10000):
+        """ Expected share of the pot of our picks
+
+        Parameters
+        ----------
+        picks : picks.Picks
+        n_seasons : int, optional
+
+        Returns
+        -------
+        PoolEquity
+
+        """
+        return self.equities([picks], n_seasons)[0]
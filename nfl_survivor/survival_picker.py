@@ -0,0 +1,188 @@
+import logging
+
+import numpy as np
+
+from nfl_survivor.picker import Picker
+from nfl_survivor.picks import Picks
+
+logger = logging.getLogger(__name__)
+
+
+class SurvivalPicker(Picker):
+
+    def __init__(self, season, previous_picks=None):
+        """ Pick maker for a season maximizing expected survival length
+
+        Expected survival p_1 + p_1 * p_2 + p_1 * p_2 * p_3 + ... is
+        maximized exactly by depth first branch and bound over the weeks of
+        the season. Subproblems are memoized on (week, used teams) since
+        different orderings of the same teams lead to the same continuation
+
+        Parameters
+        ----------
+        season : season.Season
+            Season to make picks for
+        previous_picks : picks.Picks, optional
+            Predetermined picks
+
+        """
+        super().__init__(season, previous_picks)
+        self._memo = {}
+
+    def _week_candidates(self):
+        """ Candidate picks per week ordered by decreasing win probability
+
+        Teams are encoded as bits of an integer mask of used teams. Weeks
+        with a previous pick have that pick as their only candidate with
+        an empty bit since the team is marked as used from the start.
+        Probabilities are clipped to the smallest positive float so zero
+        probability picks stay feasible without dividing by zero
+
+        Returns
+        -------
+        list(list(tuple(float, int)))
+            Win probability and team bit of candidates for each week
+        int
+            Mask of teams used by previous picks
+
+        """
+        season = self.season
+        tiny = np.finfo(float).tiny
+
+        used = 0
+        for week_number, team in self.previous_picks.items():
+            season.win_probability(week_number, team)
+            used |= 1 << season.team_index[team]
+
+        week_candidates = []
+        for week_number, probabilities in zip(season.week_numbers, season.probability_matrix):
+            if week_number in self.previous_picks:
+                probability = season.win_probability(week_number, self.previous_picks[week_number])
+                week_candidates.append([(max(probability, tiny), 0)])
+                continue
+
+            columns = [column for column in np.argsort(-probabilities, kind='stable')
+                       if not np.isnan(probabilities[column]) and not used >> int(column) & 1]
+            week_candidates.append([(max(float(probabilities[column]), tiny), 1 << int(column))
+                                    for column in columns])
+
+        return week_candidates, used
+
+    def _upper_bound(self, week, used):
+        """ Expected survival from week on if teams could be picked repeatedly
+
+        Parameters
+        ----------
+        week : int
+            Index of first week
+        used : int
+            Mask of teams that are no longer available
+
+        Returns
+        -------
+        float
+
+        """
+        bound = 0.0
+        for candidates in reversed(self._candidates[week:]):
+            best = next((probability for probability, bit in candidates if not used & bit), None)
+            if best is None:
+                return -np.inf
+            bound = best * (1 + bound)
+
+        return bound
+
+    def _solve(self, week, used, threshold):
+        """ Best expected survival from week on given used teams
+
+        Results above `threshold` are exact. Otherwise the returned value is
+        only an upper bound at most `threshold`, which is all the caller needs
+        to discard the branch. Both are memoized so repeated states are free.
+        When no team beats `threshold` the best value found is not a bound,
+        since branches were cut without being solved, so `threshold` itself
+        is returned
+
+        Parameters
+        ----------
+        week : int
+            Index of week to pick for
+        used : int
+            Mask of teams that are no longer available
+        threshold : float
+            Value the caller must beat for the result to matter
+
+        Returns
+        -------
+        float
+
+        """
+        if week == len(self._candidates):
+            return 0.0
+
+        key = (week, used)
+        if key in self._memo:
+            value, exact, _ = self._memo[key]
+            if exact or value <= threshold:
+                return value
+
+        rest_bound = self._upper_bound(week + 1, used)
+        bound = next((probability for probability, bit in self._candidates[week] if not used & bit),
+                     -np.inf) * (1 + rest_bound)
+        if bound <= threshold:
+            self._memo[key] = (bound, False, None)
+            return bound
+
+        best, best_bit = -np.inf, None
+        for probability, bit in self._candidates[week]:
+            if used & bit:
+                continue
+
+            target = max(best, threshold)
+            if probability * (1 + rest_bound) <= target:
+                # candidates are sorted so no later team can do better
+                break
+
+            # compare in the child's terms so only exact results are ever chosen
+            child_threshold = target / probability - 1
+            child_value = self._solve(week + 1, used | bit, child_threshold)
+            if child_value > child_threshold:
+                best, best_bit = max(best, probability * (1 + child_value)), bit
+
+        if best <= threshold:
+            # every branch is at most threshold, but cut branches may beat best
+            self._memo[key] = (threshold, False, None)
+            return threshold
+
+        self._memo[key] = (best, True, best_bit)
+        return best
+
+    def picks(self):
+        """ Make picks for a particular season maximizing expected survival
+
+        Returns
+        -------
+        dict(int->str)
+            Week number to team name
+
+        """
+        self._candidates, used = self._week_candidates()
+        self._memo = {}
+
+        logger.info('Searching for picks maximizing expected survival')
+        expected_survival = self._solve(0, used, -np.inf)
+
+        if not np.isfinite(expected_survival):
+            exception_msg = 'Cannot solve for picks since there is no way to pick a distinct team every week'
+            logger.exception(exception_msg)
+            raise ValueError(exception_msg)
+
+        logger.info('Found expected survival %f after exploring %d states', expected_survival, len(self._memo))
+
+        picks = Picks(self.previous_picks)
+        for week, week_number in enumerate(self.season.week_numbers):
+            _, _, bit = self._memo[week, used]
+            if week_number not in self.previous_picks:
+                picks[week_number] = self.season.team_names[bit.bit_length() - 1]
+            used |= bit
+
+        return picks
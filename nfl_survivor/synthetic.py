@@ -0,0 +1,121 @@
+import array
+import logging
+
+import numpy as np
+import yaml
+
+from nfl_survivor.season import Season
+from nfl_survivor.team_registry import TEAMS
+from nfl_survivor.week import Week
+
+logger = logging.getLogger(__name__)
+
+# functions of random generator and ratings of the first and second team of each game
+# giving the first team's win probability
+DISTRIBUTIONS = {'uniform': lambda rng, ratings_one, ratings_two: rng.uniform(0.05, 0.95, len(ratings_one)),
+                 'beta': lambda rng, ratings_one, ratings_two: rng.beta(2.0, 2.0, len(ratings_one)),
+                 'elo': lambda rng, ratings_one, ratings_two: 1 / (1 + 10 ** ((ratings_two - ratings_one) / 400))}
+
+# standard deviation of team ratings used by the `elo` distribution, close to NFL Elo ratings
+RATING_SCALE = 100.0
+
+
+def team_names(n_teams):
+    """ Names of synthetic teams
+
+    Parameters
+    ----------
+    n_teams : int
+
+    Returns
+    -------
+    list(str)
+
+    """
+    width = len(str(n_teams - 1))
+    return [f'team_{team:0{width}d}' for team in range(n_teams)]
+
+
+def synthetic_weeks(n_teams=32, n_weeks=17, bye_rate=0.0, distribution='elo', seed=None):
+    """ Lazily generate weeks of a random season
+
+    Every week teams are paired at random. Each team independently has a bye
+    with probability `bye_rate`, one more team sits out if that leaves an odd
+    number playing. Weeks are packed straight into arrays of team ids, so
+    seasons with millions of games never hold per-game objects
+
+    Parameters
+    ----------
+    n_teams : int, optional
+    n_weeks : int, optional
+    bye_rate : float, optional
+        Probability of a team not playing in a week
+    distribution : str, optional
+        Name of distribution in `DISTRIBUTIONS` win probabilities are drawn from
+    seed : int, optional
+        Seed making the season reproducible
+
+    Yields
+    ------
+    week.Week
+        Next week of season, numbered from 1
+
+    """
+    if n_teams < 2 or n_weeks < 0 or not 0 <= bye_rate < 1:
+        exception_msg = (f'Cannot generate season with {n_teams} teams, {n_weeks} weeks '
+                         f'and bye rate {bye_rate}')
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    try:
+        win_probabilities = DISTRIBUTIONS[distribution]
+    except KeyError:
+        exception_msg = f'No distribution matching {distribution}'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    rng = np.random.default_rng(seed)
+    team_ids = np.array([TEAMS.team_id(name) for name in team_names(n_teams)], dtype=np.int32)
+    ratings = rng.normal(0.0, RATING_SCALE, n_teams)
+
+    logger.info('Generating %d weeks for %d teams with %s win probabilities', n_weeks, n_teams, distribution)
+    for week_number in range(1, n_weeks + 1):
+        order = rng.permutation(n_teams)
+        playing = order[rng.random(n_teams) >= bye_rate] if bye_rate else order
+        playing = playing[:len(playing) // 2 * 2]
+
+        teams_one, teams_two = playing[0::2], playing[1::2]
+        probabilities_one = win_probabilities(rng, ratings[teams_one], ratings[teams_two])
+
+        week_team_ids, week_probabilities = array.array('i'), array.array('d')
+        week_team_ids.frombytes(team_ids[playing].tobytes())
+        week_probabilities.frombytes(np.column_stack((probabilities_one, 1 - probabilities_one)).tobytes())
+
+        yield Week._from_arrays(week_number, week_team_ids, week_probabilities)
+
+
+def synthetic_season(n_teams=32, n_weeks=17, bye_rate=0.0, distribution='elo', seed=None):
+    """ Random season, parameters are the same as for `synthetic_weeks`
+
+    Returns
+    -------
+    season.Season
+
+    """
+    return Season(synthetic_weeks(n_teams, n_weeks, bye_rate, distribution, seed))
+
+
+def write_weeks_yaml(weeks, yaml_file_path):
+    """ Write weeks to season YAML one week at a time
+
+    The file is the same as writing the whole season with `utils.write_yaml`
+
+    Parameters
+    ----------
+    weeks : iterable(week.Week)
+    yaml_file_path : str
+
+    """
+    with open(yaml_file_path, 'w') as yaml_file:
+        for week in weeks:
+            yaml.dump([{'week': week.to_dict()}], yaml_file)
@@ -0,0 +1,81 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class TeamRegistry:
+
+    def __init__(self):
+        """ Shared table interning team names as small integer ids
+
+        Ids are handed out in order of first registration and never change,
+        so the many games and weeks naming the same team only hold an int.
+        Ids are local to the process and must not be persisted
+
+        """
+        self._names = []
+        self._name_to_id = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._name_to_id
+
+    def team_id(self, name):
+        """ Id of team, registering the team if it is new
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        int
+
+        """
+        try:
+            return self._name_to_id[name]
+        except KeyError:
+            with self._lock:
+                if name not in self._name_to_id:
+                    # name goes in before the id is published so readers holding no lock can always look it up
+                    self._names.append(name)
+                    self._name_to_id[name] = len(self._names) - 1
+
+                return self._name_to_id[name]
+
+    def get(self, name):
+        """ Id of team without registering it
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        int or None
+            None if team was never registered
+
+        """
+        return self._name_to_id.get(name)
+
+    def team_name(self, team_id):
+        """ Name of team with id
+
+        Parameters
+        ----------
+        team_id : int
+
+        Returns
+        -------
+        str
+
+        """
+        return self._names[team_id]
+
+
+# registry shared by all games, weeks and seasons
+TEAMS = TeamRegistry()
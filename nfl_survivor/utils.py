@@ -1,13 +1,55 @@
 import logging
+import threading
 
 import yaml
 
+from nfl_survivor import profiling
+
+# libyaml bindings are much faster than the pure Python loader when installed
+YAML_LOADER = getattr(yaml, 'CLoader', yaml.Loader)
+
+
+# attribute holding the lock guarding the cached values of an object, classes with slots need a slot for it
+CACHE_LOCK_ATTRIBUTE = '_cached_property_lock'
+
+# only held while creating an object's lock, never while computing a value
+_cache_lock_guard = threading.Lock()
+
+
+def _cache_lock(obj):
+    """ Lock guarding computation of cached values of object, created on first use
+
+    Parameters
+    ----------
+    obj : object
+
+    Returns
+    -------
+    threading.RLock
+
+    """
+    try:
+        return getattr(obj, CACHE_LOCK_ATTRIBUTE)
+    except AttributeError:
+        with _cache_lock_guard:
+            try:
+                return getattr(obj, CACHE_LOCK_ATTRIBUTE)
+            except AttributeError:
+                # reentrant since computing one cached value may read another of the same object
+                lock = threading.RLock()
+                setattr(obj, CACHE_LOCK_ATTRIBUTE, lock)
+                return lock
+
 
 def _add_cache(method):
     """ Add cache to instance method
 
     New method will try to read value from cache. Otherwise,
-    it will compute from scratch using original method
+    it will compute from scratch using original method. Computing
+    is guarded by a lock per object so that threads missing the cache
+    of the same object at the same time compute the value once and all
+    see the same object, while other objects are computed in parallel
+    and reading a cached value takes no lock
 
     Warning:
         - Do not use with methods that are dependent on mutable attributes
@@ -25,15 +67,27 @@ def _add_cache(method):
         Function with cache
 
     """
-    def _method_with_cache(obj):
-        cached_attribute = f'cached_{method.__name__}'
+    hits_counter = f'cached_property.{method.__qualname__}.hits'
+    misses_counter = f'cached_property.{method.__qualname__}.misses'
+    cached_attribute = f'cached_{method.__name__}'
 
+    def _method_with_cache(obj):
         try:
-            return getattr(obj, cached_attribute)
+            res = getattr(obj, cached_attribute)
         except AttributeError:
-            res = method(obj)
-            setattr(obj, cached_attribute, res)
-            return res
+            with _cache_lock(obj):
+                try:
+                    return getattr(obj, cached_attribute)
+                except AttributeError:
+                    profiling.count(misses_counter)
+                    res = method(obj)
+                    setattr(obj, cached_attribute, res)
+                    return res
+
+        # checked inline rather than through `profiling.count` since hits are on hot paths
+        if profiling._active_profile is not None:
+            profiling.count(hits_counter)
+        return res
 
     return _method_with_cache
 
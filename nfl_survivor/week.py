@@ -1,16 +1,22 @@
+import array
 import logging
 
 from nfl_survivor.game import Game
-from nfl_survivor.utils import cached_property
+from nfl_survivor.team_registry import TEAMS
 
 logger = logging.getLogger(__name__)
 
 
 class Week:
 
+    __slots__ = ('_week_number', '_team_ids', '_probabilities')
+
     def __init__(self, week_number, games):
         """ One week's worth of games
 
+        Games are packed into flat arrays of registered team ids and win
+        probabilities with the two teams of a game next to each other
+
         Parameters
         ----------
         week_number : int
@@ -19,9 +25,39 @@ class Week:
             Games to be played in week
 
         """
-        logger.info('Loading week number %d', week_number)
+        logger.debug('Loading week number %d', week_number)
         self._week_number = week_number
-        self._games = tuple(games)
+        self._team_ids = array.array('i')
+        self._probabilities = array.array('d')
+
+        for game in games:
+            self._team_ids.extend(game._team_ids)
+            self._probabilities.extend(game._probabilities)
+
+    @classmethod
+    def _from_arrays(cls, week_number, team_ids, probabilities):
+        """ Form week from packed arrays without building games
+
+        Parameters
+        ----------
+        week_number : int
+        team_ids : array.array
+            Registered team ids with the teams of each game next to each other
+        probabilities : array.array
+            Win probabilities matching `team_ids`
+
+        Returns
+        -------
+        week.Week
+
+        """
+        week = cls.__new__(cls)
+        week._week_number, week._team_ids, week._probabilities = week_number, team_ids, probabilities
+        return week
+
+    def __reduce__(self):
+        # ids are local to the process so pickle games, which pickle team names
+        return type(self), (self.week_number, self.games)
 
     @property
     def week_number(self):
@@ -34,6 +70,28 @@ class Week:
         """
         return self._week_number
 
+    @property
+    def team_ids(self):
+        """ Registered ids of teams playing, two consecutive ids per game
+
+        Returns
+        -------
+        array.array
+
+        """
+        return self._team_ids
+
+    @property
+    def probabilities(self):
+        """ Win probabilities matching `team_ids`
+
+        Returns
+        -------
+        array.array
+
+        """
+        return self._probabilities
+
     @property
     def games(self):
         """ Games taking place during week
@@ -43,7 +101,7 @@ class Week:
         tuple(game.Game)
 
         """
-        return self._games
+        return tuple(self)
 
     def __iter__(self):
         """ Iterate through games of week
@@ -54,20 +112,28 @@ class Week:
             Next game of the week
 
         """
-        yield from self.games
+        team_ids, probabilities = self._team_ids, self._probabilities
+        for index in range(0, len(team_ids), 2):
+            yield Game._from_ids((team_ids[index], team_ids[index + 1]),
+                                 (probabilities[index], probabilities[index + 1]))
+
+    def _team_position(self, team):
+        """ Position of team in packed arrays
 
-    @cached_property
-    def _team_to_game(self):
-        """ Map of team to game for the given week
+        Parameters
+        ----------
+        team : str
 
         Returns
         -------
-        dict(str->game.Game)
+        int or None
+            None if team is not playing in week
 
         """
-        return {team: game
-                for game in self
-                for team in game}
+        try:
+            return self._team_ids.index(TEAMS.get(team))
+        except (TypeError, ValueError):
+            return None
 
     def team_game(self, team):
         """ Week's game for a team
@@ -85,7 +151,13 @@ class Week:
             Game that team is playing in during week
 
         """
-        return self._team_to_game.get(team)
+        position = self._team_position(team)
+        if position is None:
+            return None
+
+        first = position - position % 2
+        return Game._from_ids((self._team_ids[first], self._team_ids[first + 1]),
+                              (self._probabilities[first], self._probabilities[first + 1]))
 
     def team_win_probability(self, team):
         """ Probability that team wins this week
@@ -100,13 +172,14 @@ class Week:
         float
             Win probability
         """
-        try:
-            return self.team_game(team).win_probability(team)
-        except AttributeError:
+        position = self._team_position(team)
+        if position is None:
             exception_msg = f'Team {team} is not playing in week {self.week_number}'
             logger.exception(exception_msg)
             raise ValueError(exception_msg)
 
+        return self._probabilities[position]
+
     @property
     def teams(self):
         """ All teams playing in the week
@@ -117,7 +190,8 @@ class Week:
             Next team playing
 
         """
-        yield from self._team_to_game.keys()
+        for team_id in self._team_ids:
+            yield TEAMS.team_name(team_id)
 
     @classmethod
     def from_dict(cls, week_dict):
@@ -134,3 +208,17 @@ class Week:
         """
         return cls(week_dict['number'], (Game.from_dict(game_dict)
                                          for game_dict in week_dict['games']))
+
+    def to_dict(self):
+        """ Dictionary representation of week, the inverse of `from_dict`
+
+        Returns
+        -------
+        dict
+
+        """
+        return {'number': self.week_number,
+                'games': [{'game': [{'team': {'name': TEAMS.team_name(self._team_ids[index + offset]),
+                                              'probability': self._probabilities[index + offset]}}
+                                    for offset in (0, 1)]}
+                          for index in range(0, len(self._team_ids), 2)]}
@@ -11,13 +11,19 @@ setup(
                       'numpy>=1.17.1',
                       'pulp>=1.6.10',
                       'requests>=2.22.0',
+                      'urllib3>=1.26',
                       'PyYAML>=5.1.2'],
     extras_require={'test': ['mock>=3.0.5',
                              'pytest>=5.1.2']},
     entry_points={
         'console_scripts': [
             'make_picks=nfl_survivor.make_picks:make_picks',
-            'scrape_538=tools.scrape_538:scrape'
+            'scrape_538=tools.scrape_538:scrape',
+            'build_season_archive=tools.build_season_archive:build_archive',
+            'generate_season=tools.generate_season:generate_season',
+            'backtest=nfl_survivor.backtest:backtest',
+            'pick_server=nfl_survivor.pick_server:pick_server',
+            'sensitivity=nfl_survivor.sensitivity:sensitivity'
         ],
     },
     author='Matt Alpert',
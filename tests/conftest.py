@@ -3,9 +3,18 @@ import pytest
 from nfl_survivor.game import Game
 from nfl_survivor.picks import Picks
 from nfl_survivor.season import Season
+from nfl_survivor.season_cache import CACHE_DIR_VARIABLE
 from nfl_survivor.week import Week
 
 
+@pytest.fixture(autouse=True)
+def season_cache_dir(tmp_path, monkeypatch):
+    # keep season cache entries written by tests out of the home directory
+    cache_dir = tmp_path / 'season_cache'
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def game_one():
     return Game(('a', 0.1), ('b', 0.9))
@@ -53,3 +62,28 @@ def season(week_one, week_two, week_three):
 @pytest.fixture
 def picks():
     return Picks(((1, 'a'), (2, 'c')))
+
+
+@pytest.fixture
+def long_season():
+    return Season.from_yaml('./seasons/2019_season.yaml')
+
+
+@pytest.fixture
+def greedy_counterexample():
+    return Season.from_yaml('./seasons/greedy_counterexample.yaml')
+
+
+@pytest.fixture
+def survival_season():
+    # maximizing win probability picks c then a, expected survival prefers a then b
+    return Season.from_dict([{'week': {'number': 1,
+                                       'games': [{'game': [{'team': {'name': 'a',
+                                                                     'probability': 0.9}},
+                                                           {'team': {'name': 'c',
+                                                                     'probability': 0.1}}]}]}},
+                             {'week': {'number': 2,
+                                       'games': [{'game': [{'team': {'name': 'a',
+                                                                     'probability': 0.95}},
+                                                           {'team': {'name': 'b',
+                                                                     'probability': 0.05}}]}]}}])
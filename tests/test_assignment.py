@@ -0,0 +1,71 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from nfl_survivor.assignment import batch_min_cost_assignment, min_cost_assignment
+
+
+def brute_force_cost(cost):
+    n_rows, n_columns = cost.shape
+    return min(sum(cost[row, column] for row, column in enumerate(columns))
+               for columns in itertools.permutations(range(n_columns), n_rows))
+
+
+def test_min_cost_assignment():
+    rng = np.random.default_rng(0)
+
+    for _ in range(50):
+        cost = rng.random((4, 6))
+        cost[rng.random(cost.shape) < 0.2] = np.inf
+
+        expected = brute_force_cost(cost)
+
+        if np.isinf(expected):
+            with pytest.raises(ValueError):
+                min_cost_assignment(cost)
+        else:
+            columns = min_cost_assignment(cost)
+
+            assert len(set(columns)) == 4
+            assert cost[np.arange(4), columns].sum() == pytest.approx(expected)
+
+
+def test_min_cost_assignment_too_many_rows():
+    with pytest.raises(ValueError) as exception:
+        min_cost_assignment(np.zeros((3, 2)))
+
+    assert 'Cannot assign' in str(exception.value)
+
+
+def test_min_cost_assignment_potentials():
+    rng = np.random.default_rng(1)
+    cost = rng.random((4, 6))
+    cost[0, :2] = np.inf
+
+    columns, row_potential, column_potential = min_cost_assignment(cost, potentials=True)
+    reduced_cost = cost - row_potential[:, None] - column_potential
+
+    assert (reduced_cost >= -1e-12).all()
+    assert reduced_cost[np.arange(4), columns] == pytest.approx(np.zeros(4))
+    assert (column_potential <= 0).all()
+    assert (column_potential[np.setdiff1d(np.arange(6), columns)] == 0).all()
+
+
+def test_batch_min_cost_assignment():
+    rng = np.random.default_rng(2)
+    costs = rng.random((200, 4, 6))
+    costs[rng.random(costs.shape) < 0.3] = np.inf
+
+    assignments = batch_min_cost_assignment(costs)
+
+    for cost, columns in zip(costs, assignments):
+        expected = brute_force_cost(cost)
+        if np.isinf(expected):
+            assert (columns == -1).all()
+        else:
+            assert len(set(columns)) == 4
+            assert cost[np.arange(4), columns].sum() == pytest.approx(expected)
+
+    with pytest.raises(ValueError):
+        batch_min_cost_assignment(np.zeros((2, 3, 2)))
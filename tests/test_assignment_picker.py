@@ -0,0 +1,69 @@
+import itertools
+
+import pytest
+
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+
+
+@pytest.mark.usefixtures('season', 'picks', 'greedy_counterexample')
+class TestAssignmentPicker:
+
+    def test_picks(self, season):
+        assert AssignmentPicker(season).picks() == {1: 'b',
+                                                    2: 'd',
+                                                    3: 'f'}
+
+    def test_picks_beats_greedy(self, greedy_counterexample):
+        assert AssignmentPicker(greedy_counterexample).picks() == {1: 'Philadelphia Eagles',
+                                                                   2: 'NY Giants'}
+
+    def test_picks_with_previous(self, season, picks):
+        assert AssignmentPicker(season, picks).picks() == {1: 'a',
+                                                           2: 'c',
+                                                           3: 'b'}
+
+    def test_picks_invalid_previous(self, season):
+        with pytest.raises(ValueError) as exception:
+            AssignmentPicker(season, Picks({1: 'c'})).picks()
+
+        assert 'not playing' in str(exception.value)
+
+    def test_picks_infeasible(self, season):
+        with pytest.raises(ValueError) as exception:
+            AssignmentPicker(season, Picks({2: 'b', 3: 'a'})).picks()
+
+        assert 'Cannot solve' in str(exception.value)
+
+    def test_top_picks(self, season):
+        all_picks = [dict(zip(season.week_numbers, teams))
+                     for teams in itertools.product(*(sorted(week.teams) for week in season))
+                     if len(set(teams)) == len(teams)]
+
+        top_picks = AssignmentPicker(season).top_picks(100)
+
+        assert len(top_picks) == len(all_picks)
+        assert top_picks[0][0] == AssignmentPicker(season).picks()
+        assert sorted(map(tuple, (sorted(picks.items()) for picks, _ in top_picks))) == \
+            sorted(map(tuple, (sorted(picks.items()) for picks in all_picks)))
+
+        win_probabilities = [win_probability for _, win_probability in top_picks]
+        assert win_probabilities == sorted(win_probabilities, reverse=True)
+        for picks, win_probability in top_picks:
+            assert win_probability == pytest.approx(season.picks_win_probability(picks))
+
+    def test_top_picks_with_previous(self, season, picks):
+        top_picks = AssignmentPicker(season, picks).top_picks(3)
+
+        assert [dict(ranked) for ranked, _ in top_picks] == [{1: 'a', 2: 'c', 3: 'b'},
+                                                             {1: 'a', 2: 'c', 3: 'd'},
+                                                             {1: 'a', 2: 'c', 3: 'f'}]
+        assert top_picks[0][1] == pytest.approx(0.1 * 0.2 * 0.9)
+
+    def test_ranked_picks_is_lazy(self):
+        ranked_picks = AssignmentPicker(Season.from_yaml('./seasons/2019_season.yaml')).ranked_picks()
+
+        first, second = next(ranked_picks), next(ranked_picks)
+        assert first[1] >= second[1]
+        assert first[0] != second[0]
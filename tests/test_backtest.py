@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from nfl_survivor.backtest import Scenario, backtest, perturbed_season, run_backtest, run_task, summary_table
+from nfl_survivor.season import Season
+
+SEASON_PATH = 'seasons/2019_season.yaml'
+
+
+class TestBacktest:
+
+    def test_perturbed_season(self):
+        season = Season.from_yaml(SEASON_PATH)
+        perturbed = perturbed_season(season, 0.5, 0)
+        matrix, perturbed_matrix = season.probability_matrix, perturbed.probability_matrix
+
+        assert perturbed_season(season, 0.0, 0) is season
+        assert perturbed.team_names == season.team_names
+        assert np.array_equal(np.isnan(matrix), np.isnan(perturbed_matrix))
+        assert not np.allclose(np.nan_to_num(matrix), np.nan_to_num(perturbed_matrix))
+        # both teams of a game still sum to one
+        week = next(iter(perturbed))
+        for game in week:
+            assert sum(game.win_probability(team) for team in game.teams) == pytest.approx(1.0)
+        assert np.array_equal(perturbed_season(season, 0.5, 0).probability_matrix, perturbed_matrix, equal_nan=True)
+
+    def test_run_task(self):
+        result = run_task(SEASON_PATH, 'greedy', Scenario(0, 0.0, 0))
+        season = Season.from_yaml(SEASON_PATH)
+
+        assert result['status'] == 'ok' and result['season'] == '2019_season.yaml'
+        assert 0 < result['win_probability'] < 1 and result['expected_survival'] > 1
+        assert result['seconds'] >= 0
+
+        # locking every week leaves nothing to pick and greedy picks of the true season
+        locked = run_task(SEASON_PATH, 'assignment', Scenario(len(season.week_numbers), 0.3, 1))
+        assert locked['win_probability'] == pytest.approx(result['win_probability'])
+
+    def test_run_task_skipped(self):
+        assert run_task(SEASON_PATH, 'dp', Scenario(0, 0.0, 0))['status'] == 'skipped'
+
+    def test_run_task_no_picks(self, monkeypatch):
+        class NoPicks:
+            def picks(self):
+                return None
+
+        monkeypatch.setattr('nfl_survivor.backtest.make_picker', lambda *args: NoPicks())
+        result = run_task(SEASON_PATH, 'survival', Scenario(0, 0.0, 0))
+
+        assert result['status'] == 'error' and 'win_probability' not in result
+
+    def test_run_backtest(self, tmp_path):
+        scenarios = [Scenario(0, 0.0, 0), Scenario(10, 0.2, 0), Scenario(10, 0.2, 1)]
+        output_path = tmp_path / 'results.jsonl'
+        with open(output_path, 'w') as output_file:
+            results = run_backtest([SEASON_PATH], ['greedy', 'lp'], scenarios, output_file, max_workers=2)
+
+        with open(output_path, 'r') as output_file:
+            lines = [json.loads(line) for line in output_file]
+
+        assert len(results) == 6 and sorted(map(str, lines)) == sorted(map(str, results))
+        assert all(result['status'] == 'ok' for result in results)
+
+        table = summary_table(results).splitlines()
+        assert table[0].split()[:4] == ['picker', 'tasks', 'skipped', 'failed']
+        assert [line.split()[:4] for line in table[1:]] == [['greedy', '3', '0', '0'], ['lp', '3', '0', '0']]
+
+    def test_backtest_command(self, tmp_path):
+        output_path, summary_path = tmp_path / 'results.jsonl', tmp_path / 'summary.txt'
+        result = CliRunner().invoke(backtest, ['-o', str(output_path), '-s', str(summary_path), '-p', 'greedy',
+                                               '-p', 'dp', '-n', '0.1', '-v', '2', '-w', '1', SEASON_PATH])
+
+        assert result.exit_code == 0
+        with open(output_path, 'r') as output_file:
+            assert len(output_file.readlines()) == 4
+        with open(summary_path, 'r') as summary_file:
+            summary = summary_file.read()
+        assert summary.strip() in result.output
+        assert summary.splitlines()[1].split()[:4] == ['dp', '2', '2', '0']
@@ -0,0 +1,40 @@
+import pytest
+
+from nfl_survivor.dp_picker import DpPicker
+from nfl_survivor.picks import Picks
+
+
+@pytest.mark.usefixtures('season', 'picks', 'survival_season')
+class TestDpPicker:
+
+    def test_invalid_objective(self, season):
+        with pytest.raises(ValueError) as exception:
+            DpPicker(season, objective='fun')
+
+        assert 'No objective' in str(exception.value)
+
+    def test_horizon(self, season, picks):
+        assert DpPicker(season).horizon == 3
+        assert DpPicker(season, picks).horizon == 1
+
+    def test_week_candidates(self, season, picks):
+        candidates = DpPicker(season, picks)._week_candidates()
+
+        assert [[team for _, _, team in week] for week in candidates] == [['a'], ['c'], ['b']]
+
+    def test_picks_probability(self, survival_season):
+        assert DpPicker(survival_season).picks() == {1: 'c', 2: 'a'}
+
+    def test_picks_survival(self, survival_season):
+        assert DpPicker(survival_season, objective='survival').picks() == {1: 'a', 2: 'b'}
+
+    def test_picks_with_previous(self, season, picks):
+        assert DpPicker(season, picks).picks() == {1: 'a',
+                                                   2: 'c',
+                                                   3: 'b'}
+
+    def test_picks_infeasible(self, season):
+        with pytest.raises(ValueError) as exception:
+            DpPicker(season, Picks({2: 'b', 3: 'a'})).picks()
+
+        assert 'Cannot solve' in str(exception.value)
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from nfl_survivor.game import Game
@@ -16,6 +18,20 @@ class TestGame:
         assert game._team_to_probability == {'a': 0.1,
                                              'b': 0.9}
 
+    def test_slots(self, game):
+        with pytest.raises(AttributeError):
+            game.extra = 1
+
+    def test_eq(self, game):
+        assert game == Game(('a', 0.1), ('b', 0.9))
+        assert hash(game) == hash(Game(('a', 0.1), ('b', 0.9)))
+        assert game != Game(('a', 0.2), ('b', 0.8))
+        assert game != Game(('b', 0.9), ('a', 0.1))
+
+    def test_pickle(self, game):
+        assert pickle.loads(pickle.dumps(game)) == game
+        assert b'a' in pickle.dumps(game)
+
     def test_iter(self, game):
         assert set(game) == {'a', 'b'}
 
@@ -1,6 +1,9 @@
+import numpy as np
 import pytest
 
-from nfl_survivor.greedy_picker import GreedyPicker
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.greedy_picker import GreedyPicker, LookaheadGreedyPicker, _RankedCandidates
+from nfl_survivor.picks import Picks
 from nfl_survivor.season import Season
 
 
@@ -63,3 +66,66 @@ class TestGreedyPicker:
         assert greedy_picker_with_previous.picks() == {1: 'a',
                                                        2: 'c',
                                                        3: 'b'}
+
+
+def test_ranked_candidates():
+    available = np.ones(4, dtype=bool)
+    candidates = _RankedCandidates(np.array([[0.2, np.nan, 0.8, 0.5],
+                                             [0.1, 0.9, 0.4, 0.6]]), available)
+
+    assert candidates.best(0, 4) == [2, 3, 0]
+    candidates.take(2)
+    assert candidates.best(0) == [3]
+    assert candidates.best(0, 2, excluded=1 << 3) == [0]
+    assert candidates.best(1, 4) == [1, 3, 0]
+    assert not available[2]
+
+
+@pytest.mark.usefixtures('season', 'picks', 'long_season', 'greedy_counterexample', 'infeasible_season')
+class TestLookaheadGreedyPicker:
+
+    def test_picks_beats_greedy(self, greedy_counterexample):
+        assert LookaheadGreedyPicker(greedy_counterexample).picks() == {1: 'Philadelphia Eagles',
+                                                                        2: 'NY Giants'}
+
+    def test_horizon_one(self, long_season):
+        assert LookaheadGreedyPicker(long_season, horizon=1, estimate_rest=False).picks() == \
+            GreedyPicker(long_season).picks()
+
+    def test_whole_season_horizon(self, long_season):
+        # with the window covering every week the search is exhaustive
+        short_season = Season(list(long_season.weeks)[:5])
+        picks = LookaheadGreedyPicker(short_season, horizon=5, estimate_rest=False).picks()
+
+        assert short_season.picks_win_probability(picks) == \
+            pytest.approx(short_season.picks_win_probability(AssignmentPicker(short_season).picks()))
+
+    def test_picks_closer_to_optimal(self, long_season):
+        picks = LookaheadGreedyPicker(long_season).picks()
+
+        assert len(set(picks.values())) == len(long_season.week_numbers)
+        assert long_season.picks_win_probability(GreedyPicker(long_season).picks()) < \
+            long_season.picks_win_probability(picks) <= \
+            long_season.picks_win_probability(AssignmentPicker(long_season).picks())
+
+    def test_picks_with_previous(self, season, picks):
+        assert LookaheadGreedyPicker(season, picks).picks() == {1: 'a',
+                                                                2: 'c',
+                                                                3: 'b'}
+
+    def test_picks_avoid_dead_end(self, infeasible_season):
+        # looking ahead avoids leaving no team for week 3 as the greedy picker does
+        assert LookaheadGreedyPicker(infeasible_season, horizon=2).picks() == {1: 'b',
+                                                                               2: 'a',
+                                                                               3: 'c'}
+
+        with pytest.raises(ValueError) as exception:
+            LookaheadGreedyPicker(infeasible_season, Picks({1: 'b', 2: 'c'})).picks()
+
+        assert 'week 3' in str(exception.value)
+
+    def test_invalid_horizon(self, season):
+        with pytest.raises(ValueError) as exception:
+            LookaheadGreedyPicker(season, horizon=0)
+
+        assert 'Horizon' in str(exception.value)
@@ -4,6 +4,8 @@ import pulp
 import pytest
 
 from nfl_survivor.lp_picker import LpPicker
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
 
 
 @pytest.fixture
@@ -95,3 +97,71 @@ class TestTestLpPicker:
         picks = lp_picker.picks()
 
         assert picks is None
+
+
+@pytest.fixture
+@pytest.mark.usefixtures('season')
+def persistent_lp_picker(season):
+    return LpPicker(season, persistent=True)
+
+
+@pytest.fixture
+def shifted_season():
+    # same structure as season fixture with e now favored over f in week 3
+    return Season.from_dict([{'week': {'number': 1,
+                                       'games': [{'game': [{'team': {'name': 'a', 'probability': 0.1}},
+                                                           {'team': {'name': 'b', 'probability': 0.9}}]}]}},
+                             {'week': {'number': 2,
+                                       'games': [{'game': [{'team': {'name': 'a', 'probability': 0.1}},
+                                                           {'team': {'name': 'b', 'probability': 0.9}}]},
+                                                 {'game': [{'team': {'name': 'c', 'probability': 0.2}},
+                                                           {'team': {'name': 'd', 'probability': 0.8}}]}]}},
+                             {'week': {'number': 3,
+                                       'games': [{'game': [{'team': {'name': 'a', 'probability': 0.1}},
+                                                           {'team': {'name': 'b', 'probability': 0.9}}]},
+                                                 {'game': [{'team': {'name': 'c', 'probability': 0.2}},
+                                                           {'team': {'name': 'd', 'probability': 0.8}}]},
+                                                 {'game': [{'team': {'name': 'e', 'probability': 0.75}},
+                                                           {'team': {'name': 'f', 'probability': 0.25}}]}]}}])
+
+
+@pytest.mark.usefixtures('persistent_lp_picker', 'picks', 'shifted_season')
+class TestPersistentLpPicker:
+
+    def test_add_constraints(self, persistent_lp_picker, linear_program, season):
+        persistent_lp_picker._add_constraints(linear_program)
+
+        # previous picks are variable bounds instead of constraints
+        assert len(linear_program.constraints) == len(tuple(season.weeks)) + len(season.teams)
+
+    def test_picks(self, persistent_lp_picker):
+        assert persistent_lp_picker.picks() == {1: 'b', 2: 'd', 3: 'f'}
+        assert set(persistent_lp_picker.timings) == {'build', 'solve'}
+
+    def test_update_previous_picks(self, persistent_lp_picker, picks):
+        persistent_lp_picker.picks()
+        linear_program = persistent_lp_picker._persistent_lp
+
+        persistent_lp_picker.update(previous_picks=picks)
+
+        assert persistent_lp_picker.picks() == {1: 'a', 2: 'c', 3: 'b'}
+        assert persistent_lp_picker._persistent_lp is linear_program
+
+        persistent_lp_picker.update(previous_picks=Picks())
+
+        assert persistent_lp_picker.picks() == {1: 'b', 2: 'd', 3: 'f'}
+
+    def test_update_season(self, persistent_lp_picker, shifted_season):
+        persistent_lp_picker.picks()
+        persistent_lp_picker.update(season=shifted_season)
+
+        assert persistent_lp_picker.picks() == {1: 'b', 2: 'd', 3: 'e'}
+
+    def test_update_invalid(self, persistent_lp_picker, lp_picker):
+        with pytest.raises(ValueError) as exception:
+            persistent_lp_picker.update(season=Season.from_yaml('./seasons/greedy_counterexample.yaml'))
+
+        assert 'different weeks' in str(exception.value)
+
+        with pytest.raises(ValueError):
+            lp_picker.update(previous_picks=Picks())
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from nfl_survivor.lp_picker import LpPicker
+from nfl_survivor.make_picks import make_picks
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+
+
+def test_make_picks_top_k(tmp_path):
+    output = str(tmp_path / 'top_picks.yaml')
+
+    result = CliRunner().invoke(make_picks, ['-s', './tests/test_data/test_season.yaml', '-k', '3', '-o', output])
+    assert result.exit_code == 0, result.output
+
+    with open(output, 'r') as output_file:
+        ranked = yaml.safe_load(output_file)
+
+    assert [entry['rank'] for entry in ranked] == [1, 2, 3]
+    assert ranked[0]['win_probability'] >= ranked[1]['win_probability'] >= ranked[2]['win_probability']
+    season = Season.from_yaml('./tests/test_data/test_season.yaml')
+    for entry in ranked:
+        picks = Picks.from_list(entry['picks'])
+        assert entry['win_probability'] == pytest.approx(season.picks_win_probability(picks))
+
+
+@pytest.mark.parametrize('arguments', [['-k', '3', '-n', '2'], ['-p', 'greedy', '-k', '3'],
+                                       ['-p', 'lp', '-n', '2'], ['-b', '.', '-k', '3']])
+def test_make_picks_conflicting_options(arguments):
+    result = CliRunner().invoke(make_picks, ['-s', './tests/test_data/test_season.yaml'] + arguments)
+
+    assert result.exit_code == 2 and 'cannot' in result.output.lower()
+
+
+def test_make_picks_entries(tmp_path):
+    output = str(tmp_path / 'portfolio.yaml')
+
+    result = CliRunner().invoke(make_picks, ['-s', './tests/test_data/test_season.yaml', '-n', '2', '-o', output])
+    assert result.exit_code == 0, result.output
+
+    with open(output, 'r') as output_file:
+        portfolio = yaml.safe_load(output_file)
+
+    assert [entry['entry'] for entry in portfolio['entries']] == [1, 2]
+    assert portfolio['expected_survivors'] == pytest.approx(sum(entry['win_probability']
+                                                                for entry in portfolio['entries']))
+    assert max(entry['win_probability'] for entry in portfolio['entries']) <= portfolio['joint_survival'] + 1e-12
+
+
+def test_make_picks_profile(tmp_path):
+    output_path, profile_path = tmp_path / 'picks.yaml', tmp_path / 'profile.json'
+    result = CliRunner().invoke(make_picks, ['-s', './seasons/2019_season.yaml', '-p', 'lp', '-o', str(output_path),
+                                             '--profile_output', str(profile_path)])
+
+    assert result.exit_code == 0
+    with open(profile_path, 'r') as profile_file:
+        report = json.load(profile_file)
+
+    assert list(report['phases'])[:2] == ['load_season', 'load_season/season_cache_read']
+    assert {'pick', 'pick/lp_build', 'pick/lp_solve', 'pick/lp_extract', 'write'} <= report['phases'].keys()
+    assert report['counters']['games_loaded'] == 256
+    assert report['counters']['lp_variables'] == 512
+    assert report['peak_traced_bytes'] > 0
+
+
+def test_make_picks_batch(tmp_path, long_season):
+    batch_dir = tmp_path / 'entries'
+    batch_dir.mkdir()
+    week_one = sorted(next(iter(long_season)).teams)[:4]
+    for team in week_one:
+        Picks({1: team}).to_yaml(str(batch_dir / f'{team}.yaml'))
+    Picks({1: 'nobody'}).to_yaml(str(batch_dir / 'bad.yaml'))
+
+    output_path = tmp_path / 'batch.yaml'
+    result = CliRunner().invoke(make_picks, ['-s', './seasons/2019_season.yaml', '-p', 'lp', '-b', str(batch_dir),
+                                             '-w', '2', '-o', str(output_path)])
+
+    assert result.exit_code == 0
+    with open(output_path, 'r') as output_file:
+        results = {entry_result['entry']: entry_result for entry_result in yaml.safe_load(output_file)}
+
+    assert sorted(results) == sorted(week_one + ['bad'])
+    assert 'error' in results['bad']
+    for team in week_one:
+        expected = LpPicker(long_season, Picks({1: team})).picks()
+        assert Picks.from_list(results[team]['picks']) == expected
+        assert results[team]['win_probability'] == pytest.approx(long_season.picks_win_probability(expected))
+
+    # manifest listing files in process gives the same results
+    manifest_path = batch_dir / 'manifest.yml'
+    with open(manifest_path, 'w') as manifest_file:
+        yaml.dump({team: f'{team}.yaml' for team in week_one}, manifest_file)
+    result = CliRunner().invoke(make_picks, ['-s', './seasons/2019_season.yaml', '-p', 'lp', '-b',
+                                             str(manifest_path), '-w', '1', '-o', str(output_path)])
+
+    assert result.exit_code == 0
+    with open(output_path, 'r') as output_file:
+        manifest_results = yaml.safe_load(output_file)
+    assert [entry_result['picks'] for entry_result in manifest_results] == [results[team]['picks']
+                                                                           for team in week_one]
@@ -0,0 +1,160 @@
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+
+import pytest
+
+from nfl_survivor.lp_picker import LpPicker
+from nfl_survivor.pick_server import PickServer, overridden_season, season_paths_from_dir
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+from nfl_survivor.utils import cached_property
+
+
+@pytest.fixture
+def pick_server():
+    server = PickServer(season_paths_from_dir('seasons'), max_workers=4)
+    yield server
+    server.close()
+
+
+async def _http(server, method, path, body=None):
+    """ Status and JSON body of responses to requests sent over one connection to running server """
+    reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+    content = json.dumps(body).encode() if body is not None else b''
+    writer.write(f'{method} {path} HTTP/1.1\r\nContent-Length: {len(content)}\r\nConnection: close\r\n\r\n'.encode()
+                 + content)
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
+
+
+class SlowCached:
+
+    calls = 0
+
+    @cached_property
+    def value(self):
+        SlowCached.calls += 1
+        time.sleep(0.05)
+        return object()
+
+
+class TestPickServer:
+
+    def test_overridden_season(self):
+        season = Season.from_yaml('seasons/2019_season.yaml')
+        week = next(iter(season))
+        game = week.games[0]
+        team, opponent = game.teams
+
+        overridden = overridden_season(season, [{'week': week.week_number, 'team': team, 'probability': 0.25}])
+
+        assert overridden.win_probability(week.week_number, team) == pytest.approx(0.25)
+        assert overridden.win_probability(week.week_number, opponent) == pytest.approx(0.75)
+        assert overridden_season(season, []) is season
+        with pytest.raises(ValueError):
+            overridden_season(season, [{'week': week.week_number, 'team': 'nobody', 'probability': 0.5}])
+
+    def test_solve(self, pick_server):
+        season = Season.from_yaml('seasons/2019_season.yaml')
+        response = pick_server.solve({'season': '2019_season', 'picker': 'lp'})
+        picks = LpPicker(season).picks()
+
+        assert response['picker'] == 'LpPicker'
+        assert response['picks'] == {str(week_number): team for week_number, team in picks.items()}
+        assert response['win_probability'] == pytest.approx(season.picks_win_probability(picks))
+
+        # persistent LP picker follows previous picks and overrides of later requests
+        week_number, team = 1, response['picks']['1']
+        overrides = [{'week': week_number, 'team': team, 'probability': 0.01}]
+        overridden = pick_server.solve({'season': '2019_season', 'picker': 'lp', 'overrides': overrides})
+        assert overridden['picks']['1'] != team
+
+        previous = pick_server.solve({'season': '2019_season', 'picker': 'lp', 'overrides': overrides,
+                                      'previous_picks': {'1': team}})
+        expected = LpPicker(overridden_season(season, overrides), Picks({1: team})).picks()
+        assert previous['picks'] == {str(week_number): team for week_number, team in expected.items()}
+
+        assert pick_server.solve({'season': '2019_season'})['picks'] == response['picks']
+        with pytest.raises(ValueError):
+            pick_server.solve({'season': 'missing'})
+
+    def test_solve_certain_override(self, pick_server):
+        season = Season.from_yaml('seasons/2019_season.yaml')
+        team, opponent = season.nth_week(2).games[0].teams
+
+        for picker_name in ('lp', 'auto'):
+            for team_probability in (1.0, 0.0):
+                overrides = [{'week': 2, 'team': team, 'probability': team_probability}]
+                response = pick_server.solve({'season': '2019_season', 'picker': picker_name, 'overrides': overrides})
+
+                assert response['picks']['2'] != (opponent if team_probability == 1.0 else team)
+                assert response['win_probability'] > 0
+
+    def test_concurrent_solves(self, pick_server):
+        requests = [{'season': season_id, 'picker': picker_name}
+                    for season_id in ('2018_season', '2019_season') for picker_name in ('lp', 'greedy')] * 4
+
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(pick_server.solve, requests))
+
+        for request, response in zip(requests, responses):
+            assert response == pick_server.solve(request)
+
+    def test_http(self, pick_server):
+        async def session():
+            server = await pick_server.start(port=0)
+            async with server:
+                picks = await asyncio.gather(*(_http(server, 'POST', '/picks', {'season': '2019_season',
+                                                                               'picker': 'greedy'})
+                                               for _ in range(5)))
+                bad = await _http(server, 'POST', '/picks', {'season': 'missing'})
+                wrong_method = await _http(server, 'GET', '/picks')
+                metrics = await _http(server, 'GET', '/metrics')
+            return picks, bad, wrong_method, metrics
+
+        picks, bad, wrong_method, metrics = asyncio.run(session())
+
+        assert all(status == 200 and response == picks[0][1] for status, response in picks)
+        assert bad[0] == 400 and 'No season' in bad[1]['error']
+        assert wrong_method[0] == 405
+        assert metrics[1]['seasons_loaded'] == ['2019_season']
+        assert metrics[1]['routes']['POST /picks']['requests'] == 6
+        assert metrics[1]['routes']['POST /picks']['errors'] == 1
+        assert metrics[1]['routes']['POST /picks']['p95_ms'] > 0
+
+    def test_cached_property_threads(self):
+        cached = SlowCached()
+        barrier = threading.Barrier(8)
+
+        def read():
+            barrier.wait()
+            return cached.value
+
+        with concurrent.futures.ThreadPoolExecutor(8) as executor:
+            values = list(executor.map(lambda _: read(), range(8)))
+
+        assert SlowCached.calls == 1
+        assert all(value is values[0] for value in values)
+
+    def test_cached_property_objects_in_parallel(self):
+        # both values can only finish computing if neither waits for the other's lock
+        barrier = threading.Barrier(2, timeout=5)
+
+        class Meeting:
+
+            @cached_property
+            def value(self):
+                barrier.wait()
+                return object()
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            values = list(executor.map(lambda obj: obj.value, [Meeting(), Meeting()]))
+
+        assert values[0] is not values[1]
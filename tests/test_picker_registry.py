@@ -0,0 +1,58 @@
+import importlib.metadata
+
+import pytest
+
+from benchmarks.import_time import ENTRY_MODULES, eagerly_imported
+from nfl_survivor import picker_registry
+from nfl_survivor.dp_picker import DpPicker
+from nfl_survivor.greedy_picker import GreedyPicker
+from nfl_survivor.lp_picker import LpPicker
+from nfl_survivor.picker_registry import ENTRY_POINT_GROUP, make_picker, picker_class, picker_names
+from nfl_survivor.picks import Picks
+
+
+@pytest.fixture
+def registered_picker(monkeypatch):
+    entry_point = importlib.metadata.EntryPoint(name='Plugin', value='nfl_survivor.greedy_picker:GreedyPicker',
+                                                group=ENTRY_POINT_GROUP)
+    monkeypatch.setattr(picker_registry, '_entry_points', lambda: {entry_point.name.lower(): entry_point})
+
+
+class TestPickerRegistry:
+
+    def test_picker_class(self):
+        assert picker_class('Greedy') is GreedyPicker
+
+        with pytest.raises(ValueError) as exception:
+            picker_class('fun')
+
+        assert 'No picker' in str(exception.value)
+
+    def test_picker_names(self):
+        assert picker_names()[:7] == ['assignment', 'dp', 'greedy', 'lookahead', 'lp', 'robust', 'survival']
+
+    @pytest.mark.usefixtures('registered_picker')
+    def test_entry_point(self):
+        assert 'plugin' in picker_names()
+        assert picker_class('plugin') is GreedyPicker
+
+    def test_make_picker(self, season):
+        assert isinstance(make_picker('Greedy', season), GreedyPicker)
+
+        with pytest.raises(ValueError) as exception:
+            make_picker('fun', season)
+
+        assert 'No picker' in str(exception.value)
+
+    def test_make_picker_auto(self, season, long_season):
+        assert isinstance(make_picker('auto', season), DpPicker)
+        assert isinstance(make_picker('auto', long_season), LpPicker)
+
+        late_season = Picks({week_number: team
+                             for week_number, team in GreedyPicker(long_season).picks().items()
+                             if week_number <= 12})
+        assert isinstance(make_picker('auto', long_season, late_season), DpPicker)
+
+    def test_lazy_imports(self):
+        for module_name in ENTRY_MODULES:
+            assert eagerly_imported(module_name) == []
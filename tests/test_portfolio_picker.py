@@ -0,0 +1,112 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from nfl_survivor.game import Game
+from nfl_survivor.picks import Picks
+from nfl_survivor.portfolio_picker import PortfolioPicker
+from nfl_survivor.season import Season
+from nfl_survivor.week import Week
+
+
+def brute_force_joint_survival(season, portfolio):
+    # enumerate every outcome of every game of the season
+    games = [(week.week_number, game) for week in season for game in week]
+    joint_survival = 0.0
+    for winners in itertools.product((0, 1), repeat=len(games)):
+        probability, winning = 1.0, set()
+        for (week_number, game), winner in zip(games, winners):
+            team = list(game)[winner]
+            probability *= game.win_probability(team)
+            winning.add((week_number, team))
+        if any(all((week_number, team) in winning for week_number, team in picks.items()) for picks in portfolio):
+            joint_survival += probability
+
+    return joint_survival
+
+
+@pytest.fixture
+def hedge_season():
+    return Season((Week(1, (Game(('a', 0.6), ('b', 0.4)), Game(('c', 0.55), ('d', 0.45)))),
+                   Week(2, (Game(('a', 0.7), ('c', 0.3)), Game(('b', 0.8), ('d', 0.2))))))
+
+
+@pytest.mark.usefixtures('season', 'hedge_season')
+class TestPortfolioPicker:
+
+    def test_scores_single_entry(self, season):
+        picks = Picks({1: 'b', 2: 'd', 3: 'f'})
+        scores = PortfolioPicker(season, 1).scores([picks])
+
+        assert scores.joint_survival == pytest.approx(season.picks_win_probability(picks))
+        assert scores.expected_survivors == pytest.approx(season.picks_win_probability(picks))
+
+    def test_scores_correlated_entries(self, season):
+        picks = Picks({1: 'b', 2: 'd', 3: 'f'})
+        same = PortfolioPicker(season, 2).scores([picks, picks])
+        assert same.joint_survival == pytest.approx(0.9 * 0.8 * 0.7)
+        assert same.expected_survivors == pytest.approx(2 * 0.9 * 0.8 * 0.7)
+
+        # exactly one of the entries survives week 1
+        hedged = PortfolioPicker(season, 2).scores([Picks({1: 'a', 2: 'd', 3: 'f'}), picks])
+        assert hedged.joint_survival == pytest.approx(0.8 * 0.7)
+
+    def test_scores_brute_force(self, season, hedge_season):
+        rng = np.random.default_rng(0)
+        for test_season in (season, hedge_season):
+            paths = [dict(zip(test_season.week_numbers, teams))
+                     for teams in itertools.product(*(sorted(week.teams) for week in test_season))
+                     if len(set(teams)) == len(teams)]
+            for n_entries in (1, 2, 3):
+                portfolio = [Picks(paths[index]) for index in rng.choice(len(paths), n_entries)]
+                assert PortfolioPicker(test_season, n_entries).scores(portfolio).joint_survival == \
+                    pytest.approx(brute_force_joint_survival(test_season, portfolio))
+
+    def test_scores_sampled(self, hedge_season):
+        portfolio = [Picks({1: 'a', 2: 'b'}), Picks({1: 'c', 2: 'a'}), Picks({1: 'b', 2: 'a'})]
+        picker = PortfolioPicker(hedge_season, 3, n_samples=200000, seed=0)
+        exact = picker.scores(portfolio).joint_survival
+
+        picker.EXACT_EVALUATION_MAX_ENTRIES = 0
+        assert picker.scores(portfolio).joint_survival == pytest.approx(exact, abs=0.01)
+
+    def test_scores_missing_pick(self, hedge_season):
+        # an entry without a pick in week 2 loses it, sampled as well as exact
+        portfolio = [Picks({1: 'd'}), Picks({1: 'c', 2: 'a'})]
+        picker = PortfolioPicker(hedge_season, 2, n_samples=200000, seed=0)
+        exact = picker.scores(portfolio).joint_survival
+        assert exact == pytest.approx(0.55 * 0.7)
+
+        picker.EXACT_EVALUATION_MAX_ENTRIES = 0
+        assert picker.scores(portfolio).joint_survival == pytest.approx(exact, abs=0.01)
+
+    def test_picks_exact(self, hedge_season):
+        picker = PortfolioPicker(hedge_season, 2)
+        portfolio = picker.picks()
+
+        candidates, _ = picker._candidates()
+        best = max(brute_force_joint_survival(hedge_season, pair)
+                   for pair in itertools.combinations_with_replacement(candidates, 2))
+
+        assert len(portfolio) == 2
+        assert picker.scores(portfolio).joint_survival == pytest.approx(best)
+        assert picker.scores(portfolio).joint_survival > max(hedge_season.picks_win_probability(picks)
+                                                             for picks in portfolio)
+
+    def test_picks_coordinate_ascent(self):
+        long_season = Season.from_yaml('./seasons/2019_season.yaml')
+        picker = PortfolioPicker(long_season, 5, pool_size=50, n_samples=5000, seed=0)
+        portfolio = picker.picks()
+
+        assert not picker.exact
+        assert len(portfolio) == 5
+        assert picker.scores(portfolio).joint_survival > picker.scores(portfolio[:1]).joint_survival
+
+    def test_picks_with_previous(self, season, picks):
+        for entry in PortfolioPicker(season, 2, picks).picks():
+            assert entry[1] == 'a' and entry[2] == 'c'
+
+    def test_invalid_entries(self, season):
+        with pytest.raises(ValueError):
+            PortfolioPicker(season, 0)
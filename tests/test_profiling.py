@@ -0,0 +1,69 @@
+import sys
+
+import pytest
+
+from nfl_survivor import profiling
+from nfl_survivor.season import Season
+from nfl_survivor.utils import cached_property
+
+
+class Cached:
+
+    @cached_property
+    def value(self):
+        return 1
+
+
+class TestProfiling:
+
+    def test_inactive(self):
+        assert not profiling.enabled()
+        with profiling.phase('phase'):
+            profiling.count('counter')
+
+        assert Cached().value == 1
+
+    def test_profile(self):
+        with profiling.profile(trace_memory=False) as profile:
+            assert profiling.enabled()
+            for _ in range(2):
+                with profiling.phase('outer'):
+                    with profiling.phase('inner'):
+                        profiling.count('counter', 3)
+
+            cached = Cached()
+            for _ in range(3):
+                assert cached.value == 1
+
+        report = profile.report()
+
+        assert not profiling.enabled()
+        assert list(report['phases']) == ['outer', 'outer/inner']
+        assert report['phases']['outer']['calls'] == 2
+        assert report['phases']['outer']['seconds'] >= report['phases']['outer/inner']['seconds']
+        assert report['counters'] == {'cached_property.Cached.value.hits': 2,
+                                      'cached_property.Cached.value.misses': 1,
+                                      'counter': 6}
+        assert report['seconds'] > 0 and report['peak_traced_bytes'] is None
+
+    def test_profile_memory(self):
+        with profiling.profile() as profile:
+            with profiling.phase('load_season'):
+                Season.from_yaml('./seasons/2019_season.yaml', cache=False)
+
+        assert profile.report()['peak_traced_bytes'] > 0
+        assert {'load_season/parse_yaml', 'load_season/build_season'} <= profile.report()['phases'].keys()
+
+    def test_profile_without_resource(self, monkeypatch):
+        # a None entry in sys.modules makes importing resource fail as it does on Windows
+        monkeypatch.setitem(sys.modules, 'resource', None)
+        with profiling.profile(trace_memory=False) as profile:
+            pass
+
+        assert profile.report()['max_rss_bytes'] is None
+
+    def test_nested_profile(self):
+        with profiling.profile(trace_memory=False):
+            with pytest.raises(ValueError):
+                with profiling.profile():
+                    pass
@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.picks import Picks
+from nfl_survivor.robust_picker import RobustPicker, beta_scenarios
+from nfl_survivor.simulation import opponent_columns
+
+
+@pytest.mark.usefixtures('season', 'picks', 'long_season')
+class TestRobustPicker:
+
+    def test_beta_scenarios(self, long_season):
+        matrix, opponents = long_season.probability_matrix, opponent_columns(long_season)
+        weeks, teams = np.nonzero(opponents >= 0)
+        scenarios = beta_scenarios(long_season, 1000, concentration=50, rng=np.random.default_rng(0))
+
+        assert scenarios.shape == (1000,) + matrix.shape
+        assert np.array_equal(np.isnan(scenarios[0]), np.isnan(matrix))
+        assert np.allclose(scenarios[:, weeks, teams] + scenarios[:, weeks, opponents[weeks, teams]], 1)
+        assert scenarios.mean(axis=0)[weeks, teams] == pytest.approx(matrix[weeks, teams], abs=0.02)
+
+    @pytest.mark.parametrize('objective', ['worst_case', 'cvar'])
+    def test_picks_brute_force(self, season, objective):
+        picker = RobustPicker(season, n_scenarios=30, concentration=5, objective=objective, alpha=0.2, seed=0)
+        picks = picker.picks()
+
+        index = 0 if objective == 'worst_case' else 1
+        best = max(picker.scores(Picks(zip(season.week_numbers, teams)))[index]
+                   for teams in itertools.permutations(season.team_names, len(season.week_numbers))
+                   if not np.isnan(season.probability_matrix[np.arange(len(teams)),
+                                                             [season.team_index[team] for team in teams]]).any())
+
+        assert picker.scores(picks)[index] == pytest.approx(best)
+
+    def test_picks_beat_most_probable(self, long_season):
+        picker = RobustPicker(long_season, n_scenarios=100, seed=0)
+        picks = picker.picks()
+
+        assert len(set(picks.values())) == len(long_season.week_numbers)
+        assert picker.scores(picks).cvar >= picker.scores(AssignmentPicker(long_season).picks()).cvar
+
+    def test_single_scenario(self, long_season):
+        picker = RobustPicker(long_season, scenarios=long_season.probability_matrix[None])
+
+        assert long_season.picks_win_probability(picker.picks()) == \
+            pytest.approx(long_season.picks_win_probability(AssignmentPicker(long_season).picks()))
+
+    def test_picks_with_previous(self, season, picks):
+        robust_picks = RobustPicker(season, picks, n_scenarios=20, seed=0).picks()
+
+        assert robust_picks == {1: 'a', 2: 'c', 3: 'b'}
+
+    def test_invalid(self, season):
+        with pytest.raises(ValueError) as exception:
+            RobustPicker(season, objective='mean')
+        assert 'No objective' in str(exception.value)
+
+        with pytest.raises(ValueError) as exception:
+            RobustPicker(season, scenarios=np.full((2, 1, 1), 0.5))
+        assert 'do not match' in str(exception.value)
+
+        with pytest.raises(ValueError):
+            RobustPicker(season, Picks({2: 'b', 3: 'a'}), n_scenarios=5).picks()
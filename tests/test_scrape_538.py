@@ -0,0 +1,170 @@
+import http.server
+import threading
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from tools.scrape_538 import ResponseCache, Scraper, pooled_session, scrape
+
+TEST_HTML_PATH = 'tests/test_data/test_538_games.html'
+TEST_SEASON_HTML_PATH = 'tests/test_data/test_538_season.html'
+
+TEST_SEASON_DICT = [{'week': {'number': 1,
+                              'games': [{'game': [{'team': {'name': 'Packers', 'probability': 0.35}},
+                                                  {'team': {'name': 'Bears', 'probability': 0.65}}]},
+                                        {'game': [{'team': {'name': 'Rams', 'probability': 0.6}},
+                                                  {'team': {'name': 'Panthers', 'probability': 0.4}}]}]}},
+                    {'week': {'number': 2,
+                              'games': [{'game': [{'team': {'name': 'Bears', 'probability': 0.52}},
+                                                  {'team': {'name': 'Broncos', 'probability': 0.48}}]}]}}]
+
+
+class _SeasonHandler(http.server.BaseHTTPRequestHandler):
+    # served page and statuses of requests handled so far, set per server
+    etag = '"538-games"'
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == self.etag:
+            self.server.statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.server.statuses.append(200)
+        body = self.server.html.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def season_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _SeasonHandler)
+    with open(TEST_HTML_PATH, 'r') as html_file:
+        server.html = html_file.read()
+    server.statuses = []
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def url_template(season_server):
+    return f'http://127.0.0.1:{season_server.server_port}/{{year}}/games/'
+
+
+def test_scraped_season_dict(url_template):
+    assert Scraper(url_template.format(year=2019)).scraped_season_dict() == TEST_SEASON_DICT
+
+
+def test_season_dicts_from_years(url_template, season_server):
+    year_to_season_dict = Scraper.season_dicts_from_years((2018, 2019, 2020), max_workers=2,
+                                                          url_template=url_template)
+    assert list(year_to_season_dict) == [2018, 2019, 2020]
+    assert all(season_dict == TEST_SEASON_DICT for season_dict in year_to_season_dict.values())
+    assert season_server.statuses == [200, 200, 200]
+
+
+def test_seasons_from_years(url_template):
+    year_to_season = Scraper.seasons_from_years((2019,), url_template=url_template)
+    assert year_to_season[2019].picks_win_probability({1: 'Bears', 2: 'Broncos'}) == pytest.approx(0.65 * 0.48)
+
+
+def test_response_cache_revalidates(url_template, season_server, tmp_path):
+    cache_dir = str(tmp_path / 'responses')
+    Scraper.season_dicts_from_years((2019,), cache_dir=cache_dir, url_template=url_template)
+
+    season_server.html = ''
+    year_to_season_dict = Scraper.season_dicts_from_years((2019,), cache_dir=cache_dir, url_template=url_template)
+    assert year_to_season_dict[2019] == TEST_SEASON_DICT
+    assert season_server.statuses == [200, 304]
+
+
+def test_response_cache(tmp_path):
+    response_cache = ResponseCache(str(tmp_path))
+    assert response_cache.get('http://a') is None
+
+    response_cache.put('http://a', 'text', etag='"e"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    entry = response_cache.get('http://a')
+    assert entry['text'] == 'text'
+    assert ResponseCache.conditional_headers(entry) == {'If-None-Match': '"e"',
+                                                        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert ResponseCache.conditional_headers(None) == {}
+
+
+def test_scrape_error():
+    with pytest.raises(ValueError):
+        Scraper('http://127.0.0.1:1/', session=pooled_session(retries=0), timeout=1).scraped_season_dict()
+
+
+def test_scrape_command(url_template, tmp_path, monkeypatch):
+    monkeypatch.setattr(Scraper, '_SEASON_URL', url_template)
+    output = str(tmp_path / 'season_{year}.yaml')
+
+    result = CliRunner().invoke(scrape, ['-y', '2018', '-y', '2019', '-o', output])
+    assert result.exit_code == 0, result.output
+    for year in (2018, 2019):
+        with open(output.format(year=year), 'r') as yaml_file:
+            assert yaml.safe_load(yaml_file) == TEST_SEASON_DICT
+
+
+def test_scrape_command_requires_year_placeholder(tmp_path):
+    result = CliRunner().invoke(scrape, ['-y', '2018', '-y', '2019', '-o', str(tmp_path / 'season.yaml')])
+    assert result.exit_code != 0
+
+
+@pytest.mark.parametrize('html_path', (TEST_HTML_PATH, TEST_SEASON_HTML_PATH))
+def test_parse_season_html_paths_agree(html_path):
+    with open(html_path, 'r') as html_file:
+        html = html_file.read()
+
+    assert Scraper.parse_season_html(html, fast_parse=True) == Scraper.parse_season_html(html, fast_parse=False)
+
+
+def test_parse_season_html():
+    # saved page was rendered from the 2019 season
+    with open(TEST_SEASON_HTML_PATH, 'r') as html_file:
+        season_dict = Scraper.parse_season_html(html_file.read())
+    with open('seasons/2019_season.yaml', 'r') as yaml_file:
+        assert season_dict == yaml.safe_load(yaml_file)
+
+
+@pytest.mark.parametrize('fast_parse', (True, False))
+def test_scraped_season_dict_parse_modes(url_template, fast_parse):
+    scraper = Scraper(url_template.format(year=2019), fast_parse=fast_parse)
+    assert scraper.scraped_season_dict() == TEST_SEASON_DICT
+
+
+def test_scrape_command_update(url_template, tmp_path, monkeypatch):
+    monkeypatch.setattr(Scraper, '_SEASON_URL', url_template)
+    output = str(tmp_path / 'season.yaml')
+
+    assert CliRunner().invoke(scrape, ['-y', '2019', '-o', output]).exit_code == 0
+    with open(output, 'r') as yaml_file:
+        before = yaml_file.read()
+
+    result = CliRunner().invoke(scrape, ['-y', '2019', '-o', output, '-u'])
+    assert result.exit_code == 0, result.output
+    assert '2 weeks unchanged' in result.output
+    with open(output, 'r') as yaml_file:
+        assert yaml_file.read() == before
+
+
+def test_scrape_command_update_requires_output():
+    assert CliRunner().invoke(scrape, ['-y', '2019', '-u']).exit_code != 0
+
+
+def test_scrape_command_requires_year(tmp_path):
+    result = CliRunner().invoke(scrape, ['-o', str(tmp_path / 'season.yaml')])
+
+    assert result.exit_code == 2 and '--year' in result.output
@@ -1,6 +1,10 @@
+import pickle
+
+import numpy as np
 import pytest
 
 from nfl_survivor.season import Season
+from nfl_survivor.week import Week
 
 
 @pytest.fixture
@@ -21,6 +25,12 @@ class TestSeason:
                                                2: week_two,
                                                3: week_three}
 
+    def test_pickle(self, season):
+        unpickled = pickle.loads(pickle.dumps(season))
+
+        assert unpickled.week_numbers == season.week_numbers
+        np.testing.assert_array_equal(unpickled.probability_matrix, season.probability_matrix)
+
     def test_iter(self, season, weeks):
         assert tuple(season) == weeks
 
@@ -74,12 +84,102 @@ class TestSeason:
 
         assert season.team_weeks('g') == []
 
+    def test_index_maps(self, season):
+        assert season.week_numbers == (1, 2, 3)
+        assert season.team_names == ('a', 'b', 'c', 'd', 'e', 'f')
+        assert season.week_index == {1: 0, 2: 1, 3: 2}
+        assert season.team_index == {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5}
+
+    def test_probability_matrix(self, season):
+        matrix = season.probability_matrix
+
+        np.testing.assert_array_equal(matrix, [[0.1, 0.9, np.nan, np.nan, np.nan, np.nan],
+                                               [0.1, 0.9, 0.2, 0.8, np.nan, np.nan],
+                                               [0.1, 0.9, 0.2, 0.8, 0.3, 0.7]])
+        assert not matrix.flags.writeable
+
+    def test_win_probability(self, season):
+        assert season.win_probability(3, 'f') == 0.7
+
+        with pytest.raises(ValueError) as exception:
+            season.win_probability(1, 'c')
+
+        exception_msg = str(exception.value)
+        assert 'c' in exception_msg and 'not playing' in exception_msg
+
+        with pytest.raises(ValueError):
+            season.win_probability(1, 'g')
+
+        with pytest.raises(ValueError):
+            season.win_probability(4, 'a')
+
     def test_picks_win_probability(self, season):
         picks = {1: 'b',
                  2: 'd',
                  3: 'f'}
 
-        assert season.picks_win_probability(picks) == 0.9 * 0.8 * 0.7
+        assert season.picks_win_probability(picks) == pytest.approx(0.9 * 0.8 * 0.7)
+
+    def test_picks_expected_survival(self, season):
+        picks = {3: 'f',
+                 1: 'b',
+                 2: 'd'}
+
+        assert season.picks_expected_survival(picks) == pytest.approx(0.9 + 0.9 * 0.8 + 0.9 * 0.8 * 0.7)
+
+    def test_picks_team_ids(self, season, picks):
+        np.testing.assert_array_equal(season.picks_team_ids(picks), [0, 2, -1])
+
+        with pytest.raises(ValueError):
+            season.picks_team_ids({1: 'g'})
+
+    def test_batch_picks_scores(self, season):
+        team_ids = np.array([[1, 3, 5],
+                             [0, 2, 4],
+                             [1, 4, 5],
+                             [1, -1, 5]])
+
+        scores = season.batch_picks_scores(team_ids, chunk_size=3, survival=True)
+
+        np.testing.assert_allclose(scores.win_probability, [0.9 * 0.8 * 0.7, 0.1 * 0.2 * 0.3, 0, 0])
+        np.testing.assert_allclose(scores.expected_survival[:2],
+                                   [season.picks_expected_survival({1: 'b', 2: 'd', 3: 'f'}),
+                                    season.picks_expected_survival({1: 'a', 2: 'c', 3: 'e'})])
+        np.testing.assert_allclose(scores.survival[2], [0.9, 0, 0])
+        np.testing.assert_allclose(scores.expected_survival[3], 0.9)
+
+        assert season.batch_picks_scores(team_ids).survival is None
+
+        with pytest.raises(ValueError):
+            season.batch_picks_scores(np.array([[6, 0, 0]]))
+
+        with pytest.raises(ValueError):
+            season.batch_picks_scores(np.zeros((1, 4), dtype=int))
+
+        with pytest.raises(ValueError):
+            season.batch_picks_scores(team_ids[:, :2])
+
+    def test_to_from_columns(self, season):
+        columns = season.to_columns()
+
+        assert list(columns['teams']) == list(season.team_names)
+        np.testing.assert_array_equal(columns['week'], [1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 3, 3])
+        np.testing.assert_array_equal(columns['team'][:2], columns['opponent'][1::-1])
+
+        round_trip = Season.from_columns(**columns)
+
+        assert round_trip.week_numbers == season.week_numbers
+        assert [[tuple(game.teams) for game in week] for week in round_trip] == \
+            [[tuple(game.teams) for game in week] for week in season]
+        np.testing.assert_array_equal(round_trip.probability_matrix, season.probability_matrix)
+
+        with pytest.raises(ValueError):
+            Season.from_columns(columns['teams'], columns['week'], columns['team'],
+                                columns['team'], columns['probability'])
+
+        # weeks without games have no rows
+        with_empty_week = Season(list(season) + [Week(4, ())])
+        assert Season.from_columns(**with_empty_week.to_columns()).week_numbers == season.week_numbers
 
     def test_from_dict(self):
         season = Season.from_dict([{'week': {'number': 1,
@@ -96,3 +196,11 @@ class TestSeason:
 
         assert len(tuple(season.weeks)) == 3
         assert season.teams == {'a', 'b', 'c', 'd', 'e', 'f'}
+
+
+@pytest.mark.usefixtures('season')
+def test_season_to_dict(season):
+    assert Season.from_dict(season.to_dict()).to_dict() == season.to_dict()
+    assert season.to_dict()[0] == {'week': {'number': 1,
+                                            'games': [{'game': [{'team': {'name': 'a', 'probability': 0.1}},
+                                                                {'team': {'name': 'b', 'probability': 0.9}}]}]}}
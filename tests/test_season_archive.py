@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from nfl_survivor.season import Season
+from nfl_survivor.season_archive import SeasonArchive
+
+
+@pytest.fixture
+def counterexample():
+    return Season.from_yaml('./seasons/greedy_counterexample.yaml')
+
+
+@pytest.fixture
+def archive(tmp_path, season, counterexample):
+    return SeasonArchive.write(str(tmp_path / 'seasons.nfla'), (('test', season),
+                                                                ('counterexample', counterexample)))
+
+
+@pytest.mark.usefixtures('archive', 'season', 'counterexample')
+class TestSeasonArchive:
+
+    def test_keys(self, archive):
+        assert archive.keys() == ('test', 'counterexample')
+        assert len(archive) == 2
+        assert 'test' in archive and 'other' not in archive
+
+    def test_teams(self, archive):
+        assert list(archive.teams) == ['a', 'b', 'c', 'd', 'e', 'f', 'Dallas Cowboys',
+                                       'NY Giants', 'NY Jets', 'Philadelphia Eagles']
+
+    def test_column(self, archive):
+        week = archive.column('week')
+
+        assert isinstance(week, np.memmap)
+        assert len(week) == 2 * (1 + 2 + 3) + 2 * (2 + 2)
+
+    def test_getitem(self, archive, season, counterexample):
+        for key, expected in (('test', season), ('counterexample', counterexample)):
+            loaded = archive[key]
+
+            assert loaded.team_names == expected.team_names
+            np.testing.assert_array_equal(loaded.probability_matrix, expected.probability_matrix)
+
+        with pytest.raises(KeyError):
+            archive['other']
+
+    def test_reopen(self, archive, season):
+        reopened = SeasonArchive(archive.archive_path)
+
+        np.testing.assert_array_equal(reopened['test'].probability_matrix, season.probability_matrix)
+
+    def test_not_archive(self):
+        with pytest.raises(ValueError) as exception:
+            SeasonArchive('./tests/test_data/test_season.yaml')
+
+        assert 'not a season archive' in str(exception.value)
+
+    def test_duplicate_key(self, tmp_path, season):
+        with pytest.raises(ValueError):
+            SeasonArchive.write(str(tmp_path / 'duplicate.nfla'), (('test', season), ('test', season)))
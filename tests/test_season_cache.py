@@ -0,0 +1,67 @@
+import os
+import shutil
+
+import mock
+import numpy as np
+import pytest
+
+from nfl_survivor.season import Season
+from nfl_survivor.season_cache import CACHE_DIR_VARIABLE, SeasonCache
+
+
+@pytest.fixture
+def season_path(tmp_path):
+    path = tmp_path / 'season.yaml'
+    shutil.copy('./tests/test_data/test_season.yaml', path)
+    return str(path)
+
+
+@pytest.mark.usefixtures('season_path', 'season_cache_dir')
+class TestSeasonCache:
+
+    def test_default(self, season_cache_dir, monkeypatch):
+        assert SeasonCache.default().cache_dir == str(season_cache_dir)
+
+        monkeypatch.setenv(CACHE_DIR_VARIABLE, '')
+
+        assert SeasonCache.default() is None
+
+    def test_get_put(self, season_path, season_cache_dir):
+        season_cache = SeasonCache(str(season_cache_dir))
+
+        columns, content, key = season_cache.get(season_path)
+
+        assert columns is None
+        assert key.size == len(content)
+
+        season = Season.from_yaml(season_path, cache=False)
+        season_cache.put(season_path, key, season.to_columns())
+        columns, _, _ = season_cache.get(season_path)
+
+        np.testing.assert_array_equal(columns['probability'], season.to_columns()['probability'])
+
+    def test_from_yaml_cached(self, season_path, season_cache_dir):
+        season = Season.from_yaml(season_path)
+
+        assert len(os.listdir(season_cache_dir)) == 1
+
+        with mock.patch('yaml.load') as yaml_load:
+            cached_season = Season.from_yaml(season_path)
+
+        assert yaml_load.call_count == 0
+        np.testing.assert_array_equal(cached_season.probability_matrix, season.probability_matrix)
+
+    def test_from_yaml_changed(self, season_path):
+        Season.from_yaml(season_path)
+
+        with open(season_path) as season_file:
+            content = season_file.read()
+        with open(season_path, 'w') as season_file:
+            season_file.write(content.replace('0.7', '0.6').replace('0.3', '0.4'))
+
+        assert Season.from_yaml(season_path).win_probability(3, 'f') == 0.6
+
+    def test_from_yaml_unwritable(self, season_path, monkeypatch):
+        monkeypatch.setenv(CACHE_DIR_VARIABLE, os.path.join(season_path, 'not_a_directory'))
+
+        assert Season.from_yaml(season_path).week_numbers == (1, 2, 3)
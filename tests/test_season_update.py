@@ -0,0 +1,119 @@
+import copy
+
+import pytest
+import yaml
+
+from nfl_survivor.utils import write_yaml
+from tools.season_update import (WeekDiff, update_report, update_season_yaml, week_diff, week_hash,
+                                 _week_blocks)
+
+
+@pytest.fixture
+def season_dict():
+    with open('seasons/2019_season.yaml', 'r') as yaml_file:
+        return yaml.safe_load(yaml_file)
+
+
+@pytest.fixture
+def season_path(tmp_path, season_dict):
+    season_path = str(tmp_path / 'season.yaml')
+    write_yaml(season_dict, season_path)
+    return season_path
+
+
+def _read(path):
+    with open(path, 'r') as season_file:
+        return season_file.read()
+
+
+def test_week_hash(season_dict):
+    week_dict = season_dict[0]['week']
+    assert week_hash(week_dict) == week_hash(copy.deepcopy(week_dict))
+    assert week_hash(week_dict) != week_hash(season_dict[1]['week'])
+
+
+def test_week_blocks(season_path, season_dict):
+    blocks = _week_blocks(_read(season_path))
+    assert len(blocks) == len(season_dict)
+    assert ''.join(blocks) == _read(season_path)
+    assert all(block.startswith('- week:') for block in blocks)
+
+
+def test_week_blocks_invalid():
+    with pytest.raises(ValueError):
+        _week_blocks('teams: []\n- week:\n')
+
+
+def test_week_diff(season_dict):
+    old_week_dict = season_dict[0]['week']
+    new_week_dict = copy.deepcopy(old_week_dict)
+    first_game = new_week_dict['games'][0]['game']
+    first_game[0]['team']['probability'], first_game[1]['team']['probability'] = 0.5, 0.5
+    removed_game = new_week_dict['games'].pop()
+
+    old_teams = [team['team'] for team in old_week_dict['games'][0]['game']]
+    diff = week_diff(old_week_dict, new_week_dict)
+    assert diff == WeekDiff(old_week_dict['number'], [],
+                            [tuple(sorted(team['team']['name'] for team in removed_game['game']))],
+                            sorted((team['name'], team['probability'], 0.5) for team in old_teams))
+
+
+def test_update_season_yaml_unchanged(season_path, season_dict):
+    before = _read(season_path)
+
+    season_update = update_season_yaml(season_path, season_dict)
+    assert _read(season_path) == before
+    assert season_update.unchanged_weeks == [week['week']['number'] for week in season_dict]
+    assert not season_update.changed_weeks and not season_update.added_weeks and not season_update.removed_weeks
+
+
+def test_update_season_yaml_rewrites_changed_weeks_only(season_path, season_dict):
+    old_blocks = _week_blocks(_read(season_path))
+
+    new_season_dict = copy.deepcopy(season_dict)
+    new_season_dict[3]['week']['games'][0]['game'][0]['team']['probability'] = 0.99
+    added_week = copy.deepcopy(new_season_dict[0])
+    added_week['week']['number'] = 18
+    new_season_dict.append(added_week)
+
+    season_update = update_season_yaml(season_path, new_season_dict)
+    new_blocks = _week_blocks(_read(season_path))
+
+    assert [week_update.week_number for week_update in season_update.changed_weeks] == \
+        [season_dict[3]['week']['number']]
+    assert season_update.added_weeks == [18]
+    assert new_blocks[:3] == old_blocks[:3] and new_blocks[4:-1] == old_blocks[4:]
+    assert new_blocks[3] != old_blocks[3]
+    with open(season_path, 'r') as yaml_file:
+        assert yaml.safe_load(yaml_file) == new_season_dict
+
+
+def test_update_season_yaml_new_file(tmp_path, season_dict):
+    season_path = str(tmp_path / 'new_season.yaml')
+
+    season_update = update_season_yaml(season_path, season_dict)
+    assert len(season_update.added_weeks) == len(season_dict)
+
+    full_path = str(tmp_path / 'full_season.yaml')
+    write_yaml(season_dict, full_path)
+    assert _read(season_path) == _read(full_path)
+
+
+def test_update_season_yaml_removed_week(season_path, season_dict):
+    season_update = update_season_yaml(season_path, season_dict[1:])
+    assert season_update.removed_weeks == [season_dict[0]['week']['number']]
+    assert len(_week_blocks(_read(season_path))) == len(season_dict) - 1
+
+
+def test_update_report(season_path, season_dict):
+    new_season_dict = copy.deepcopy(season_dict)
+    season_dict[0]['week']['games'][0]['game'] = [{'team': {'name': 'a', 'probability': 0.15}},
+                                                  {'team': {'name': 'b', 'probability': 0.85}}]
+    write_yaml(season_dict, season_path)
+    new_season_dict = copy.deepcopy(season_dict)
+    first_game = new_season_dict[0]['week']['games'][0]['game']
+    first_game[0]['team']['probability'], first_game[1]['team']['probability'] = 0.2, 0.8
+
+    report = update_report(update_season_yaml(season_path, new_season_dict))
+    assert report.splitlines() == [f'week {season_dict[0]["week"]["number"]}: a 0.15 -> 0.2, b 0.85 -> 0.8',
+                                   f'{len(season_dict) - 1} weeks unchanged']
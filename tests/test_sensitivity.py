@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from nfl_survivor.assignment import batch_min_cost_assignment, min_cost_assignment
+from nfl_survivor.assignment_picker import AssignmentPicker
+from nfl_survivor.greedy_picker import GreedyPicker
+from nfl_survivor.picks import Picks
+from nfl_survivor.sensitivity import SensitivityAnalysis, improvable, perturbed_matrices, report_dict, sensitivity
+from nfl_survivor.simulation import opponent_columns
+
+
+@pytest.mark.usefixtures('long_season')
+class TestSensitivity:
+
+    def test_perturbed_matrices(self, long_season):
+        matrix, opponents = long_season.probability_matrix, opponent_columns(long_season)
+        weeks, teams = np.nonzero(opponents >= 0)
+
+        for kwargs in ({'noise': 0.3}, {'team_shift': 0.3}, {'shrinkage': 0.3}):
+            matrices = perturbed_matrices(matrix, opponents, 50, np.random.default_rng(0), **kwargs)
+
+            assert matrices.shape == (50,) + matrix.shape
+            assert np.array_equal(np.isnan(matrices[0]), np.isnan(matrix))
+            # both teams of every game still sum to one
+            assert matrices[:, weeks, teams] + matrices[:, weeks, opponents[weeks, teams]] == \
+                pytest.approx(np.ones((50, len(weeks))))
+            assert not np.allclose(np.nan_to_num(matrices[0]), np.nan_to_num(matrix))
+
+        unperturbed = perturbed_matrices(matrix, opponents, 2, np.random.default_rng(0))
+        assert np.allclose(unperturbed, matrix, equal_nan=True)
+
+    @pytest.mark.parametrize('noise', [0.01, 0.2])
+    def test_run(self, long_season, noise):
+        previous_picks = Picks((week_number, team) for week_number, team in GreedyPicker(long_season).picks().items()
+                               if week_number <= 12)
+        analysis = SensitivityAnalysis(long_season, previous_picks)
+        report = analysis.run(500, noise=noise, seed=0, chunk_size=128)
+
+        # solving every perturbation gives the same frequencies as skipping the ones proven unchanged
+        cost, week_numbers, teams = AssignmentPicker(long_season, previous_picks).cost_matrix()
+        rows = [long_season.week_index[week_number] for week_number in week_numbers]
+        columns = [long_season.team_index[team] for team in teams]
+        rng = np.random.default_rng(0)
+        counts = {}
+        for start in range(0, 500, 128):
+            matrices = perturbed_matrices(long_season.probability_matrix, opponent_columns(long_season),
+                                          min(128, 500 - start), rng, noise)[:, rows][:, :, columns]
+            for matrix in matrices:
+                perturbed_cost = -np.log(np.clip(matrix, np.finfo(float).tiny, None))
+                perturbed_cost[~np.isfinite(cost)] = np.inf
+                for row, column in enumerate(min_cost_assignment(perturbed_cost)):
+                    counts[week_numbers[row], teams[column]] = counts.get((week_numbers[row], teams[column]), 0) + 1
+
+        assert report.pick_frequencies == pytest.approx({pick: count / 500 for pick, count in counts.items()})
+        assert report.baseline_picks == AssignmentPicker(long_season, previous_picks).picks()
+        assert 0 < report.baseline_frequency <= 1
+        assert 0 < report.skipped_fraction <= report.baseline_frequency
+
+    def test_improvable(self):
+        rng = np.random.default_rng(0)
+        costs = rng.exponential(1.0, (500, 5, 7))
+        costs[rng.random(costs.shape) < 0.2] = np.inf
+        costs[:, np.arange(5), np.arange(5)] = rng.exponential(1.0, (500, 5))
+        assignment = np.arange(5)
+
+        optimal = batch_min_cost_assignment(costs)
+        optimal_costs = np.take_along_axis(costs, optimal[:, :, None], axis=2)[:, :, 0].sum(axis=1)
+        assignment_costs = costs[:, np.arange(5), assignment].sum(axis=1)
+
+        assert np.array_equal(improvable(costs, assignment), optimal_costs < assignment_costs - 1e-9)
+        assert 0 < improvable(costs, assignment).mean() < 1
+
+    def test_run_skips_unchanged(self, long_season):
+        # almost every small perturbation of a full season keeps the best picks and none of those are solved
+        report = SensitivityAnalysis(long_season).run(1000, noise=0.001, seed=0)
+
+        assert report.baseline_frequency > 0.95
+        assert report.skipped_fraction == report.baseline_frequency
+
+    def test_report(self, long_season, tmp_path):
+        report = report_dict(SensitivityAnalysis(long_season).run(100, team_shift=0.2, seed=0))
+
+        assert report['samples'] == 100
+        assert [week['week']['number'] for week in report['weeks']] == list(long_season.week_numbers)
+        for week in report['weeks']:
+            frequencies = [pick['frequency'] for pick in week['week']['picks']]
+            assert sum(frequencies) == pytest.approx(1.0)
+            assert frequencies == sorted(frequencies, reverse=True)
+
+        output_path = tmp_path / 'sensitivity.yaml'
+        result = CliRunner().invoke(sensitivity, ['-s', './seasons/2019_season.yaml', '-n', '100', '--team_shift',
+                                                  '0.2', '--seed', '0', '-o', str(output_path)])
+        assert result.exit_code == 0
+        with open(output_path, 'r') as output_file:
+            assert yaml.safe_load(output_file) == report
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from nfl_survivor.game import Game
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+from nfl_survivor.simulation import PoolSimulation, _popularity_picks, opponent_columns, sample_wins
+from nfl_survivor.week import Week
+
+
+@pytest.fixture
+def bye_season():
+    return Season((Week(1, (Game(('a', 0.6), ('b', 0.4)), Game(('c', 0.55), ('d', 0.45)))),
+                   Week(2, (Game(('a', 0.7), ('c', 0.3)),))))
+
+
+@pytest.mark.usefixtures('season', 'bye_season')
+class TestSimulation:
+
+    def test_opponent_columns(self, bye_season):
+        # columns are a, b, c, d
+        assert opponent_columns(bye_season).tolist() == [[1, 0, 3, 2], [2, -1, 0, -1]]
+
+    def test_sample_wins(self, bye_season):
+        wins = sample_wins(bye_season, 100000, np.random.default_rng(0))
+
+        # exactly one team of every game wins and byes never win
+        assert (wins[:, 0, 0] != wins[:, 0, 1]).all() and (wins[:, 0, 2] != wins[:, 0, 3]).all()
+        assert (wins[:, 1, 0] != wins[:, 1, 2]).all() and not wins[:, 1, [1, 3]].any()
+        assert wins[:, 0, 0].mean() == pytest.approx(0.6, abs=0.01)
+        assert wins[:, 1, 2].mean() == pytest.approx(0.3, abs=0.01)
+
+    def test_popularity_picks(self):
+        rng = np.random.default_rng(0)
+        weights = np.array([1.0, 2.0, 0.0, 1.0])
+        used = np.zeros((100000, 4), dtype=bool)
+        used[:, 1] = True
+        used[-1] = [True, True, False, True]
+
+        picks = _popularity_picks(rng, weights, used)
+
+        assert picks[-1] == -1
+        assert set(picks[:-1]) == {0, 3}
+        assert (picks[:-1] == 0).mean() == pytest.approx(0.5, abs=0.01)
+
+    def test_no_opponents(self, season):
+        picks = Picks({1: 'b', 2: 'd', 3: 'f'})
+        equity = PoolSimulation(season, n_opponents=0, seed=0).equity(picks, 100000)
+
+        # alone in the pool we always take the whole pot
+        assert equity.expected_share == 1.0
+        assert equity.win_probability == pytest.approx(0.9 * 0.8 * 0.7, abs=0.01)
+
+    def test_greedy_opponents(self, season):
+        # greedy opponents pick b, d and f so our identical picks always split evenly
+        equity = PoolSimulation(season, n_opponents=9, strategy='greedy', seed=0).equity(
+            Picks({1: 'b', 2: 'd', 3: 'f'}), 1000)
+
+        assert equity.expected_share == pytest.approx(0.1)
+
+        # picking against them in week 1 takes the whole pot whenever a beats b and nothing otherwise
+        contrarian = PoolSimulation(season, n_opponents=9, strategy='greedy', seed=0).equity(
+            Picks({1: 'a', 2: 'd', 3: 'f'}), 100000)
+
+        assert contrarian.expected_share == pytest.approx(0.1, abs=0.005)
+
+    def test_reproducible(self, season):
+        candidates = [Picks({1: 'b', 2: 'd', 3: 'f'}), Picks({1: 'a', 2: 'b', 3: 'f'})]
+
+        serial = PoolSimulation(season, n_opponents=50, seed=3, chunk_size=64,
+                                max_workers=1).equities(candidates, 500)
+        parallel = PoolSimulation(season, n_opponents=50, seed=3, chunk_size=64,
+                                  max_workers=2).equities(candidates, 500)
+
+        assert serial == parallel
+        assert serial != PoolSimulation(season, n_opponents=50, seed=4, chunk_size=64).equities(candidates, 500)
+
+    def test_invalid_strategy(self, season):
+        with pytest.raises(ValueError):
+            PoolSimulation(season, strategy='random')
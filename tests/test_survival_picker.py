@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from nfl_survivor.dp_picker import DpPicker
+from nfl_survivor.picks import Picks
+from nfl_survivor.season import Season
+from nfl_survivor.survival_picker import SurvivalPicker
+from nfl_survivor.synthetic import synthetic_season
+
+
+def brute_force_expected_survival(season):
+    matrix = season.probability_matrix
+    n_weeks, n_teams = matrix.shape
+
+    return max(np.cumprod(matrix[np.arange(n_weeks), columns]).sum()
+               for columns in itertools.permutations(range(n_teams), n_weeks)
+               if not np.isnan(matrix[np.arange(n_weeks), columns]).any())
+
+
+@pytest.mark.usefixtures('season', 'picks', 'survival_season')
+class TestSurvivalPicker:
+
+    def test_picks(self, season):
+        picks = SurvivalPicker(season).picks()
+
+        assert picks == {1: 'b', 2: 'd', 3: 'f'}
+        assert season.picks_expected_survival(picks) == pytest.approx(brute_force_expected_survival(season))
+
+    def test_picks_maximize_survival(self, survival_season):
+        picks = SurvivalPicker(survival_season).picks()
+
+        assert picks == {1: 'a', 2: 'b'}
+        assert (survival_season.picks_expected_survival(picks) ==
+                pytest.approx(brute_force_expected_survival(survival_season)))
+
+    def test_picks_with_previous(self, season, picks):
+        assert SurvivalPicker(season, picks).picks() == {1: 'a',
+                                                         2: 'c',
+                                                         3: 'b'}
+
+    def test_picks_infeasible(self, season):
+        with pytest.raises(ValueError) as exception:
+            SurvivalPicker(season, Picks({2: 'b', 3: 'a'})).picks()
+
+        assert 'Cannot solve' in str(exception.value)
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_picks_random_seasons(self, seed):
+        # revisiting states with lower thresholds once pruned optimal picks, so compare with an exhaustive search
+        n_compared = 0
+        for index in range(300):
+            season = synthetic_season(n_teams=7 + index % 2, n_weeks=6 + index % 3, bye_rate=0.2,
+                                      distribution='uniform', seed=1000 * seed + index)
+            try:
+                picks = SurvivalPicker(season).picks()
+            except ValueError:
+                continue
+
+            dp_picks = DpPicker(season, objective='survival').picks()
+            assert len(set(picks.values())) == len(season.week_numbers)
+            assert season.picks_expected_survival(picks) == pytest.approx(season.picks_expected_survival(dp_picks))
+            n_compared += 1
+
+        assert n_compared > 200
+
+    def test_picks_shipped_seasons(self):
+        season = Season.from_yaml('./seasons/2019_season.yaml')
+
+        picks = SurvivalPicker(season).picks()
+
+        assert len(set(picks.values())) == len(season.week_numbers)
+        assert season.picks_expected_survival(picks) == pytest.approx(4.18165533921692)
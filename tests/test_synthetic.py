@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from nfl_survivor.season import Season
+from nfl_survivor.season_archive import SeasonArchive
+from nfl_survivor.synthetic import DISTRIBUTIONS, synthetic_season, synthetic_weeks, team_names, write_weeks_yaml
+from nfl_survivor.utils import write_yaml
+from tools.generate_season import generate_season
+
+
+def test_team_names():
+    assert team_names(3) == ['team_0', 'team_1', 'team_2']
+    assert team_names(11)[0] == 'team_00'
+
+
+@pytest.mark.parametrize('distribution', sorted(DISTRIBUTIONS))
+def test_synthetic_season(distribution):
+    season = synthetic_season(10, 4, distribution=distribution, seed=0)
+
+    assert season.week_numbers == (1, 2, 3, 4)
+    assert season.teams == frozenset(team_names(10))
+
+    matrix = season.probability_matrix
+    assert matrix.shape == (4, 10)
+    assert not np.isnan(matrix).any()
+    assert ((matrix > 0) & (matrix < 1)).all()
+    for week in season:
+        for game in week:
+            assert sum(game.win_probability(team) for team in game) == pytest.approx(1)
+
+
+def test_synthetic_season_seed():
+    assert synthetic_season(8, 5, 0.2, seed=1).to_dict() == synthetic_season(8, 5, 0.2, seed=1).to_dict()
+    assert synthetic_season(8, 5, seed=1).to_dict() != synthetic_season(8, 5, seed=2).to_dict()
+
+
+def test_synthetic_season_byes():
+    season = synthetic_season(31, 20, bye_rate=0.25, seed=0)
+
+    assert all(len(week.team_ids) % 2 == 0 for week in season)
+    assert 0.1 < np.isnan(season.probability_matrix).mean() < 0.4
+
+
+def test_synthetic_weeks_lazy():
+    weeks = synthetic_weeks(4, 10 ** 9, seed=0)
+    assert next(weeks).week_number == 1
+    assert next(weeks).week_number == 2
+
+
+@pytest.mark.parametrize('kwargs', ({'n_teams': 1}, {'bye_rate': 1.0}, {'distribution': 'normal'}))
+def test_synthetic_weeks_invalid(kwargs):
+    with pytest.raises(ValueError):
+        next(synthetic_weeks(**kwargs))
+
+
+def test_write_weeks_yaml(tmp_path):
+    season = synthetic_season(6, 3, seed=0)
+    streamed_path, full_path = str(tmp_path / 'streamed.yaml'), str(tmp_path / 'full.yaml')
+
+    write_weeks_yaml(season, streamed_path)
+    write_yaml(season.to_dict(), full_path)
+
+    with open(streamed_path, 'r') as streamed_file, open(full_path, 'r') as full_file:
+        assert streamed_file.read() == full_file.read()
+    assert Season.from_yaml(streamed_path).to_dict() == season.to_dict()
+
+
+@pytest.mark.parametrize('file_name', ('season.yaml', 'season.nfla'))
+def test_generate_season_command(tmp_path, file_name):
+    output = str(tmp_path / file_name)
+
+    result = CliRunner().invoke(generate_season, ['-o', output, '-t', '6', '-w', '3', '-s', '0'])
+    assert result.exit_code == 0, result.output
+
+    season = SeasonArchive(output)['season'] if file_name.endswith('.nfla') else Season.from_yaml(output)
+    assert season.to_dict() == synthetic_season(6, 3, seed=0).to_dict()
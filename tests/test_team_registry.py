@@ -0,0 +1,43 @@
+import threading
+
+from nfl_survivor.team_registry import TeamRegistry
+
+
+def test_team_registry():
+    registry = TeamRegistry()
+
+    assert registry.team_id('a') == 0
+    assert registry.team_id('b') == 1
+    assert registry.team_id('a') == 0
+    assert len(registry) == 2
+
+    assert registry.team_name(1) == 'b'
+    assert registry.get('b') == 1
+    assert registry.get('c') is None
+    assert 'a' in registry and 'c' not in registry
+
+
+def test_team_registry_concurrent_readers():
+    registry = TeamRegistry()
+    done, errors = threading.Event(), []
+
+    def read():
+        # a published id must always have its name
+        while not done.is_set():
+            for name in list(registry._name_to_id):
+                try:
+                    assert registry.team_name(registry.get(name)) == name
+                except (IndexError, AssertionError) as exception:
+                    errors.append(exception)
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    for index in range(20000):
+        registry.team_id(f'team {index}')
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert errors == []
+    assert len(registry) == 20000
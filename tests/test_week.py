@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from nfl_survivor.week import Week
@@ -23,22 +25,22 @@ class TestWeek:
     def test_week_number(self, week):
         assert week.week_number == 3
 
+    def test_packed_arrays(self, week):
+        assert len(week.team_ids) == 6
+        assert list(week.probabilities) == [0.1, 0.9, 0.2, 0.8, 0.3, 0.7]
+
+    def test_pickle(self, week, games):
+        unpickled = pickle.loads(pickle.dumps(week))
+
+        assert unpickled.week_number == 3
+        assert unpickled.games == games
+
     def test_games(self, week, games):
         assert week.games == games
 
     def test_iter(self, week, games):
         assert tuple(week) == games
 
-    def test_team_to_game(self, week, games):
-        game_one, game_two, game_three = games
-
-        assert week._team_to_game == {'a': game_one,
-                                      'b': game_one,
-                                      'c': game_two,
-                                      'd': game_two,
-                                      'e': game_three,
-                                      'f': game_three}
-
     def test_team_game(self, week, games):
         game_one, game_two, game_three = games
 
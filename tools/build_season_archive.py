@@ -0,0 +1,37 @@
+import logging
+import os
+
+import click
+
+from nfl_survivor import utils
+from nfl_survivor.season import Season
+from nfl_survivor.season_archive import SeasonArchive
+
+logger = logging.getLogger(__name__)
+
+
+def _season_key(yaml_file_path):
+    """ Archive key for season YAML file, the file name without extension
+
+    Parameters
+    ----------
+    yaml_file_path : str
+
+    Returns
+    -------
+    str
+
+    """
+    return os.path.splitext(os.path.basename(yaml_file_path))[0]
+
+
+@click.command()
+@click.option('-o', '--output', 'output', type=str, required=True,
+              help='File path to write season archive to')
+@click.argument('season_paths', nargs=-1, required=True)
+@utils.initialize_logging()
+def build_archive(season_paths, output):
+    """Convert season YAML files into one season archive keyed by file name"""
+    archive = SeasonArchive.write(output, ((_season_key(season_path), Season.from_yaml(season_path, cache=False))
+                                           for season_path in season_paths))
+    logger.info('Wrote seasons %s to %s', ', '.join(archive.keys()), output)
@@ -0,0 +1,38 @@
+import logging
+import os
+
+import click
+
+from nfl_survivor import utils
+from nfl_survivor.season_archive import SeasonArchive
+from nfl_survivor.synthetic import DISTRIBUTIONS, synthetic_season, synthetic_weeks, write_weeks_yaml
+
+logger = logging.getLogger(__name__)
+
+# extension of output files written as season archives instead of YAML
+ARCHIVE_EXTENSION = '.nfla'
+
+
+@click.command()
+@click.option('-o', '--output', 'output', type=str, required=True,
+              help=f'File path to write season to, a season archive if it ends in {ARCHIVE_EXTENSION} otherwise YAML')
+@click.option('-t', '--teams', 'n_teams', type=int, default=32,
+              help='Number of teams')
+@click.option('-w', '--weeks', 'n_weeks', type=int, default=17,
+              help='Number of weeks')
+@click.option('-b', '--bye_rate', 'bye_rate', type=float, default=0.0,
+              help='Probability of a team not playing in a week')
+@click.option('-d', '--distribution', 'distribution', type=click.Choice(sorted(DISTRIBUTIONS)), default='elo',
+              help='Distribution win probabilities are drawn from')
+@click.option('-s', '--seed', 'seed', type=int, default=None,
+              help='Seed making the season reproducible')
+@utils.initialize_logging()
+def generate_season(output, n_teams, n_weeks, bye_rate, distribution, seed):
+    """Generate a random season of any size"""
+    if output.endswith(ARCHIVE_EXTENSION):
+        key = os.path.splitext(os.path.basename(output))[0]
+        SeasonArchive.write(output, ((key, synthetic_season(n_teams, n_weeks, bye_rate, distribution, seed)),))
+    else:
+        write_weeks_yaml(synthetic_weeks(n_teams, n_weeks, bye_rate, distribution, seed), output)
+
+    logger.info('Wrote season with %d teams and %d weeks to %s', n_teams, n_weeks, output)
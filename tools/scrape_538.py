@@ -1,30 +1,234 @@
+import concurrent.futures
+import hashlib
+import json
 import logging
+import os
 import pprint
 import re
+from html.parser import HTMLParser
 
 import click
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from nfl_survivor import utils
 from nfl_survivor.season import Season
+from tools.season_update import update_report, update_season_yaml
 
 logger = logging.getLogger(__name__)
 
 
+def pooled_session(pool_size=8, retries=3, backoff_factor=0.5):
+    """ HTTP session with connection pooling and retries with exponential backoff
+
+    Parameters
+    ----------
+    pool_size : int, optional
+        Number of connections kept open per host
+    retries : int, optional
+        Number of retries for connection errors and retryable statuses
+    backoff_factor : float, optional
+        Retries wait backoff_factor * 2 ** (retry - 1) seconds
+
+    Returns
+    -------
+    requests.Session
+
+    """
+    retry = Retry(total=retries, backoff_factor=backoff_factor,
+                  status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+class ResponseCache:
+
+    def __init__(self, cache_dir):
+        """ On disk cache of response bodies keyed by URL
+
+        Each entry keeps the `ETag` and `Last-Modified` validators of its
+        response so it can be revalidated with a conditional GET
+
+        Parameters
+        ----------
+        cache_dir : str
+            Directory to store responses in
+
+        """
+        self._cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, url):
+        return os.path.join(self._cache_dir, hashlib.sha256(url.encode()).hexdigest()[:32])
+
+    def get(self, url):
+        """ Cached response for URL
+
+        Parameters
+        ----------
+        url : str
+
+        Returns
+        -------
+        dict or None
+            Dictionary with `text`, `etag` and `last_modified` of response.
+            None if URL is not cached
+
+        """
+        try:
+            with open(self._entry_path(url) + '.json', 'r') as meta_file:
+                entry = json.load(meta_file)
+            with open(self._entry_path(url) + '.html', 'r', encoding='utf-8') as body_file:
+                entry['text'] = body_file.read()
+        except (OSError, ValueError):
+            return None
+
+        return entry if entry.get('url') == url else None
+
+    def put(self, url, text, etag=None, last_modified=None):
+        """ Cache response for URL
+
+        Parameters
+        ----------
+        url : str
+        text : str
+            Response body
+        etag : str, optional
+        last_modified : str, optional
+
+        """
+        entry_path = self._entry_path(url)
+        with open(entry_path + '.html', 'w', encoding='utf-8') as body_file:
+            body_file.write(text)
+        with open(entry_path + '.json', 'w') as meta_file:
+            json.dump({'url': url, 'etag': etag, 'last_modified': last_modified}, meta_file)
+
+    @staticmethod
+    def conditional_headers(entry):
+        """ Request headers revalidating cached response
+
+        Parameters
+        ----------
+        entry : dict or None
+            Cached response given by `get`
+
+        Returns
+        -------
+        dict(str->str)
+
+        """
+        headers = {}
+        if entry is not None and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry is not None and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        return headers
+
+
+class _SeasonParser(HTMLParser):
+
+    def __init__(self):
+        """ Streaming parser forming season dictionary in one pass over HTML
+
+        Only the week titles, game boundaries and team name and chance cells
+        inside week sections are looked at, no tree of the page is built
+
+        """
+        super().__init__(convert_charrefs=True)
+        self.season_dict = []
+        self._week_dict = None
+        # whether each open section is a week section
+        self._sections = []
+        # tag and collected text of element being read
+        self._reading, self._text = None, []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'section':
+            self._sections.append('week' in self._classes(attrs))
+        elif not any(self._sections) or self._reading is not None:
+            return
+        elif tag == 'h3':
+            self._reading, self._text = 'h3', []
+        elif tag == 'div' and 'game' in self._classes(attrs) and self._week_dict is not None:
+            self._week_dict['games'].append({'game': []})
+        elif tag == 'td':
+            classes = self._classes(attrs)
+            if 'team' in classes or 'chance' in classes:
+                self._reading, self._text = 'team' if 'team' in classes else 'chance', []
+
+    def handle_endtag(self, tag):
+        if tag == 'section' and self._sections:
+            self._sections.pop()
+        elif self._reading is not None and tag == ('h3' if self._reading == 'h3' else 'td'):
+            self._read(self._reading, ''.join(self._text).strip())
+            self._reading = None
+
+    def handle_data(self, data):
+        if self._reading is not None:
+            self._text.append(data)
+
+    @staticmethod
+    def _classes(attrs):
+        return next((value or '' for name, value in attrs if name == 'class'), '').split()
+
+    def _read(self, kind, text):
+        """ Add text read from week title, team name or chance cell to season dictionary
+
+        Parameters
+        ----------
+        kind : str
+            One of `h3`, `team` or `chance`
+        text : str
+
+        """
+        if kind == 'h3':
+            self._week_dict = {'number': int(text.split()[1]), 'games': []} if 'Week' in text else None
+            if self._week_dict is not None:
+                logger.info('Scraping games for week %s', self._week_dict['number'])
+                self.season_dict.append({'week': self._week_dict})
+        elif self._week_dict is None:
+            return
+        elif kind == 'team':
+            self._week_dict['games'][-1]['game'].append({'team': {'name': text}})
+        else:
+            self._week_dict['games'][-1]['game'][-1]['team']['probability'] = int(text.split('%')[0]) / 100
+
+
 class Scraper:
     _SEASON_URL = 'https://projects.fivethirtyeight.com/{year}-nfl-predictions/games/'
 
-    def __init__(self, url):
+    def __init__(self, url, session=None, response_cache=None, timeout=30, fast_parse=True):
         """ Scraper for probabilities from 538
 
         Parameters
         ----------
         url : str
             URL of site to be scraped
+        session : requests.Session, optional
+            Session to share connections with other scrapers. Defaults to
+            a new `pooled_session`
+        response_cache : ResponseCache, optional
+            Cache of responses revalidated with conditional GETs
+        timeout : float, optional
+            Seconds to wait for the server before giving up
+        fast_parse : bool, optional
+            Whether to stream through the page once instead of building
+            and searching a tree of the full page
 
         """
         self._url = url
+        self._session = session if session is not None else pooled_session()
+        self._response_cache = response_cache
+        self._timeout = timeout
+        self._fast_parse = fast_parse
         logger.info('Created scraper for %s', self.url)
 
     @property
@@ -89,7 +293,8 @@ class Scraper:
                 'games': [Scraper._game_dict(game_tag)
                           for game_tag in week_tag.find_all('div', class_='game')]}
 
-    def _season_dict(self, soup):
+    @staticmethod
+    def _season_dict(soup):
         """ Form season dictionary
 
         Parameters
@@ -101,10 +306,33 @@ class Scraper:
         dict
 
         """
-        return [{'week': self._week_dict(week_soup)}
+        return [{'week': Scraper._week_dict(week_soup)}
                 for week_soup in soup.find_all('section', class_='week')
                 if 'Week' in week_soup.h3.text]
 
+    @classmethod
+    def parse_season_html(cls, html, fast_parse=True):
+        """ Form season dictionary from HTML of predictions page
+
+        Parameters
+        ----------
+        html : str
+        fast_parse : bool, optional
+            Whether to stream through page once with `_SeasonParser`
+
+        Returns
+        -------
+        dict
+
+        """
+        if fast_parse:
+            parser = _SeasonParser()
+            parser.feed(html)
+            parser.close()
+            return parser.season_dict
+
+        return cls._season_dict(BeautifulSoup(html, 'html.parser'))
+
     def _site_html(self):
         """ Get plain text site HTML
 
@@ -114,18 +342,22 @@ class Scraper:
 
         """
         logger.info('Fetching content from %s', self.url)
-        return requests.get(self.url).text
+        cached = self._response_cache.get(self.url) if self._response_cache is not None else None
 
-    def _site_soup(self):
-        """ Get structured representation of site HTML
+        response = self._session.get(self.url, timeout=self._timeout,
+                                     headers=ResponseCache.conditional_headers(cached))
 
-        Returns
-        -------
-        bs4.BeautifulSoup
+        if response.status_code == 304 and cached is not None:
+            logger.info('Content of %s not modified, using cached response', self.url)
+            return cached['text']
 
-        """
-        logger.info('Parsing HTML from %s', self.url)
-        return BeautifulSoup(self._site_html(), 'html.parser')
+        response.raise_for_status()
+
+        if self._response_cache is not None:
+            self._response_cache.put(self.url, response.text, response.headers.get('ETag'),
+                                     response.headers.get('Last-Modified'))
+
+        return response.text
 
     def scraped_season_dict(self):
         """ Season dictionary for URL
@@ -140,7 +372,9 @@ class Scraper:
 
         """
         try:
-            return self._season_dict(self._site_soup())
+            html = self._site_html()
+            logger.info('Parsing HTML from %s', self.url)
+            return self.parse_season_html(html, self._fast_parse)
         except ConnectionError:
             exception_msg = f'Could not connect to {self.url}'
             logger.exception(exception_msg)
@@ -159,6 +393,59 @@ class Scraper:
         scraper = cls(cls._SEASON_URL.format(year=year))
         return Season.from_dict(scraper.scraped_season_dict())
 
+    @classmethod
+    def season_dicts_from_years(cls, years, max_workers=4, cache_dir=None, url_template=None):
+        """ Scrape season dictionaries of many years concurrently
+
+        All years share one pooled session and are fetched by a bounded pool
+        of worker threads
+
+        Parameters
+        ----------
+        years : iterable(int)
+            Years to scrape
+        max_workers : int, optional
+            Maximum number of years fetched at the same time
+        cache_dir : str, optional
+            Directory of `ResponseCache`. Responses are not cached if None
+        url_template : str, optional
+            URL with `{year}` placeholder, defaults to 538's predictions page
+
+        Returns
+        -------
+        dict(int->dict)
+            Year to season dictionary
+
+        """
+        years = tuple(years)
+        url_template = url_template if url_template is not None else cls._SEASON_URL
+        session = pooled_session(pool_size=max_workers)
+        response_cache = ResponseCache(cache_dir) if cache_dir is not None else None
+
+        logger.info('Scraping %d years with %d workers', len(years), max_workers)
+        with session, concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            year_to_future = {year: executor.submit(cls(url_template.format(year=year), session,
+                                                        response_cache).scraped_season_dict)
+                              for year in years}
+
+            return {year: future.result() for year, future in year_to_future.items()}
+
+    @classmethod
+    def seasons_from_years(cls, years, max_workers=4, cache_dir=None, url_template=None):
+        """ Scrape seasons of many years concurrently
+
+        Parameters are the same as for `season_dicts_from_years`
+
+        Returns
+        -------
+        dict(int->season.Season)
+            Year to season
+
+        """
+        return {year: Season.from_dict(season_dict)
+                for year, season_dict in cls.season_dicts_from_years(years, max_workers, cache_dir,
+                                                                     url_template).items()}
+
     def write_season_yaml(self, file_path):
         """ Write season to YAML file
 
@@ -172,16 +459,32 @@ class Scraper:
 
 @click.command()
 @click.option('-o', '--output', 'output', type=str,
-              help='YAML file path to write season to')
-@click.option('-y', '--year', 'year', type=int,
-              help='Year of season to scrape')
+              help='YAML file path to write season to, with a {year} placeholder when scraping several years')
+@click.option('-y', '--year', 'years', type=int, multiple=True, required=True,
+              help='Year of season to scrape, can be given several times')
+@click.option('-w', '--workers', 'workers', type=int, default=4,
+              help='Maximum number of years to scrape at the same time')
+@click.option('-c', '--cache_dir', 'cache_dir', type=str, default=None,
+              help='Directory to cache responses in and revalidate them from')
+@click.option('-u', '--update', 'update', is_flag=True, default=False,
+              help='Only rewrite weeks of existing output that changed and report the changes')
 @utils.initialize_logging()
-def scrape(year, output):
+def scrape(years, output, workers, cache_dir, update):
     """Scrape NFL season for a given year with probabilities from fivethirtyeight.com"""
-    scraper = Scraper(Scraper._SEASON_URL.format(year=year))
-
-    if output:
-        scraper.write_season_yaml(output)
-        logger.info('Wrote season YAML to %s', output)
-    else:
-        pprint.pprint(scraper.scraped_season_dict())
+    if output and len(years) > 1 and '{year}' not in output:
+        raise click.BadParameter('Output must contain {year} when scraping several years', param_hint='output')
+    if update and not output:
+        raise click.BadParameter('Updating requires an output to update', param_hint='update')
+
+    year_to_season_dict = Scraper.season_dicts_from_years(years, max_workers=workers, cache_dir=cache_dir)
+
+    for year, season_dict in year_to_season_dict.items():
+        if update:
+            year_output = output.format(year=year)
+            click.echo(f'{year_output}\n{update_report(update_season_yaml(year_output, season_dict))}')
+        elif output:
+            year_output = output.format(year=year)
+            utils.write_yaml(season_dict, year_output)
+            logger.info('Wrote season YAML to %s', year_output)
+        else:
+            pprint.pprint(season_dict)
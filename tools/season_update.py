@@ -0,0 +1,201 @@
+import collections
+import hashlib
+import json
+import logging
+import os
+import re
+
+import yaml
+
+from nfl_survivor.utils import YAML_LOADER
+
+logger = logging.getLogger(__name__)
+
+# every week of a season YAML written by `utils.write_yaml` starts with this line
+_WEEK_BLOCK_START = re.compile(r'^- week:', re.MULTILINE)
+
+WeekDiff = collections.namedtuple('WeekDiff', ('week_number', 'added_games', 'removed_games', 'probability_changes'))
+
+SeasonUpdate = collections.namedtuple('SeasonUpdate', ('added_weeks', 'removed_weeks', 'changed_weeks',
+                                                       'unchanged_weeks'))
+
+
+def week_hash(week_dict):
+    """ Hash of week's games and probabilities independent of YAML formatting
+
+    Parameters
+    ----------
+    week_dict : dict
+        Week dictionary, the value under `week` in a season dictionary
+
+    Returns
+    -------
+    str
+
+    """
+    return hashlib.sha256(json.dumps(week_dict, sort_keys=True).encode()).hexdigest()
+
+
+def _week_blocks(season_text):
+    """ Split season YAML into the text of each week
+
+    Parameters
+    ----------
+    season_text : str
+
+    Returns
+    -------
+    list(str)
+        Text of each week in file order, each starting with `- week:`
+
+    """
+    starts = [match.start() for match in _WEEK_BLOCK_START.finditer(season_text)]
+    if season_text[:starts[0] if starts else len(season_text)].strip():
+        exception_msg = 'Season YAML has content before its first week'
+        logger.exception(exception_msg)
+        raise ValueError(exception_msg)
+
+    return [season_text[start:stop] for start, stop in zip(starts, starts[1:] + [len(season_text)])]
+
+
+def _game_probabilities(week_dict):
+    """ Map of each game's teams to their win probabilities
+
+    Parameters
+    ----------
+    week_dict : dict
+
+    Returns
+    -------
+    dict(frozenset(str)->dict(str->float))
+
+    """
+    game_probabilities = {}
+    for game in week_dict['games']:
+        team_probabilities = {team['team']['name']: team['team']['probability'] for team in game['game']}
+        game_probabilities[frozenset(team_probabilities)] = team_probabilities
+
+    return game_probabilities
+
+
+def week_diff(old_week_dict, new_week_dict):
+    """ Differences between two versions of a week
+
+    Parameters
+    ----------
+    old_week_dict : dict
+    new_week_dict : dict
+
+    Returns
+    -------
+    season_update.WeekDiff
+        Games are given as sorted team name tuples and probability changes as
+        (team, old probability, new probability) for teams in both versions
+
+    """
+    old_games, new_games = _game_probabilities(old_week_dict), _game_probabilities(new_week_dict)
+
+    probability_changes = [(team, old_games[game][team], probability)
+                           for game in new_games.keys() & old_games.keys()
+                           for team, probability in new_games[game].items()
+                           if old_games[game][team] != probability]
+
+    return WeekDiff(new_week_dict['number'],
+                    sorted(tuple(sorted(game)) for game in new_games.keys() - old_games.keys()),
+                    sorted(tuple(sorted(game)) for game in old_games.keys() - new_games.keys()),
+                    sorted(probability_changes))
+
+
+def update_season_yaml(season_path, season_dict):
+    """ Update season YAML file to scraped season, rewriting only changed weeks
+
+    Weeks whose games and probabilities hash the same as before keep their
+    text byte for byte, so anything keyed on week content stays valid. Weeks
+    are written in the order of the new season dictionary and the file is
+    only replaced if something changed
+
+    Parameters
+    ----------
+    season_path : str
+        Path to season YAML written by `utils.write_yaml`, created if missing
+    season_dict : list(dict)
+        Newly scraped season dictionary
+
+    Returns
+    -------
+    season_update.SeasonUpdate
+        Week numbers of added, removed and unchanged weeks and a
+        `WeekDiff` for every changed week
+
+    """
+    try:
+        with open(season_path, 'r') as season_file:
+            season_text = season_file.read()
+    except FileNotFoundError:
+        season_text = ''
+
+    old_blocks = _week_blocks(season_text)
+    old_weeks = {}
+    for block in old_blocks:
+        week_dict = yaml.load(block, Loader=YAML_LOADER)[0]['week']
+        old_weeks[week_dict['number']] = (week_hash(week_dict), week_dict, block)
+
+    new_blocks, added_weeks, changed_weeks, unchanged_weeks = [], [], [], []
+    for week in season_dict:
+        week_dict = week['week']
+        number = week_dict['number']
+
+        if number in old_weeks and old_weeks[number][0] == week_hash(week_dict):
+            new_blocks.append(old_weeks[number][2])
+            unchanged_weeks.append(number)
+            continue
+
+        if number in old_weeks:
+            changed_weeks.append(week_diff(old_weeks[number][1], week_dict))
+        else:
+            added_weeks.append(number)
+        new_blocks.append(yaml.dump([week]))
+
+    new_numbers = {week['week']['number'] for week in season_dict}
+    removed_weeks = [number for number in old_weeks if number not in new_numbers]
+
+    new_text = ''.join(new_blocks)
+    if new_text != season_text:
+        # write to temporary file first so readers never see a partial season
+        with open(f'{season_path}.tmp', 'w') as season_file:
+            season_file.write(new_text)
+        os.replace(f'{season_path}.tmp', season_path)
+        logger.info('Rewrote %d of %d weeks in %s', len(added_weeks) + len(changed_weeks), len(new_blocks),
+                    season_path)
+    else:
+        logger.info('Season in %s is up to date', season_path)
+
+    return SeasonUpdate(added_weeks, removed_weeks, changed_weeks, unchanged_weeks)
+
+
+def update_report(season_update):
+    """ Compact human readable report of season update
+
+    Parameters
+    ----------
+    season_update : season_update.SeasonUpdate
+
+    Returns
+    -------
+    str
+
+    """
+    lines = []
+    for week_diff_ in season_update.changed_weeks:
+        changes = [f'{team} {old:g} -> {new:g}' for team, old, new in week_diff_.probability_changes]
+        changes += [f'+{" vs ".join(game)}' for game in week_diff_.added_games]
+        changes += [f'-{" vs ".join(game)}' for game in week_diff_.removed_games]
+        lines.append(f'week {week_diff_.week_number}: {", ".join(changes) or "games reordered"}')
+
+    if season_update.added_weeks:
+        lines.append(f'added weeks: {", ".join(map(str, season_update.added_weeks))}')
+    if season_update.removed_weeks:
+        lines.append(f'removed weeks: {", ".join(map(str, season_update.removed_weeks))}')
+    lines.append(f'{len(season_update.unchanged_weeks)} weeks unchanged')
+
+    return '\n'.join(lines)